@@ -0,0 +1,71 @@
+"""
+管理者用 API
+"""
+import asyncio
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.dependencies import require_admin
+from app.utils.profiling import SamplingProfiler
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# プロファイルは同時に1つだけ採取する
+_profile_lock = asyncio.Lock()
+
+
+@router.post("/profile")
+async def capture_profile(
+    seconds: float = Query(10, gt=0, le=60, description="採取する秒数"),
+    interval_ms: float = Query(10, ge=1, le=1000, description="採取間隔（ミリ秒）"),
+    memory: bool = Query(True, description="tracemalloc でメモリの確保元も記録する"),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed|json)$", description="speedscope, collapsed または json")
+):
+    """
+    プロファイル採取
+
+    実行中のジョブなどの処理を止めずに、指定した秒数の CPU プロファイル（全スレッドの
+    サンプリング）と、その間に確保されて解放されていないメモリを記録する。
+
+    Args:
+        seconds: 採取する秒数
+        interval_ms: 採取間隔（ミリ秒）
+        memory: メモリの確保元も記録する
+        format: speedscope（CPU とメモリのプロファイル）、collapsed（CPU の集約スタック）、
+            json（上位の関数と確保元の概要）
+
+    Returns:
+        プロファイル
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already being captured")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval_ms / 1000, trace_memory=memory)
+        # スナップショットの取得は重いことがあるためスレッドで行う
+        await asyncio.to_thread(profiler.start)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(profiler.stop)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if format == "speedscope":
+        return Response(
+            content=json.dumps(profiler.speedscope(f"profile_{timestamp}")),
+            media_type="application/json",
+            headers={"Content-Disposition": f"attachment; filename=profile_{timestamp}.speedscope.json"}
+        )
+    if format == "collapsed":
+        return Response(
+            content=profiler.collapsed(),
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename=profile_{timestamp}.collapsed.txt"}
+        )
+    return {
+        "success": True,
+        **profiler.summary(),
+        "message": "Profile captured successfully"
+    }
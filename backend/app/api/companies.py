@@ -2,7 +2,7 @@
 企業情報 CRUD API
 """
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from datetime import datetime
 
 from app.models.company import Company
@@ -14,33 +14,31 @@ from app.models.responses import (
     CompanyDeleteResponse,
     ErrorResponse
 )
+from app.api.dependencies import get_company_service
 from app.services.company_service import CompanyService
-from app.services.google_sheets import GoogleSheetsService
+from app.utils.json_response import json_response
 
 router = APIRouter()
 
-# サービス依存関係の初期化
-def get_company_service():
-    """CompanyService の依存関係注入"""
-    google_sheets_service = GoogleSheetsService()
-    return CompanyService(google_sheets_service)
-
-company_service = get_company_service()
-
 
 @router.get("/", response_model=CompaniesListResponse)
 async def get_companies(
+    request: Request,
     page: int = Query(1, ge=1, description="ページ番号"),
     page_size: int = Query(100, ge=1, le=1000, description="ページサイズ"),
     status: Optional[str] = Query(None, description="営業ステータスフィルター"),
     prefecture: Optional[str] = Query(None, description="都道府県フィルター"),
     industry: Optional[str] = Query(None, description="業界フィルター"),
     keyword: Optional[str] = Query(None, description="キーワード検索"),
-) -> CompaniesListResponse:
+    company_service: CompanyService = Depends(get_company_service)
+) -> Response:
     """
     企業一覧取得
     
+    応答は再検証せずに pydantic-core で直接 JSON にし、Accept-Encoding に応じて圧縮する。
+    
     Args:
+        request: リクエスト
         page: ページ番号
         page_size: ページサイズ
         status: 営業ステータスフィルター
@@ -74,7 +72,7 @@ async def get_companies(
         total = len(companies)  # 実際には別途カウントクエリが必要
         has_next = len(companies) == page_size
         
-        return CompaniesListResponse(
+        response = CompaniesListResponse(
             companies=companies,
             total=total,
             page=page,
@@ -82,13 +80,17 @@ async def get_companies(
             has_next=has_next,
             message="Companies retrieved successfully"
         )
+        return json_response(request, response)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-async def get_company(company_id: int) -> CompanyResponse:
+async def get_company(
+    company_id: int,
+    company_service: CompanyService = Depends(get_company_service)
+) -> CompanyResponse:
     """
     企業詳細取得
     
@@ -119,7 +121,10 @@ async def get_company(company_id: int) -> CompanyResponse:
 
 
 @router.post("/", response_model=CompanyCreateResponse, status_code=201)
-async def create_company(company_data: Company) -> CompanyCreateResponse:
+async def create_company(
+    company_data: Company,
+    company_service: CompanyService = Depends(get_company_service)
+) -> CompanyCreateResponse:
     """
     企業作成
     
@@ -151,7 +156,8 @@ async def create_company(company_data: Company) -> CompanyCreateResponse:
 @router.put("/{company_id}", response_model=CompanyUpdateResponse)
 async def update_company(
     company_id: int,
-    company_data: Company
+    company_data: Company,
+    company_service: CompanyService = Depends(get_company_service)
 ) -> CompanyUpdateResponse:
     """
     企業更新
@@ -190,7 +196,10 @@ async def update_company(
 
 
 @router.delete("/{company_id}", response_model=CompanyDeleteResponse)
-async def delete_company(company_id: int) -> CompanyDeleteResponse:
+async def delete_company(
+    company_id: int,
+    company_service: CompanyService = Depends(get_company_service)
+) -> CompanyDeleteResponse:
     """
     企業削除
     
@@ -220,7 +229,10 @@ async def delete_company(company_id: int) -> CompanyDeleteResponse:
 
 
 @router.get("/{company_id}/duplicate-check")
-async def check_duplicate(company_id: int):
+async def check_duplicate(
+    company_id: int,
+    company_service: CompanyService = Depends(get_company_service)
+):
     """
     重複チェック
     
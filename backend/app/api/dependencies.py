@@ -0,0 +1,67 @@
+"""
+ルーター共通の依存関係
+
+サービスはアプリケーションの起動時に作成した ServiceContainer（app.state.container）から
+取得する。初回の作成は接続を伴うため、依存関係は同期関数としてスレッドプールで解決させる。
+"""
+import os
+import secrets
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request
+
+from app.services.company_service import CompanyService
+from app.services.container import ServiceContainer
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sales_service import SalesService
+from app.services.scraping_engine import ScrapingEngine
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """
+    アプリケーションのサービスコンテナ
+
+    コンテナは lifespan の起動時に作成する。lifespan を実行せずにアプリケーションを
+    動かした場合（with を使わない TestClient など）は RuntimeError にする。
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise RuntimeError(
+            "ServiceContainer is not initialized; run the app with its lifespan "
+            "(e.g. `with TestClient(app) as client:`) or override get_container"
+        )
+    return container
+
+
+def get_sheets_service(container: ServiceContainer = Depends(get_container)) -> GoogleSheetsService:
+    """GoogleSheetsService の依存関係注入"""
+    return container.sheets_service
+
+
+def get_company_service(container: ServiceContainer = Depends(get_container)) -> CompanyService:
+    """CompanyService の依存関係注入"""
+    return container.company_service
+
+
+def get_sales_service(container: ServiceContainer = Depends(get_container)) -> SalesService:
+    """SalesService の依存関係注入"""
+    return container.sales_service
+
+
+def get_scraping_engine(container: ServiceContainer = Depends(get_container)) -> ScrapingEngine:
+    """ScrapingEngine の依存関係注入"""
+    return container.scraping_engine
+
+
+def require_admin(admin_token: Optional[str] = Header(None, alias="X-Admin-Token")) -> None:
+    """
+    管理者用 API の認可
+
+    X-Admin-Token ヘッダーが環境変数 ADMIN_API_TOKEN と一致する場合のみ許可する。
+    ADMIN_API_TOKEN が未設定の場合、管理者用 API は使えない。
+    """
+    expected = os.environ.get("ADMIN_API_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not admin_token or not secrets.compare_digest(admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -2,24 +2,383 @@
 エクスポート API
 """
 import io
+import os
 import csv
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Query, Response
+import codecs
+import asyncio
+import tempfile
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
 from fastapi.responses import StreamingResponse
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, Alignment
-import pandas as pd
+from functools import partial
 
-from app.models.responses import ExportRequest
+from app.api.dependencies import get_company_service, get_container
+from app.models.company import CompanyRecord, SalesStatus
+from app.models.responses import ExportRequest, ExportJobResponse
+from app.services.columnar_export import COLUMNAR_FORMATS, write_columnar_file
 from app.services.company_service import CompanyService
-from app.services.google_sheets import GoogleSheetsService
+from app.services.container import ServiceContainer
+from app.services.export_jobs import (
+    COMPLETED,
+    ExportJobManager,
+    iter_file_range,
+    parse_range_header
+)
+from app.utils.lazy_import import lazy_import
 
 router = APIRouter()
 
-# サービス初期化
-google_sheets_service = GoogleSheetsService()
-company_service = CompanyService(google_sheets_service)
+# openpyxl は Excel の出力時に読み込む
+openpyxl = lazy_import("openpyxl")
+
+
+# エクスポートの列定義
+EXPORT_HEADERS = [
+    "ID", "会社名", "URL", "住所", "郵便番号", "都道府県", "市区町村",
+    "住所詳細", "電話番号", "FAX番号", "代表者名", "事業内容",
+    "設立年月日", "資本金", "問い合わせURL", "情報収集元URL",
+    "作成日時", "更新日時", "資本金（円）"
+]
+SALES_STATUS_HEADERS = [
+    "営業ステータス", "メモ", "担当者", "最終コンタクト日", "次回アクション"
+]
+
+# シートから1回に読み込む行数（CSV では1回の送信にまとめる行数）
+EXPORT_PAGE_SIZE = 500
+
+# Excel の列幅の上限（文字数）
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+# ファイルを送信する際のチャンクサイズ
+FILE_CHUNK_SIZE = 64 * 1024
+
+# 形式ごとのメディアタイプと拡張子
+EXPORT_FORMATS = {
+    # text/* には Starlette が charset=utf-8 を付ける
+    "csv": ("text/csv", "csv"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    **COLUMNAR_FORMATS,
+}
+
+
+def build_filters(
+    status: Optional[str] = None,
+    prefecture: Optional[str] = None,
+    industry: Optional[str] = None
+) -> Dict[str, Any]:
+    """クエリパラメータからフィルター条件を構築する"""
+    filters = {}
+    if status:
+        filters["status"] = status
+    if prefecture:
+        filters["prefecture"] = prefecture
+    if industry:
+        filters["industry"] = industry
+    return filters
+
+
+def company_to_row(company: CompanyRecord) -> List[Any]:
+    """企業情報をエクスポート用の行に変換する"""
+    return [
+        company.id,
+        company.company_name,
+        company.url,
+        company.address,
+        company.postal_code,
+        company.prefecture,
+        company.city,
+        company.address_detail,
+        company.tel,
+        company.fax,
+        company.representative,
+        company.business_content,
+        company.established_date,
+        company.capital,
+        company.contact_url,
+        company.source_url,
+        company.created_at.isoformat() if company.created_at else "",
+        company.updated_at.isoformat() if company.updated_at else "",
+        company.capital_yen
+    ]
+
+
+def sales_status_to_row(sales_status: Optional[SalesStatus]) -> List[Any]:
+    """営業ステータスをエクスポート用の列に変換する"""
+    if not sales_status:
+        return ["", "", "", "", ""]
+    return [
+        sales_status.status,
+        sales_status.memo,
+        sales_status.contact_person,
+        sales_status.last_contact_date.isoformat() if sales_status.last_contact_date else "",
+        sales_status.next_action
+    ]
+
+
+async def iter_export_pages(
+    company_service: CompanyService,
+    filters: Dict[str, Any],
+    include_sales_status: bool,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> AsyncIterator[List[Tuple[CompanyRecord, Optional[SalesStatus]]]]:
+    """
+    エクスポート対象の企業をページ単位で返す
+    
+    営業ステータスは一括で読み込んで企業IDで結合するため、行ごとの問い合わせは発生しない。
+    
+    Args:
+        company_service: 企業情報サービス
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+        page_size: 1回に読み込む行数
+        
+    Yields:
+        (企業, 営業ステータス) のリスト（ステータス不要の場合は None）
+    """
+    if not include_sales_status and "status" not in filters:
+        async for companies in company_service.iter_company_pages(filters=filters, page_size=page_size):
+            yield [(company, None) for company in companies]
+        return
+    
+    async for joined in company_service.iter_companies_with_status(filters=filters, page_size=page_size):
+        yield joined
+
+
+async def iter_export_rows(
+    company_service: CompanyService,
+    filters: Dict[str, Any],
+    include_sales_status: bool,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> AsyncIterator[List[List[Any]]]:
+    """
+    エクスポート用の行をページ単位で返す
+    
+    Args:
+        company_service: 企業情報サービス
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+        page_size: 1回に読み込む行数
+        
+    Yields:
+        行のリスト
+    """
+    async for joined in iter_export_pages(company_service, filters, include_sales_status, page_size):
+        rows = []
+        for company, sales_status in joined:
+            row = company_to_row(company)
+            if include_sales_status:
+                row.extend(sales_status_to_row(sales_status))
+            rows.append(row)
+        yield rows
+
+
+async def iter_csv_chunks(
+    company_service: CompanyService,
+    filters: Dict[str, Any],
+    include_sales_status: bool
+) -> AsyncIterator[bytes]:
+    """
+    CSV をページ単位で生成し、エンコード済みのチャンクとして返す
+    
+    Args:
+        company_service: 企業情報サービス
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+        
+    Yields:
+        UTF-8（先頭のみBOM付き）でエンコードしたCSVの断片
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    headers = EXPORT_HEADERS + (SALES_STATUS_HEADERS if include_sales_status else [])
+    writer.writerow(headers)
+    
+    # Excel で文字化けしないよう BOM は先頭に1回だけ付与する
+    yield codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8")
+    
+    async for rows in iter_export_rows(company_service, filters, include_sales_status):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def write_csv_file(
+    company_service: CompanyService,
+    path: str,
+    filters: Dict[str, Any],
+    include_sales_status: bool
+) -> None:
+    """
+    CSV をページ単位でファイルに書き出す
+    
+    Args:
+        company_service: 企業情報サービス
+        path: 出力先のパス
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+    """
+    with open(path, "wb") as f:
+        async for chunk in iter_csv_chunks(company_service, filters, include_sales_status):
+            f.write(chunk)
+
+
+def update_column_widths(widths: List[int], row: List[Any]) -> None:
+    """行の値の文字数で列幅（最大値）を更新する"""
+    for index, value in enumerate(row):
+        if value is not None:
+            widths[index] = max(widths[index], len(str(value)))
+
+
+def create_excel_sheet(headers: List[str], first_page: List[List[Any]]) -> Tuple[Any, Any]:
+    """
+    書き込み専用モードのブックを作り、列幅・ヘッダー行・先頭ページを書き込む
+    
+    書き込み専用モードでは列幅を最初の行より前に設定する必要があるため、
+    先頭ページの値から列幅を決めてから書き込みを始める。
+    
+    Args:
+        headers: ヘッダー行
+        first_page: 先頭ページの行
+        
+    Returns:
+        (ブック, シート)
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("企業リスト")
+    
+    # 列幅を先頭ページから決定
+    widths = [len(header) for header in headers]
+    for row in first_page:
+        update_column_widths(widths, row)
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = min(width + 2, EXCEL_MAX_COLUMN_WIDTH)
+    
+    # ヘッダー行作成
+    header_cells = []
+    for header in headers:
+        cell = openpyxl.cell.WriteOnlyCell(ws, value=header)
+        cell.font = openpyxl.styles.Font(bold=True)
+        cell.alignment = openpyxl.styles.Alignment(horizontal="center")
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    append_excel_rows(ws, first_page)
+    return wb, ws
+
+
+def append_excel_rows(ws: Any, rows: List[List[Any]]) -> None:
+    """シートにデータ行を追記する"""
+    for row in rows:
+        ws.append(row)
+
+
+async def write_excel_file(
+    company_service: CompanyService,
+    path: str,
+    filters: Dict[str, Any],
+    include_sales_status: bool
+) -> None:
+    """
+    企業リストを書き込み専用モードの Excel ファイルとして書き出す
+    
+    シートへの書き込みと保存はイベントループを止めないようページごとにスレッドで行う。
+    
+    Args:
+        company_service: 企業情報サービス
+        path: 出力先のパス
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+    """
+    headers = EXPORT_HEADERS + (SALES_STATUS_HEADERS if include_sales_status else [])
+    rows_iter = iter_export_rows(company_service, filters, include_sales_status)
+    first_page = await anext(rows_iter, [])
+    
+    wb, ws = await asyncio.to_thread(create_excel_sheet, headers, first_page)
+    async for rows in rows_iter:
+        await asyncio.to_thread(append_excel_rows, ws, rows)
+    
+    await asyncio.to_thread(wb.save, path)
+
+
+async def iter_file_chunks(path: str, delete: bool = False) -> AsyncIterator[bytes]:
+    """
+    ファイルをチャンク単位で読み込んで返す
+    
+    Args:
+        path: ファイルのパス
+        delete: 読み終えた後にファイルを削除する
+        
+    Yields:
+        ファイルの断片
+    """
+    try:
+        with open(path, "rb") as f:
+            while chunk := await asyncio.to_thread(f.read, FILE_CHUNK_SIZE):
+                yield chunk
+    finally:
+        if delete:
+            os.remove(path)
+
+
+async def generate_export_file(
+    company_service: CompanyService,
+    path: str,
+    file_format: str,
+    filters: Dict[str, Any],
+    include_sales_status: bool
+) -> None:
+    """
+    指定形式のエクスポートファイルを生成する（エクスポートジョブのワーカーから呼ばれる）
+    
+    Args:
+        company_service: 企業情報サービス
+        path: 出力先のパス
+        file_format: 出力形式
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+    """
+    if file_format == "csv":
+        await write_csv_file(company_service, path, filters, include_sales_status)
+    elif file_format == "excel":
+        await write_excel_file(company_service, path, filters, include_sales_status)
+    else:
+        await write_columnar_file(
+            path,
+            iter_export_pages(company_service, filters, include_sales_status),
+            include_sales_status,
+            file_format=file_format
+        )
+
+
+def get_export_job_manager(container: ServiceContainer = Depends(get_container)) -> ExportJobManager:
+    """ExportJobManager の依存関係注入（アプリケーションで1つ、終了時にワーカーを止める）"""
+    def create() -> ExportJobManager:
+        company_service = container.company_service
+        return ExportJobManager(
+            partial(generate_export_file, company_service),
+            company_service.get_data_version
+        )
+    
+    return container.resolve("export_job_manager", create, close=lambda manager: manager.aclose())
+
+
+def to_job_response(job: Dict[str, Any], message: str = "") -> ExportJobResponse:
+    """ジョブ情報をレスポンスに変換する"""
+    return ExportJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        format=job["format"],
+        cached=job["cached"],
+        size=job["size"],
+        download_url=f"/api/export/jobs/{job['job_id']}/download" if job["status"] == COMPLETED else None,
+        error_message=job["error_message"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
+        message=message
+    )
 
 
 @router.get("/csv")
@@ -27,11 +386,15 @@ async def export_csv(
     status: Optional[str] = Query(None, description="ステータスフィルター"),
     prefecture: Optional[str] = Query(None, description="都道府県フィルター"),
     industry: Optional[str] = Query(None, description="業界フィルター"),
-    include_sales_status: bool = Query(True, description="営業ステータス含める")
+    include_sales_status: bool = Query(True, description="営業ステータス含める"),
+    company_service: CompanyService = Depends(get_company_service)
 ):
     """
     CSV エクスポート
     
+    企業情報をページ単位で読み込みながら書き出すため、件数によらず
+    メモリ使用量は一定で、先頭のデータはすぐに送信が始まる。
+    
     Args:
         status: ステータスフィルター
         prefecture: 都道府県フィルター
@@ -42,84 +405,14 @@ async def export_csv(
         CSV ファイル
     """
     try:
-        # フィルター条件構築
-        filters = {}
-        if status:
-            filters["status"] = status
-        if prefecture:
-            filters["prefecture"] = prefecture
-        if industry:
-            filters["industry"] = industry
-        
-        # データ取得
-        companies = await company_service.get_companies(filters=filters)
-        
-        # CSV データ作成
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # ヘッダー作成
-        headers = [
-            "ID", "会社名", "URL", "住所", "郵便番号", "都道府県", "市区町村",
-            "住所詳細", "電話番号", "FAX番号", "代表者名", "事業内容",
-            "設立年月日", "資本金", "問い合わせURL", "情報収集元URL",
-            "作成日時", "更新日時"
-        ]
+        filters = build_filters(status, prefecture, industry)
         
-        if include_sales_status:
-            headers.extend([
-                "営業ステータス", "メモ", "担当者", "最終コンタクト日", "次回アクション"
-            ])
-        
-        writer.writerow(headers)
-        
-        # データ行作成
-        for company in companies:
-            row = [
-                company.id,
-                company.company_name,
-                company.url,
-                company.address,
-                company.postal_code,
-                company.prefecture,
-                company.city,
-                company.address_detail,
-                company.tel,
-                company.fax,
-                company.representative,
-                company.business_content,
-                company.established_date,
-                company.capital,
-                company.contact_url,
-                company.source_url,
-                company.created_at.isoformat() if company.created_at else "",
-                company.updated_at.isoformat() if company.updated_at else ""
-            ]
-            
-            if include_sales_status and company.id:
-                # 営業ステータス取得
-                sales_status = await google_sheets_service.get_sales_status(company.id)
-                if sales_status:
-                    row.extend([
-                        sales_status.status,
-                        sales_status.memo,
-                        sales_status.contact_person,
-                        sales_status.last_contact_date.isoformat() if sales_status.last_contact_date else "",
-                        sales_status.next_action
-                    ])
-                else:
-                    row.extend(["", "", "", "", ""])
-            
-            writer.writerow(row)
-        
-        # レスポンス作成
-        output.seek(0)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"companies_{timestamp}.csv"
         
         return StreamingResponse(
-            io.BytesIO(output.getvalue().encode('utf-8-sig')),
-            media_type="text/csv; charset=utf-8",
+            iter_csv_chunks(company_service, filters, include_sales_status),
+            media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
         
@@ -132,11 +425,15 @@ async def export_excel(
     status: Optional[str] = Query(None, description="ステータスフィルター"),
     prefecture: Optional[str] = Query(None, description="都道府県フィルター"),
     industry: Optional[str] = Query(None, description="業界フィルター"),
-    include_sales_status: bool = Query(True, description="営業ステータス含める")
+    include_sales_status: bool = Query(True, description="営業ステータス含める"),
+    company_service: CompanyService = Depends(get_company_service)
 ):
     """
     Excel エクスポート
     
+    書き込み専用モードで行を一時ファイルへ逐次書き出し、完成したファイルを
+    チャンク単位で送信する。シート全体をメモリ上に保持しない。
+    
     Args:
         status: ステータスフィルター
         prefecture: 都道府県フィルター
@@ -146,119 +443,254 @@ async def export_excel(
     Returns:
         Excel ファイル
     """
+    path = None
     try:
-        # フィルター条件構築
-        filters = {}
-        if status:
-            filters["status"] = status
-        if prefecture:
-            filters["prefecture"] = prefecture
-        if industry:
-            filters["industry"] = industry
-        
-        # データ取得
-        companies = await company_service.get_companies(filters=filters)
-        
-        # Excel ワークブック作成
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "企業リスト"
+        filters = build_filters(status, prefecture, industry)
         
-        # ヘッダースタイル
-        header_font = Font(bold=True)
-        header_alignment = Alignment(horizontal="center")
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        await write_excel_file(company_service, path, filters, include_sales_status)
         
-        # ヘッダー設定
-        headers = [
-            "ID", "会社名", "URL", "住所", "郵便番号", "都道府県", "市区町村",
-            "住所詳細", "電話番号", "FAX番号", "代表者名", "事業内容",
-            "設立年月日", "資本金", "問い合わせURL", "情報収集元URL",
-            "作成日時", "更新日時"
-        ]
-        
-        if include_sales_status:
-            headers.extend([
-                "営業ステータス", "メモ", "担当者", "最終コンタクト日", "次回アクション"
-            ])
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"companies_{timestamp}.xlsx"
         
-        # ヘッダー行作成
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.alignment = header_alignment
+        return StreamingResponse(
+            iter_file_chunks(path, delete=True),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(os.path.getsize(path))
+            }
+        )
         
-        # データ行作成
-        for row_idx, company in enumerate(companies, 2):
-            row_data = [
-                company.id,
-                company.company_name,
-                company.url,
-                company.address,
-                company.postal_code,
-                company.prefecture,
-                company.city,
-                company.address_detail,
-                company.tel,
-                company.fax,
-                company.representative,
-                company.business_content,
-                company.established_date,
-                company.capital,
-                company.contact_url,
-                company.source_url,
-                company.created_at.isoformat() if company.created_at else "",
-                company.updated_at.isoformat() if company.updated_at else ""
-            ]
-            
-            if include_sales_status and company.id:
-                # 営業ステータス取得
-                sales_status = await google_sheets_service.get_sales_status(company.id)
-                if sales_status:
-                    row_data.extend([
-                        sales_status.status,
-                        sales_status.memo,
-                        sales_status.contact_person,
-                        sales_status.last_contact_date.isoformat() if sales_status.last_contact_date else "",
-                        sales_status.next_action
-                    ])
-                else:
-                    row_data.extend(["", "", "", "", ""])
-            
-            # セル設定
-            for col, value in enumerate(row_data, 1):
-                ws.cell(row=row_idx, column=col, value=value)
-        
-        # 列幅自動調整
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+    except Exception as e:
+        if path and os.path.exists(path):
+            os.remove(path)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def export_columnar(
+    company_service: CompanyService,
+    file_format: str,
+    status: Optional[str],
+    prefecture: Optional[str],
+    industry: Optional[str],
+    include_sales_status: bool
+) -> StreamingResponse:
+    """
+    列指向フォーマットのファイルを生成して返す
+    
+    Args:
+        company_service: 企業情報サービス
+        file_format: "parquet" または "arrow"
+        status: ステータスフィルター
+        prefecture: 都道府県フィルター
+        industry: 業界フィルター
+        include_sales_status: 営業ステータス含める
         
-        # ファイル出力
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+    Returns:
+        ファイルのストリーミングレスポンス
+    """
+    media_type, extension = COLUMNAR_FORMATS[file_format]
+    path = None
+    try:
+        filters = build_filters(status, prefecture, industry)
+        
+        fd, path = tempfile.mkstemp(suffix=f".{extension}")
+        os.close(fd)
+        await write_columnar_file(
+            path,
+            iter_export_pages(company_service, filters, include_sales_status),
+            include_sales_status,
+            file_format=file_format
+        )
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"companies_{timestamp}.xlsx"
+        filename = f"companies_{timestamp}.{extension}"
         
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            iter_file_chunks(path, delete=True),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(os.path.getsize(path))
+            }
         )
         
     except Exception as e:
+        if path and os.path.exists(path):
+            os.remove(path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/parquet")
+async def export_parquet(
+    status: Optional[str] = Query(None, description="ステータスフィルター"),
+    prefecture: Optional[str] = Query(None, description="都道府県フィルター"),
+    industry: Optional[str] = Query(None, description="業界フィルター"),
+    include_sales_status: bool = Query(True, description="営業ステータス含める"),
+    company_service: CompanyService = Depends(get_company_service)
+):
+    """
+    Parquet エクスポート
+    
+    日時列は timestamp 型、都道府県・営業ステータスは辞書エンコードした列で出力する
+    （pandas では category 型として読み込まれる）。
+    
+    Args:
+        status: ステータスフィルター
+        prefecture: 都道府県フィルター
+        industry: 業界フィルター
+        include_sales_status: 営業ステータス含める
+        
+    Returns:
+        Parquet ファイル
+    """
+    return await export_columnar(company_service, "parquet", status, prefecture, industry, include_sales_status)
+
+
+@router.get("/arrow")
+async def export_arrow(
+    status: Optional[str] = Query(None, description="ステータスフィルター"),
+    prefecture: Optional[str] = Query(None, description="都道府県フィルター"),
+    industry: Optional[str] = Query(None, description="業界フィルター"),
+    include_sales_status: bool = Query(True, description="営業ステータス含める"),
+    company_service: CompanyService = Depends(get_company_service)
+):
+    """
+    Arrow IPC（ストリーム形式）エクスポート
+    
+    Args:
+        status: ステータスフィルター
+        prefecture: 都道府県フィルター
+        industry: 業界フィルター
+        include_sales_status: 営業ステータス含める
+        
+    Returns:
+        Arrow IPC ファイル
+    """
+    return await export_columnar(company_service, "arrow", status, prefecture, industry, include_sales_status)
+
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=202)
+async def create_export_job(
+    request: ExportRequest,
+    export_job_manager: ExportJobManager = Depends(get_export_job_manager)
+) -> ExportJobResponse:
+    """
+    エクスポートジョブ登録
+    
+    ファイルはバックグラウンドのワーカーで生成する。同じ条件の成果物がデータ更新前に
+    生成済みであれば、ジョブは即座に完了状態で返る。
+    
+    Args:
+        request: エクスポートリクエスト
+        
+    Returns:
+        ジョブ情報
+    """
+    try:
+        filters = build_filters(request.status, request.prefecture, request.industry)
+        job = await export_job_manager.submit(request.format, filters, request.include_sales_status)
+        return to_job_response(job, message="Export job accepted")
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: str,
+    export_job_manager: ExportJobManager = Depends(get_export_job_manager)
+) -> ExportJobResponse:
+    """
+    エクスポートジョブ状況取得
+    
+    Args:
+        job_id: ジョブID
+        
+    Returns:
+        ジョブ情報
+    """
+    job = export_job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    
+    return to_job_response(job, message="Export job retrieved successfully")
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    export_job_manager: ExportJobManager = Depends(get_export_job_manager)
+):
+    """
+    エクスポートジョブの成果物ダウンロード
+    
+    Range ヘッダー（単一範囲）に対応し、中断したダウンロードを途中から再開できる。
+    
+    Args:
+        job_id: ジョブID
+        range_header: Range ヘッダー
+        if_range: If-Range ヘッダー（ETag が一致する場合のみ範囲指定を適用）
+        
+    Returns:
+        エクスポートファイル（範囲指定時は 206）
+    """
+    job = export_job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+    
+    path = export_job_manager.artifact_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export file has expired")
+    
+    size = os.path.getsize(path)
+    etag = f'"{job["cache_key"]}"'
+    media_type, extension = EXPORT_FORMATS[job["format"]]
+    timestamp = job["finished_at"].strftime("%Y%m%d_%H%M%S")
+    headers = {
+        "Content-Disposition": f"attachment; filename=companies_{timestamp}.{extension}",
+        "Accept-Ranges": "bytes",
+        "ETag": etag
+    }
+    
+    # 成果物が変わっている場合は範囲指定を無視して全体を返す
+    if if_range and if_range != etag:
+        range_header = None
+    
+    try:
+        byte_range = parse_range_header(range_header, size)
+    except ValueError:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            iter_file_chunks(path),
+            media_type=media_type,
+            headers=headers
+        )
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(path, start, end, FILE_CHUNK_SIZE),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+
 @router.get("/template")
 async def export_template():
     """
@@ -274,8 +706,8 @@ async def export_template():
         ws.title = "企業情報テンプレート"
         
         # ヘッダースタイル
-        header_font = Font(bold=True, color="FFFFFF")
-        header_alignment = Alignment(horizontal="center")
+        header_font = openpyxl.styles.Font(bold=True, color="FFFFFF")
+        header_alignment = openpyxl.styles.Alignment(horizontal="center")
         
         # ヘッダー設定
         headers = [
@@ -366,33 +798,33 @@ async def export_template():
 
 
 @router.get("/stats")
-async def get_export_stats():
+async def get_export_stats(
+    rebuild: bool = Query(False, description="全件から集計し直す"),
+    company_service: CompanyService = Depends(get_company_service)
+):
     """
     エクスポート統計情報取得
     
+    集計値はサービス層で差分更新されているものを返すため、件数によらず一定時間で応答する。
+    
+    Args:
+        rebuild: 全件から集計し直す
+        
     Returns:
         統計情報
     """
     try:
-        # 企業数取得
-        companies = await company_service.get_companies()
-        total_companies = len(companies)
-        
-        # ステータス別集計
-        status_summary = await google_sheets_service.get_sales_summary()
-        
-        # 都道府県別集計
-        prefecture_summary = {}
-        for company in companies:
-            if company.prefecture:
-                prefecture_summary[company.prefecture] = prefecture_summary.get(company.prefecture, 0) + 1
+        stats = await company_service.get_stats(rebuild=rebuild)
+        last_updated = stats["last_updated"] or datetime.now()
         
         return {
             "success": True,
-            "total_companies": total_companies,
-            "status_summary": status_summary,
-            "prefecture_summary": prefecture_summary,
-            "last_updated": datetime.now().isoformat(),
+            "total_companies": stats["total_companies"],
+            "status_summary": stats["status_summary"],
+            "prefecture_summary": stats["prefecture_summary"],
+            "industry_summary": stats["industry_summary"],
+            "created_date_summary": stats["created_date_summary"],
+            "last_updated": last_updated.isoformat(),
             "message": "Export statistics retrieved successfully"
         }
         
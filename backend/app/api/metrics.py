@@ -0,0 +1,61 @@
+"""
+メトリクス API
+"""
+import time
+
+from fastapi import APIRouter, Response
+
+from app.utils.metrics import CONTENT_TYPE, HTTP_REQUEST_DURATION, REGISTRY
+
+router = APIRouter()
+
+# どのルートにも一致しなかったリクエストのラベル（パスをそのままラベルにしない）
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ルートごとのレイテンシを記録する ASGI ミドルウェア
+
+    ラベルにはリクエストのパスではなくルートのテンプレート（/api/companies/{company_id} など）を使う。
+    ストリーミングレスポンスは最後のチャンクを送り終えるまでを計測する。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # ルーティング時に一致したルートが scope に設定される
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status
+            ).observe(time.perf_counter() - started)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    メトリクス取得（Prometheus のテキスト形式）
+
+    Returns:
+        メトリクス
+    """
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -2,8 +2,9 @@
 営業ステータス管理 API
 """
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request, Response
 from datetime import datetime
+from pydantic import TypeAdapter
 
 from app.models.company import SalesStatus
 from app.models.responses import (
@@ -13,16 +14,58 @@ from app.models.responses import (
     SalesDashboardResponse,
     BaseResponse
 )
-from app.services.google_sheets import GoogleSheetsService
+from app.api.dependencies import get_sales_service
+from app.services.sales_service import SalesService
+from app.utils.json_response import json_response
 
 router = APIRouter()
 
-# サービス初期化
-google_sheets_service = GoogleSheetsService()
+SALES_STATUS_LIST_ADAPTER = TypeAdapter(List[SalesStatusResponse])
+
+
+@router.get("/dashboard", response_model=SalesDashboardResponse)
+async def get_sales_dashboard(
+    response: Response,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    sales_service: SalesService = Depends(get_sales_service)
+):
+    """
+    営業ダッシュボード取得
+    
+    集計値は営業ステータスの更新時に差分反映されたスナップショットを返す。
+    内容が変わっていなければ 304 を返す。
+    
+    Args:
+        response: レスポンス（ETag の設定用）
+        if_none_match: If-None-Match ヘッダー
+        
+    Returns:
+        ダッシュボード情報
+    """
+    try:
+        dashboard, etag = await sales_service.get_dashboard()
+        
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        response.headers["ETag"] = etag
+        return SalesDashboardResponse(
+            summary=dashboard["summary"],
+            total_companies=dashboard["total_companies"],
+            recent_updates=dashboard["recent_updates"],
+            conversion_rate=dashboard["conversion_rate"],
+            message="Dashboard data retrieved successfully"
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{company_id}", response_model=SalesStatusResponse)
-async def get_sales_status(company_id: int) -> SalesStatusResponse:
+async def get_sales_status(
+    company_id: int,
+    sales_service: SalesService = Depends(get_sales_service)
+) -> SalesStatusResponse:
     """
     営業ステータス取得
     
@@ -33,7 +76,7 @@ async def get_sales_status(company_id: int) -> SalesStatusResponse:
         営業ステータス情報
     """
     try:
-        status = await google_sheets_service.get_sales_status(company_id)
+        status = await sales_service.get_sales_status(company_id)
         
         if not status:
             raise HTTPException(
@@ -52,10 +95,42 @@ async def get_sales_status(company_id: int) -> SalesStatusResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{company_id}/history")
+async def get_sales_status_history(
+    company_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="取得件数（新しいものから）"),
+    sales_service: SalesService = Depends(get_sales_service)
+):
+    """
+    営業ステータス履歴取得
+    
+    Args:
+        company_id: 企業ID
+        limit: 取得件数
+        
+    Returns:
+        日時の昇順に並んだ営業ステータスの履歴
+    """
+    try:
+        history = await sales_service.get_status_history(company_id, limit=limit)
+        
+        return {
+            "success": True,
+            "company_id": company_id,
+            "history": history,
+            "count": len(history),
+            "message": "Sales status history retrieved successfully"
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/{company_id}", response_model=SalesStatusUpdateResponse)
 async def update_sales_status(
     company_id: int,
-    status_data: SalesStatusUpdateRequest
+    status_data: SalesStatusUpdateRequest,
+    sales_service: SalesService = Depends(get_sales_service)
 ) -> SalesStatusUpdateResponse:
     """
     営業ステータス更新
@@ -75,11 +150,12 @@ async def update_sales_status(
             memo=status_data.memo,
             contact_person=status_data.contact_person,
             next_action=status_data.next_action,
+            next_action_date=status_data.next_action_date,
             updated_at=datetime.now()
         )
         
         # ステータス更新
-        success = await google_sheets_service.update_sales_status(sales_status)
+        success = await sales_service.update_sales_status(sales_status)
         
         if not success:
             raise HTTPException(
@@ -101,15 +177,20 @@ async def update_sales_status(
 
 @router.get("/", response_model=List[SalesStatusResponse])
 async def get_sales_statuses(
+    request: Request,
     status: Optional[str] = Query(None, description="ステータスフィルター"),
     contact_person: Optional[str] = Query(None, description="担当者フィルター"),
     limit: int = Query(100, ge=1, le=1000, description="取得件数"),
-    offset: int = Query(0, ge=0, description="オフセット")
-) -> List[SalesStatusResponse]:
+    offset: int = Query(0, ge=0, description="オフセット"),
+    sales_service: SalesService = Depends(get_sales_service)
+) -> Response:
     """
     営業ステータス一覧取得
     
+    応答は再検証せずに pydantic-core で直接 JSON にし、Accept-Encoding に応じて圧縮する。
+    
     Args:
+        request: リクエスト
         status: ステータスフィルター
         contact_person: 担当者フィルター
         limit: 取得件数
@@ -125,61 +206,22 @@ async def get_sales_statuses(
         if contact_person:
             filters["contact_person"] = contact_person
             
-        statuses = await google_sheets_service.get_sales_statuses(
+        statuses = await sales_service.list_sales_statuses(
             filters=filters,
             limit=limit,
             offset=offset
         )
         
-        return [
-            SalesStatusResponse(
-                status=status_item,
-                message="Sales status retrieved successfully"
-            )
-            for status_item in statuses
-        ]
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/dashboard", response_model=SalesDashboardResponse)
-async def get_sales_dashboard() -> SalesDashboardResponse:
-    """
-    営業ダッシュボード取得
-    
-    Returns:
-        ダッシュボード情報
-    """
-    try:
-        # ステータス別集計取得
-        summary = await google_sheets_service.get_sales_summary()
-        
-        # 総企業数
-        total_companies = sum(summary.values())
-        
-        # 最近の更新履歴
-        recent_updates = await google_sheets_service.get_recent_sales_updates(limit=10)
-        
-        # 成約率計算
-        conversion_rate = 0.0
-        if total_companies > 0:
-            converted = summary.get("成約", 0)
-            approached = sum([
-                summary.get("アプローチ中", 0),
-                summary.get("商談中", 0),
-                summary.get("成約", 0),
-                summary.get("見送り", 0)
-            ])
-            if approached > 0:
-                conversion_rate = (converted / approached) * 100
-        
-        return SalesDashboardResponse(
-            summary=summary,
-            total_companies=total_companies,
-            recent_updates=recent_updates,
-            conversion_rate=round(conversion_rate, 2),
-            message="Dashboard data retrieved successfully"
+        return json_response(
+            request,
+            [
+                SalesStatusResponse(
+                    status=status_item,
+                    message="Sales status retrieved successfully"
+                )
+                for status_item in statuses
+            ],
+            adapter=SALES_STATUS_LIST_ADAPTER
         )
         
     except Exception as e:
@@ -189,21 +231,29 @@ async def get_sales_dashboard() -> SalesDashboardResponse:
 @router.post("/{company_id}/follow-up", response_model=BaseResponse)
 async def schedule_follow_up(
     company_id: int,
-    follow_up_data: Dict[str, Any]
+    follow_up_data: Dict[str, Any],
+    sales_service: SalesService = Depends(get_sales_service)
 ) -> BaseResponse:
     """
     フォローアップ予定設定
     
     Args:
         company_id: 企業ID
-        follow_up_data: フォローアップ情報
+        follow_up_data: フォローアップ情報（next_action, next_action_date）
         
     Returns:
         設定結果
     """
+    next_action_date = follow_up_data.get("next_action_date")
+    if next_action_date:
+        try:
+            next_action_date = datetime.fromisoformat(next_action_date)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Invalid next_action_date: {next_action_date}")
+    
     try:
         # 現在のステータス取得
-        current_status = await google_sheets_service.get_sales_status(company_id)
+        current_status = await sales_service.get_sales_status(company_id)
         
         if not current_status:
             raise HTTPException(
@@ -213,10 +263,11 @@ async def schedule_follow_up(
         
         # フォローアップ情報更新
         current_status.next_action = follow_up_data.get("next_action")
+        current_status.next_action_date = next_action_date or None
         current_status.updated_at = datetime.now()
         
         # ステータス更新
-        success = await google_sheets_service.update_sales_status(current_status)
+        success = await sales_service.update_sales_status(current_status)
         
         if not success:
             raise HTTPException(
@@ -236,11 +287,14 @@ async def schedule_follow_up(
 
 @router.get("/follow-ups/upcoming")
 async def get_upcoming_follow_ups(
-    days: int = Query(7, ge=1, le=30, description="今後何日分")
+    days: int = Query(7, ge=1, le=30, description="今後何日分"),
+    sales_service: SalesService = Depends(get_sales_service)
 ):
     """
     今後のフォローアップ予定取得
     
+    次回アクション予定日時の索引から範囲検索するため、営業ステータスを全件走査しない。
+    
     Args:
         days: 取得する日数
         
@@ -248,7 +302,7 @@ async def get_upcoming_follow_ups(
         フォローアップ予定一覧
     """
     try:
-        follow_ups = await google_sheets_service.get_upcoming_follow_ups(days)
+        follow_ups = await sales_service.get_upcoming_follow_ups(days)
         
         return {
             "success": True,
@@ -263,11 +317,14 @@ async def get_upcoming_follow_ups(
 
 @router.get("/analytics/conversion")
 async def get_conversion_analytics(
-    period: str = Query("monthly", regex="^(weekly|monthly|yearly)$")
+    period: str = Query("monthly", pattern="^(weekly|monthly|yearly)$"),
+    sales_service: SalesService = Depends(get_sales_service)
 ):
     """
     成約率分析取得
     
+    期間ごとに集計済みのファネル（各ステータスへの遷移件数）と成約率を返す。
+    
     Args:
         period: 分析期間
         
@@ -275,7 +332,7 @@ async def get_conversion_analytics(
         成約率分析データ
     """
     try:
-        analytics = await google_sheets_service.get_conversion_analytics(period)
+        analytics = await sales_service.get_conversion_analytics(period)
         
         return {
             "success": True,
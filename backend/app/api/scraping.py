@@ -2,9 +2,10 @@
 スクレイピング実行 API
 """
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from datetime import datetime
 import asyncio
+import uuid
 
 from app.models.responses import (
     ScrapingConfigRequest,
@@ -12,15 +13,18 @@ from app.models.responses import (
     ScrapingStatusResponse,
     BaseResponse
 )
+from app.api.dependencies import get_company_service, get_scraping_engine, get_sheets_service
 from app.services.company_service import CompanyService
 from app.services.google_sheets import GoogleSheetsService
 from app.services.scraping_engine import ScrapingEngine
+from app.utils.tracing import TRACER
 
 router = APIRouter()
 
 # グローバル状態管理（実際の実装では Redis などを使用）
 scraping_status = {
     "status": "idle",  # idle, running, completed, error
+    "job_id": None,
     "progress": 0,
     "collected": 0,
     "total": None,
@@ -30,25 +34,24 @@ scraping_status = {
     "error_message": None
 }
 
-# サービス初期化
-google_sheets_service = GoogleSheetsService()
-company_service = CompanyService(google_sheets_service)
-scraping_engine = ScrapingEngine()
 
-
-async def run_scraping_task(config: ScrapingConfigRequest):
+async def run_scraping_task(config: ScrapingConfigRequest, company_service: CompanyService):
     """
     バックグラウンドでスクレイピングを実行
     
     Args:
         config: スクレイピング設定
+        company_service: 企業情報サービス
     """
     global scraping_status
     
+    job_id = config.job_id
+    
     try:
         # ステータス初期化
         scraping_status.update({
             "status": "running",
+            "job_id": job_id,
             "progress": 0,
             "collected": 0,
             "total": None,
@@ -58,17 +61,19 @@ async def run_scraping_task(config: ScrapingConfigRequest):
             "error_message": None
         })
         
-        # スクレイピング実行
-        result = await company_service.collect_companies(
-            keywords=config.keywords,
-            target_sites=config.target_sites,
-            max_pages=config.max_pages,
-            filters={
-                "prefecture": config.prefecture,
-                "industry": config.industry
-            },
-            progress_callback=update_progress
-        )
+        # スクレイピング実行（リクエストのトレースを引き継ぎ、ジョブIDで集計できるようにする）
+        with TRACER.span("scraping_job", {"job_id": job_id, "keywords": config.keywords}):
+            result = await company_service.collect_companies(
+                keywords=config.keywords,
+                target_sites=config.target_sites,
+                max_pages=config.max_pages,
+                filters={
+                    "prefecture": config.prefecture,
+                    "industry": config.industry
+                },
+                progress_callback=update_progress,
+                job_id=job_id
+            )
         
         # 完了ステータス更新
         scraping_status.update({
@@ -111,7 +116,8 @@ def update_progress(current: int, total: int, current_url: str = None):
 @router.post("/start", response_model=ScrapingResponse)
 async def start_scraping(
     config: ScrapingConfigRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    company_service: CompanyService = Depends(get_company_service)
 ) -> ScrapingResponse:
     """
     スクレイピング開始
@@ -132,9 +138,13 @@ async def start_scraping(
             detail="Scraping is already running"
         )
     
+    # ジョブIDが指定されていればチェックポイントから再開する
+    if not config.job_id:
+        config.job_id = uuid.uuid4().hex
+    
     try:
         # バックグラウンドタスクとして実行
-        background_tasks.add_task(run_scraping_task, config)
+        background_tasks.add_task(run_scraping_task, config, company_service)
         
         return ScrapingResponse(
             result={
@@ -142,7 +152,7 @@ async def start_scraping(
                 "errors": 0,
                 "skipped": 0,
                 "execution_time": None,
-                "details": {"status": "started"}
+                "details": {"status": "started", "job_id": config.job_id}
             },
             message="Scraping started successfully"
         )
@@ -173,6 +183,7 @@ async def get_scraping_status() -> ScrapingStatusResponse:
     
     return ScrapingStatusResponse(
         status=scraping_status["status"],
+        job_id=scraping_status["job_id"],
         progress=scraping_status["progress"],
         collected=scraping_status["collected"],
         total=scraping_status["total"],
@@ -183,7 +194,9 @@ async def get_scraping_status() -> ScrapingStatusResponse:
 
 
 @router.post("/stop", response_model=BaseResponse)
-async def stop_scraping() -> BaseResponse:
+async def stop_scraping(
+    scraping_engine: ScrapingEngine = Depends(get_scraping_engine)
+) -> BaseResponse:
     """
     スクレイピング停止
     
@@ -219,7 +232,8 @@ async def stop_scraping() -> BaseResponse:
 @router.get("/history")
 async def get_scraping_history(
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    google_sheets_service: GoogleSheetsService = Depends(get_sheets_service)
 ):
     """
     スクレイピング履歴取得
@@ -250,7 +264,9 @@ async def get_scraping_history(
 
 
 @router.get("/config")
-async def get_scraping_config():
+async def get_scraping_config(
+    scraping_engine: ScrapingEngine = Depends(get_scraping_engine)
+):
     """
     スクレイピング設定取得
     
@@ -271,7 +287,10 @@ async def get_scraping_config():
 
 
 @router.put("/config")
-async def update_scraping_config(config: Dict[str, Any]):
+async def update_scraping_config(
+    config: Dict[str, Any],
+    scraping_engine: ScrapingEngine = Depends(get_scraping_engine)
+):
     """
     スクレイピング設定更新
     
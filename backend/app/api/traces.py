@@ -0,0 +1,85 @@
+"""
+トレース API
+"""
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from app.utils.tracing import TRACEPARENT_HEADER, TRACER, load_job_trace, parse_traceparent
+
+router = APIRouter()
+
+# トレースを記録しないパス（スクレイプや死活監視で頻繁に呼ばれる）
+UNTRACED_PATHS = {"/metrics", "/health"}
+
+
+class TracingMiddleware:
+    """
+    リクエストごとにスパンを記録する ASGI ミドルウェア
+
+    traceparent ヘッダーがあればそのトレースを引き継ぎ、レスポンスの X-Trace-Id ヘッダーで
+    トレースIDを返す。リクエストから起動したバックグラウンド処理も同じトレースに記録される。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACER.enabled or scope["path"] in UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        parent = parse_traceparent(headers.get(TRACEPARENT_HEADER.encode(), b"").decode("latin-1"))
+
+        with TRACER.span("http.request", {"method": scope["method"]}, parent=parent) as span:
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("status", message["status"])
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"x-trace-id", span.trace_id.encode())]
+                    }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = scope.get("route")
+                span.set_attribute("route", getattr(route, "path", "unmatched"))
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_trace(
+    job_id: str,
+    format: str = Query("json", pattern="^(json|collapsed)$", description="json または collapsed")
+):
+    """
+    ジョブのトレース集計取得
+
+    スクレイピング・エクスポートのジョブについて、スパン名ごとの時間と、フレームグラフの
+    ツール（flamegraph.pl, speedscope など）で読み込める集約スタックを返す。
+
+    Args:
+        job_id: ジョブID
+        format: json（集計）または collapsed（集約スタックのテキスト）
+
+    Returns:
+        トレースの集計
+    """
+    if TRACER.exporter is None:
+        raise HTTPException(status_code=404, detail="Tracing is disabled")
+
+    # ファイルの読み書きはイベントループを止めないようスレッドで行う
+    await asyncio.to_thread(TRACER.flush)
+    summary = await asyncio.to_thread(load_job_trace, TRACER.exporter.path, job_id)
+    if not summary["trace_ids"]:
+        raise HTTPException(status_code=404, detail="Trace not found")
+
+    if format == "collapsed":
+        return Response(content="\n".join(summary["collapsed"]) + "\n", media_type="text/plain; charset=utf-8")
+    return {
+        "success": True,
+        **summary,
+        "message": "Job trace retrieved successfully"
+    }
@@ -1,27 +1,59 @@
 """
 営業リスト作成ツール FastAPI メインアプリケーション
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from datetime import datetime
 import logging
+import os
 from typing import Dict, Any
 
-from app.api import companies, scraping, sales, export
+from app.api import companies, scraping, sales, export, metrics, traces, admin
+from app.api.metrics import MetricsMiddleware
+from app.api.traces import TracingMiddleware
+from app.services.container import ServiceContainer
+from app.utils.tracing import TRACER, configure_tracing
 
 # ロガー設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    アプリケーションの起動・終了時の処理
+    
+    サービスはコンテナで初回利用時に作成し、終了時に作成と逆の順序で閉じる。
+    トレースは TRACE_EXPORT_PATH を設定した場合のみその JSONL（例: data/traces/spans.jsonl）へ
+    書き出す。ファイルは上限サイズでローテーションする。
+    """
+    configure_tracing(os.environ.get("TRACE_EXPORT_PATH") or None)
+    container = ServiceContainer()
+    app.state.container = container
+    await container.startup()
+    logger.info("営業リスト作成ツール API が起動しました")
+    try:
+        yield
+    finally:
+        await container.aclose()
+        TRACER.flush()
+        logger.info("営業リスト作成ツール API が終了しました")
+
+
 # FastAPI アプリケーション初期化
 app = FastAPI(
     title="営業リスト作成ツール API",
     description="ASPおよび広告代理店への営業活動を効率化するツールのAPI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS設定
@@ -33,6 +65,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ルートごとのレイテンシの計測とリクエストのトレース
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
 
 # エラーハンドラー
 @app.exception_handler(RequestValidationError)
@@ -43,7 +79,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         status_code=422,
         content={
             "detail": "Validation error",
-            "errors": exc.errors(),
+            # ctx に含まれる例外オブジェクトも JSON にできる形にする
+            "errors": jsonable_encoder(exc.errors()),
             "timestamp": datetime.now().isoformat()
         }
     )
@@ -92,6 +129,22 @@ app.include_router(
     responses={404: {"description": "Not found"}}
 )
 
+app.include_router(
+    traces.router,
+    prefix="/api/traces",
+    tags=["traces"],
+    responses={404: {"description": "Not found"}}
+)
+
+app.include_router(
+    admin.router,
+    prefix="/api/admin",
+    tags=["admin"],
+    responses={401: {"description": "Invalid admin token"}, 403: {"description": "Admin API is disabled"}}
+)
+
+app.include_router(metrics.router, tags=["metrics"])
+
 
 # ヘルスチェックエンドポイント
 @app.get("/health", tags=["health"])
@@ -127,25 +180,29 @@ async def api_info() -> Dict[str, Any]:
             "sales": "/api/sales",
             "export": "/api/export",
             "docs": "/docs",
-            "health": "/health"
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
 
-# 起動時の処理
-@app.on_event("startup")
-async def startup_event():
-    """アプリケーション起動時の処理"""
-    logger.info("営業リスト作成ツール API が起動しました")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """アプリケーション終了時の処理"""
-    logger.info("営業リスト作成ツール API が終了しました")
-
-
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="営業リスト作成ツール API")
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="起動時のモジュールごとのインポート時間を表示して終了する"
+    )
+    parser.add_argument("--limit", type=int, default=20, help="表示するモジュール数")
+    args = parser.parse_args()
+    
+    if args.profile_imports:
+        from app.utils.import_profile import format_import_profile, profile_imports
+        print(format_import_profile(profile_imports("app.main"), limit=args.limit))
+        raise SystemExit(0)
+    
     import uvicorn
     uvicorn.run(
         "main:app",
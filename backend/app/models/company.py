@@ -2,10 +2,38 @@
 企業情報モデル
 """
 import re
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, ClassVar
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator, ConfigDict, field_serializer
 
+from app.utils.address import PREFECTURES, parse_address  # noqa: F401（PREFECTURES は互換のため再公開）
+
+
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# 保存済みの行から Company を組み立てるときに型を変換する項目
+_INT_FIELDS = ("id", "capital_yen")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def to_local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    タイムゾーン付きの日時をローカル時刻のタイムゾーンなしの日時にそろえる
+    
+    アプリケーション内の日時は datetime.now() と同じタイムゾーンなしのローカル時刻で扱う。
+    JavaScript の toISOString() の値（"...Z"）なども比較できるよう入力時に変換する。
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
 
 class Company(BaseModel):
     """企業情報モデル"""
@@ -26,6 +54,7 @@ class Company(BaseModel):
     business_content: Optional[str] = Field(None, description="事業内容")
     established_date: Optional[str] = Field(None, description="設立年月日")
     capital: Optional[str] = Field(None, description="資本金")
+    capital_yen: Optional[int] = Field(None, description="資本金（円）")
     contact_url: Optional[str] = Field(None, description="問い合わせフォームURL")
     source_url: Optional[str] = Field(None, description="情報収集元URL")
     created_at: Optional[datetime] = None
@@ -43,15 +72,7 @@ class Company(BaseModel):
     @classmethod
     def validate_url(cls, v):
         """URLのバリデーション"""
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        if not url_pattern.match(v):
+        if not URL_PATTERN.match(v):
             raise ValueError(f"Invalid URL format: {v}")
         return v
     
@@ -62,55 +83,7 @@ class Company(BaseModel):
         Returns:
             分解された住所情報
         """
-        if not self.address:
-            return {
-                "postal_code": "",
-                "prefecture": "",
-                "city": "",
-                "address_detail": ""
-            }
-        
-        parsed = {
-            "postal_code": "",
-            "prefecture": "",
-            "city": "",
-            "address_detail": ""
-        }
-        
-        # 郵便番号の抽出
-        postal_match = re.search(r'〒?(\d{3}-?\d{4})', self.address)
-        if postal_match:
-            parsed["postal_code"] = postal_match.group(1)
-            address_without_postal = self.address.replace(postal_match.group(0), "").strip()
-        else:
-            address_without_postal = self.address
-        
-        # 都道府県の抽出
-        prefectures = [
-            "北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県",
-            "茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県",
-            "新潟県", "富山県", "石川県", "福井県", "山梨県", "長野県", "岐阜県",
-            "静岡県", "愛知県", "三重県", "滋賀県", "京都府", "大阪府", "兵庫県",
-            "奈良県", "和歌山県", "鳥取県", "島根県", "岡山県", "広島県", "山口県",
-            "徳島県", "香川県", "愛媛県", "高知県", "福岡県", "佐賀県", "長崎県",
-            "熊本県", "大分県", "宮崎県", "鹿児島県", "沖縄県"
-        ]
-        
-        for pref in prefectures:
-            if pref in address_without_postal:
-                parsed["prefecture"] = pref
-                remaining = address_without_postal.split(pref, 1)[1].strip()
-                
-                # 市区町村の抽出（簡易版）
-                city_match = re.match(r'^([^市区町村]+(?:市|区|町|村))', remaining)
-                if city_match:
-                    parsed["city"] = city_match.group(1)
-                    parsed["address_detail"] = remaining[len(city_match.group(1)):].strip()
-                else:
-                    parsed["address_detail"] = remaining
-                break
-        
-        return parsed
+        return parse_address(self.address)
 
     @field_serializer('created_at', 'updated_at')
     def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
@@ -118,10 +91,93 @@ class Company(BaseModel):
         return dt.isoformat() if dt else None
 
 
+# 保存済みの行から組み立てるときの項目の既定値（必須項目は行に含まれていなければ通常の検証に回す）
+_COMPANY_DEFAULTS: Dict[str, Any] = {
+    field: None if info.is_required() else info.get_default()
+    for field, info in Company.model_fields.items()
+}
+
+
+def _trusted_values(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """保存済みの行の型を変換した項目の辞書（通常の検証が必要な行は None）"""
+    values = {field: row.get(field) or default for field, default in _COMPANY_DEFAULTS.items()}
+    if not values["company_name"] or not values["url"]:
+        return None
+    
+    try:
+        for field in _INT_FIELDS:
+            if isinstance(values[field], str):
+                values[field] = int(values[field])
+        for field in _DATETIME_FIELDS:
+            if isinstance(values[field], str):
+                values[field] = datetime.fromisoformat(values[field])
+    except ValueError:
+        return None
+    return values
+
+
+@dataclass(slots=True, kw_only=True)
+class CompanyRecord:
+    """
+    一括読み込み用の軽量な企業情報
+    
+    一覧・エクスポートで大量の行を扱うときに Company の代わりに使う（検証やシリアライザを持たない）。
+    Company への変換は API の境界で to_company() を使うか、TypeAdapter や
+    レスポンスモデルの項目として直接 JSON にする。
+    """
+    id: Optional[int] = None
+    company_name: str
+    url: str
+    address: Optional[str] = None
+    postal_code: Optional[str] = None
+    prefecture: Optional[str] = None
+    city: Optional[str] = None
+    address_detail: Optional[str] = None
+    tel: Optional[str] = None
+    fax: Optional[str] = None
+    representative: Optional[str] = None
+    business_content: Optional[str] = None
+    established_date: Optional[str] = None
+    capital: Optional[str] = None
+    capital_yen: Optional[int] = None
+    contact_url: Optional[str] = None
+    source_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "CompanyRecord":
+        """
+        保存済みの行から組み立てる
+        
+        型の変換だけで組み立てられない行は Company で検証する（不正な場合は ValueError）。
+        
+        Args:
+            row: 企業情報の辞書（空文字の項目は未設定として扱う）
+            
+        Returns:
+            企業情報
+        """
+        values = _trusted_values(row)
+        if values is None:
+            company = Company(**{key: value for key, value in row.items() if value != ""})
+            values = {field: getattr(company, field) for field in _COMPANY_DEFAULTS}
+        return cls(**values)
+    
+    def to_company(self) -> Company:
+        """Company に変換する（from_row で型を変換済みのため検証を省く）"""
+        # 値のある項目だけを渡し、設定済み項目の集合を検証した場合とそろえる
+        return Company.model_construct(**{
+            field: value for field in _COMPANY_DEFAULTS
+            if (value := getattr(self, field)) is not None
+        })
+
+
 class SalesStatus(BaseModel):
     """営業ステータスモデル"""
     
-    model_config = ConfigDict()
+    # 代入時も日時をそろえる
+    model_config = ConfigDict(validate_assignment=True)
     
     # クラス変数として定義
     VALID_STATUSES: ClassVar[list[str]] = ["未着手", "アプローチ中", "商談中", "成約", "見送り"]
@@ -132,6 +188,7 @@ class SalesStatus(BaseModel):
     contact_person: Optional[str] = Field(None, description="担当者名")
     last_contact_date: Optional[datetime] = Field(None, description="最終コンタクト日")
     next_action: Optional[str] = Field(None, description="次回アクション予定")
+    next_action_date: Optional[datetime] = Field(None, description="次回アクション予定日時")
     updated_at: Optional[datetime] = None
     
     @field_validator("status")
@@ -142,7 +199,13 @@ class SalesStatus(BaseModel):
             raise ValueError(f"Invalid status: {v}. Must be one of {cls.VALID_STATUSES}")
         return v 
 
-    @field_serializer('last_contact_date', 'updated_at')
+    @field_validator("last_contact_date", "next_action_date", "updated_at")
+    @classmethod
+    def validate_datetime(cls, v):
+        """日時をタイムゾーンなしのローカル時刻にそろえる"""
+        return to_local_naive(v)
+
+    @field_serializer('last_contact_date', 'next_action_date', 'updated_at')
     def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
         """日時フィールドのシリアライズ"""
         return dt.isoformat() if dt else None 
\ No newline at end of file
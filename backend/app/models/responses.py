@@ -5,7 +5,7 @@ from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from pydantic import BaseModel, Field
 
-from app.models.company import Company, SalesStatus
+from app.models.company import Company, CompanyRecord, SalesStatus
 
 
 class BaseResponse(BaseModel):
@@ -28,8 +28,8 @@ class CompanyResponse(BaseResponse):
 
 
 class CompaniesListResponse(BaseResponse):
-    """企業リストレスポンス"""
-    companies: List[Company]
+    """企業リストレスポンス（企業は Company に変換せず、軽量な CompanyRecord のまま JSON にする）"""
+    companies: List[CompanyRecord]
     total: int = 0
     page: int = 1
     page_size: int = 100
@@ -59,6 +59,11 @@ class ScrapingConfigRequest(BaseModel):
     max_pages: int = Field(default=10, ge=1, le=100, description="最大ページ数")
     prefecture: Optional[str] = Field(None, description="対象都道府県")
     industry: Optional[str] = Field(None, description="対象業界")
+    job_id: Optional[str] = Field(
+        None,
+        pattern=r"^[0-9a-f]{32}$",
+        description="再開するジョブID（開始時に払い出した uuid4 の16進文字列。未指定時は新規ジョブ）"
+    )
 
 
 class ScrapingResult(BaseModel):
@@ -79,6 +84,7 @@ class ScrapingResponse(BaseResponse):
 class ScrapingStatusResponse(BaseResponse):
     """スクレイピング状況レスポンス"""
     status: str  # "idle", "running", "completed", "error"
+    job_id: Optional[str] = None
     progress: int = 0  # 0-100
     collected: int = 0
     total: Optional[int] = None
@@ -97,6 +103,7 @@ class SalesStatusUpdateRequest(BaseModel):
     memo: Optional[str] = Field(None, description="メモ")
     contact_person: Optional[str] = Field(None, description="担当者名")
     next_action: Optional[str] = Field(None, description="次回アクション予定")
+    next_action_date: Optional[datetime] = Field(None, description="次回アクション予定日時")
 
 
 class SalesStatusUpdateResponse(BaseResponse):
@@ -114,7 +121,7 @@ class SalesDashboardResponse(BaseResponse):
 
 class ExportRequest(BaseModel):
     """エクスポートリクエスト"""
-    format: str = Field("csv", regex="^(csv|excel)$", description="出力形式")
+    format: str = Field("csv", pattern="^(csv|excel|parquet|arrow)$", description="出力形式")
     status: Optional[str] = Field(None, description="ステータスフィルター")
     prefecture: Optional[str] = Field(None, description="都道府県フィルター")
     industry: Optional[str] = Field(None, description="業界フィルター")
@@ -123,6 +130,19 @@ class ExportRequest(BaseModel):
     include_sales_status: bool = Field(True, description="営業ステータス含める")
 
 
+class ExportJobResponse(BaseResponse):
+    """エクスポートジョブレスポンス"""
+    job_id: str
+    status: str  # "queued", "running", "completed", "error"
+    format: str
+    cached: bool = False
+    size: Optional[int] = None
+    download_url: Optional[str] = None
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class HealthCheckResponse(BaseModel):
     """ヘルスチェックレスポンス"""
     status: str = "healthy"
@@ -0,0 +1,251 @@
+"""
+企業情報収集パイプライン
+
+取得 → 解析 → 正規化・重複排除 → 一括保存 の各段を上限付きの非同期キューでつなぎ、
+ネットワーク取得と Google Sheets への書き込みを並行して進める。
+下流の段が詰まるとキューが満杯になり、上流の段は空きが出るまで待機する（背圧）。
+"""
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.services.crawl_frontier import CrawlFrontier
+from app.services.discovery import normalize_url
+from app.services.google_sheets import GoogleSheetsService
+from app.services.record_normalizer import normalize_company_records
+from app.services.scraping_engine import FetchBudget, ScrapingEngine, admit_urls
+from app.utils.tracing import TRACER, traced
+
+
+class CollectionPipeline:
+    """段階的な企業情報収集パイプライン"""
+
+    def __init__(
+        self,
+        scraping_engine: ScrapingEngine,
+        sheets_service: GoogleSheetsService,
+        prepare_record: Callable[[Dict[str, Any]], Dict[str, Any]],
+        record_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        budget: Optional[FetchBudget] = None,
+        frontier: Optional[CrawlFrontier] = None,
+        on_saved: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ):
+        """
+        初期化
+
+        各段の並列数・キューサイズ・バッチサイズはスクレイピング設定から読み込む。
+
+        Args:
+            scraping_engine: スクレイピングエンジン
+            sheets_service: Google Sheetsサービス
+            prepare_record: 企業情報を保存用のレコードに変換する関数（不正な場合は例外）
+            record_filter: 保存対象とするか判定する関数
+            budget: 取得ページ数の上限
+            frontier: クロールフロンティア
+            on_saved: 保存したレコードを受け取るコールバック
+        """
+        config = scraping_engine.config
+        self.scraping_engine = scraping_engine
+        self.sheets_service = sheets_service
+        self.prepare_record = prepare_record
+        self.record_filter = record_filter
+        self.budget = budget
+        self.frontier = frontier
+        self.on_saved = on_saved
+
+        self.fetch_concurrency = config.get("fetch_concurrency", 5)
+        self.parse_concurrency = config.get("parse_concurrency", 2)
+        self.queue_size = config.get("pipeline_queue_size", 100)
+        self.save_batch_size = config.get("save_batch_size", 50)
+        self.save_flush_interval = config.get("save_flush_interval", 5.0)
+
+        self.stats = {
+            "fetched": 0,
+            "collected": 0,
+            "saved": 0,
+            "errors": 0,
+            "skipped": 0,
+            "duplicates": 0
+        }
+
+    @traced("collection_pipeline")
+    async def run(
+        self,
+        search_results: AsyncIterator[Dict[str, str]],
+        progress_callback: Optional[Callable[..., None]] = None
+    ) -> Dict[str, int]:
+        """
+        パイプラインを実行する
+
+        Args:
+            search_results: 探索結果の非同期イテレータ
+            progress_callback: 進捗通知 (処理数, 受付数, 処理中のURL)
+
+        Returns:
+            各段の処理件数
+        """
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        normalize_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        save_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        accepted = 0
+        processed = 0
+
+        def report(url: Optional[str]) -> None:
+            nonlocal processed
+            processed += 1
+            if progress_callback:
+                progress_callback(processed, max(accepted, processed), url)
+
+        async def feed() -> None:
+            nonlocal accepted
+            # 他の段の例外で取り消された場合も探索を止める
+            async with aclosing(admit_urls(search_results, self.budget, self.frontier)) as items:
+                async for item in items:
+                    accepted += 1
+                    await fetch_queue.put(item)
+
+        async def fetch_worker() -> None:
+            while (item := await fetch_queue.get()) is not None:
+                try:
+                    html = await self.scraping_engine.fetch_page(item["url"])
+                except Exception as e:
+                    self._fail(item["url"], str(e) or "Request timeout")
+                    report(item["url"])
+                    continue
+                self.stats["fetched"] += 1
+                await parse_queue.put((item, html))
+
+        async def parse_worker() -> None:
+            while (entry := await parse_queue.get()) is not None:
+                item, html = entry
+                try:
+                    info = await asyncio.to_thread(
+                        self.scraping_engine.parse_company_info, html, item["url"]
+                    )
+                except Exception as e:
+                    self._fail(item["url"], str(e))
+                    report(item["url"])
+                    continue
+                if item.get("source_url"):
+                    info.setdefault("source_url", item["source_url"])
+                await normalize_queue.put(info)
+
+        async def normalize_worker() -> None:
+            # 重複判定の状態を持つため単一ワーカーで処理する
+            existing_urls = {
+                normalize_url(url)
+                for url in await asyncio.to_thread(self.sheets_service.get_existing_urls)
+            }
+            while (info := await normalize_queue.get()) is not None:
+                url = info["url"]
+                report(url)
+                key = normalize_url(url)
+                with TRACER.span("dedup_check") as span:
+                    duplicate = key in existing_urls
+                    span.set_attribute("duplicate", duplicate)
+                if duplicate:
+                    self.stats["duplicates"] += 1
+                    self._done(url)
+                    continue
+                if self.record_filter is not None and not self.record_filter(info):
+                    self.stats["skipped"] += 1
+                    self._done(url)
+                    continue
+                try:
+                    record = self.prepare_record(info)
+                except Exception as e:
+                    logger.warning(f"企業情報の検証に失敗しました: {url} - {e}")
+                    self._fail(url, str(e))
+                    continue
+                existing_urls.add(key)
+                self.stats["collected"] += 1
+                await save_queue.put(record)
+
+        async def save_worker() -> None:
+            batch: List[Dict[str, Any]] = []
+            while True:
+                try:
+                    record = await asyncio.wait_for(save_queue.get(), self.save_flush_interval)
+                except asyncio.TimeoutError:
+                    # 入力が途切れたら溜まっている分を先に書き出す
+                    if batch:
+                        await self._save_batch(batch)
+                        batch = []
+                    continue
+                if record is None:
+                    break
+                batch.append(record)
+                if len(batch) >= self.save_batch_size:
+                    await self._save_batch(batch)
+                    batch = []
+            if batch:
+                await self._save_batch(batch)
+
+        async def stage(workers: List[Any], downstream: Optional[asyncio.Queue], downstream_workers: int) -> None:
+            await asyncio.gather(*workers)
+            # 全ワーカーの終了後に下流の各ワーカーへ終了を伝える
+            for _ in range(downstream_workers):
+                await downstream.put(None)
+
+        async def feed_stage() -> None:
+            await feed()
+            for _ in range(self.fetch_concurrency):
+                await fetch_queue.put(None)
+
+        try:
+            # いずれかの段で例外が起きた場合は他の段も取り消す
+            async with asyncio.TaskGroup() as group:
+                group.create_task(feed_stage())
+                group.create_task(stage(
+                    [fetch_worker() for _ in range(self.fetch_concurrency)],
+                    parse_queue, self.parse_concurrency
+                ))
+                group.create_task(stage(
+                    [parse_worker() for _ in range(self.parse_concurrency)],
+                    normalize_queue, 1
+                ))
+                group.create_task(stage([normalize_worker()], save_queue, 1))
+                group.create_task(stage([save_worker()], None, 0))
+        finally:
+            if self.frontier is not None:
+                await self.frontier.aflush()
+
+        logger.info(f"収集パイプライン完了: {self.stats}")
+        return dict(self.stats)
+
+    async def _save_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """レコードをまとめて正規化して保存する"""
+        try:
+            with TRACER.span("save_batch", {"size": len(batch)}):
+                # 電話番号・郵便番号・資本金などはバッチの列単位でまとめて正規化する
+                batch, errors = await asyncio.to_thread(normalize_company_records, batch)
+                for error in errors:
+                    logger.warning(
+                        f"正規化できない値: {batch[error['row']].get('company_name', 'Unknown')} "
+                        f"{error['field']}={error['value']}"
+                    )
+                saved = await asyncio.to_thread(self.sheets_service.add_companies, batch)
+        except Exception as e:
+            logger.error(f"企業情報の一括保存に失敗しました: {e}")
+            for record in batch:
+                self._fail(record["url"], str(e))
+            return
+
+        self.stats["saved"] += saved
+        if self.on_saved is not None:
+            self.on_saved(batch)
+        for record in batch:
+            self._done(record["url"])
+        logger.info(f"{saved} 件の企業情報を保存しました")
+
+    def _done(self, url: str) -> None:
+        if self.frontier is not None:
+            self.frontier.mark_done(url)
+
+    def _fail(self, url: str, error: str) -> None:
+        self.stats["errors"] += 1
+        if self.frontier is not None:
+            self.frontier.mark_failed(url, error)
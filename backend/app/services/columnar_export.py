@@ -0,0 +1,176 @@
+"""
+列指向フォーマット（Parquet / Arrow IPC）でのエクスポート
+
+日時は timestamp 型、都道府県と営業ステータスは固定の辞書で辞書エンコードした列として出力する。
+辞書をページ間で共通にしているため、ページごとに書き出しても辞書の置き換えが発生しない。
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.models.company import PREFECTURES, CompanyRecord, SalesStatus
+from app.utils.lazy_import import lazy_import
+
+# pyarrow は列指向フォーマットでのエクスポート時に読み込む
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+
+# 文字列として出力する企業情報の列
+COMPANY_STRING_COLUMNS = [
+    "company_name", "url", "address", "postal_code", "city", "address_detail",
+    "tel", "fax", "representative", "business_content", "established_date",
+    "capital", "contact_url", "source_url"
+]
+
+# 形式ごとのメディアタイプと拡張子
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+@lru_cache(maxsize=None)
+def _dictionaries() -> Tuple[pa.Array, pa.Array, pa.DataType]:
+    """都道府県・営業ステータスの固定の辞書と、辞書エンコードした列の型"""
+    return (
+        pa.array(PREFECTURES, type=pa.string()),
+        pa.array(SalesStatus.VALID_STATUSES, type=pa.string()),
+        pa.dictionary(pa.int8(), pa.string()),
+    )
+
+
+def build_schema(include_sales_status: bool) -> pa.Schema:
+    """
+    エクスポート用のスキーマを構築する
+
+    Args:
+        include_sales_status: 営業ステータス含める
+
+    Returns:
+        Arrow スキーマ
+    """
+    _, _, dictionary_type = _dictionaries()
+    fields = [
+        pa.field("id", pa.int64()),
+        pa.field("prefecture", dictionary_type),
+        *(pa.field(column, pa.string()) for column in COMPANY_STRING_COLUMNS),
+        pa.field("created_at", pa.timestamp("us")),
+        pa.field("updated_at", pa.timestamp("us")),
+        pa.field("capital_yen", pa.int64()),
+    ]
+    if include_sales_status:
+        fields.extend([
+            pa.field("status", dictionary_type),
+            pa.field("memo", pa.string()),
+            pa.field("contact_person", pa.string()),
+            pa.field("last_contact_date", pa.timestamp("us")),
+            pa.field("next_action", pa.string()),
+        ])
+    return pa.schema(fields)
+
+
+def _dictionary_column(values: List[Optional[str]], dictionary: pa.Array) -> pa.DictionaryArray:
+    """固定の辞書で辞書エンコードした列を作る（辞書にない値は null）"""
+    positions = {value: index for index, value in enumerate(dictionary.to_pylist())}
+    indices = pa.array([positions.get(value) for value in values], type=pa.int8())
+    return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+def _timestamp_column(values: List[Optional[datetime]]) -> pa.Array:
+    """日時の列を作る（タイムゾーン付きの値はUTCのナイーブな日時にそろえる）"""
+    return pa.array(
+        [
+            value.astimezone(timezone.utc).replace(tzinfo=None) if value and value.tzinfo else value
+            for value in values
+        ],
+        type=pa.timestamp("us")
+    )
+
+
+def to_record_batch(
+    joined: List[Tuple[CompanyRecord, Optional[SalesStatus]]],
+    include_sales_status: bool
+) -> pa.RecordBatch:
+    """
+    企業と営業ステータスの組を RecordBatch に変換する
+
+    Args:
+        joined: (企業, 営業ステータス) のリスト
+        include_sales_status: 営業ステータス含める
+
+    Returns:
+        RecordBatch
+    """
+    prefecture_dictionary, status_dictionary, _ = _dictionaries()
+    companies = [company for company, _ in joined]
+    columns: Dict[str, Any] = {
+        "id": pa.array([company.id for company in companies], type=pa.int64()),
+        "prefecture": _dictionary_column(
+            [company.prefecture for company in companies], prefecture_dictionary
+        ),
+    }
+    for column in COMPANY_STRING_COLUMNS:
+        columns[column] = pa.array(
+            [getattr(company, column) for company in companies], type=pa.string()
+        )
+    columns["created_at"] = _timestamp_column([company.created_at for company in companies])
+    columns["updated_at"] = _timestamp_column([company.updated_at for company in companies])
+    columns["capital_yen"] = pa.array([company.capital_yen for company in companies], type=pa.int64())
+
+    if include_sales_status:
+        statuses = [status for _, status in joined]
+        columns["status"] = _dictionary_column(
+            [status.status if status else None for status in statuses], status_dictionary
+        )
+        for column in ("memo", "contact_person", "next_action"):
+            columns[column] = pa.array(
+                [getattr(status, column) if status else None for status in statuses],
+                type=pa.string()
+            )
+        columns["last_contact_date"] = _timestamp_column(
+            [status.last_contact_date if status else None for status in statuses]
+        )
+
+    schema = build_schema(include_sales_status)
+    return pa.RecordBatch.from_arrays([columns[name] for name in schema.names], schema=schema)
+
+
+async def write_columnar_file(
+    path: str,
+    pages: AsyncIterator[List[Tuple[CompanyRecord, Optional[SalesStatus]]]],
+    include_sales_status: bool,
+    file_format: str = "parquet"
+) -> int:
+    """
+    ページ単位の企業情報を Parquet または Arrow IPC ストリーム形式で書き出す
+
+    Args:
+        path: 出力先のパス
+        pages: (企業, 営業ステータス) のリストの非同期イテレータ
+        include_sales_status: 営業ステータス含める
+        file_format: "parquet" または "arrow"
+
+    Returns:
+        書き出した行数
+    """
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+    schema = build_schema(include_sales_status)
+    row_count = 0
+    with pa.OSFile(path, "wb") as sink:
+        if file_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        try:
+            async for joined in pages:
+                writer.write_batch(to_record_batch(joined, include_sales_status))
+                row_count += len(joined)
+        finally:
+            writer.close()
+
+    return row_count
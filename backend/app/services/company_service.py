@@ -2,148 +2,463 @@
 企業情報サービス層
 """
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Tuple
 from datetime import datetime
 from loguru import logger
 
-from app.models.company import Company, SalesStatus
+from app.models.company import Company, CompanyRecord, SalesStatus
+from app.services.collection_pipeline import CollectionPipeline
+from app.services.company_stats import CompanyStats
 from app.services.google_sheets import GoogleSheetsService
 from app.services.scraping_engine import ScrapingEngine
 
 
+# 営業ステータスが未登録の企業の扱い
+DEFAULT_SALES_STATUS = "未着手"
+
+
+def join_sales_statuses(
+    companies: List[CompanyRecord],
+    status_map: Dict[int, SalesStatus]
+) -> List[Tuple[CompanyRecord, Optional[SalesStatus]]]:
+    """
+    企業と営業ステータスを企業IDで突き合わせる（ハッシュ結合）
+    
+    Args:
+        companies: 企業のリスト
+        status_map: 企業IDから営業ステータスへの辞書
+        
+    Returns:
+        (企業, 営業ステータス) のリスト（ステータス未登録は None）
+    """
+    return [
+        (company, status_map.get(company.id) if company.id is not None else None)
+        for company in companies
+    ]
+
+
 class CompanyService:
     """企業情報を管理するサービスクラス"""
     
-    def __init__(self, sheets_service: GoogleSheetsService, scraping_engine: ScrapingEngine):
+    def __init__(
+        self,
+        sheets_service: GoogleSheetsService,
+        scraping_engine: ScrapingEngine,
+        stats: Optional[CompanyStats] = None
+    ):
         """
         初期化
         
         Args:
             sheets_service: Google Sheetsサービス
             scraping_engine: スクレイピングエンジン
+            stats: 企業リストの集計値（営業ステータスの変更は SalesService が反映する）
         """
         self.sheets_service = sheets_service
         self.scraping_engine = scraping_engine
+        # 都道府県・ステータス・業界・作成日ごとの件数（追加・更新・削除のたびに差分更新）
+        self.stats = stats if stats is not None else CompanyStats(DEFAULT_SALES_STATUS)
     
-    def collect_companies_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+    async def collect_companies(
+        self,
+        keywords: List[str],
+        target_sites: Optional[List[str]] = None,
+        max_pages: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[..., None]] = None,
+        job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        キーワードで企業情報を収集する
+        複数キーワードで企業情報を収集して保存する
+        
+        全キーワードの探索を同時に進め、URLのストリームを統合・重複排除してから取得する。
+        複数のキーワードに該当する企業も取得は1回のみで、取得ページ数は
+        ジョブ全体とホスト単位の上限に収める。取得・解析・正規化・保存は
+        CollectionPipeline の各段で並行して進む。
         
         Args:
-            keyword: 検索キーワード
+            keywords: 検索キーワードのリスト
+            target_sites: 対象サイトのグループ名
+            max_pages: 1検索元あたりの最大ページ数
+            filters: 絞り込み条件（prefecture, industry）
+            progress_callback: 進捗通知 (処理数, 発見数, 処理中のURL)
+            job_id: 指定時はクロールフロンティアに記録し、中断したジョブを再開する
             
         Returns:
-            収集した企業情報のリスト
+            各段の処理件数（collected, saved, errors, skipped, duplicates など）
         """
-        try:
-            # キーワードで検索
-            search_results = asyncio.run(self.scraping_engine.search_companies(keyword))
+        discovery = self.scraping_engine.create_discovery(target_sites, max_pages)
+        budget = self.scraping_engine.create_budget()
+        # チェックポイントの読み込みと書き直しはスレッドで行う
+        frontier = await asyncio.to_thread(self.scraping_engine.create_frontier, job_id) if job_id else None
+        
+        async def search_results():
+            # 前回の実行で未処理のまま残ったURLを先に処理する
+            if frontier is not None:
+                for url in frontier.pending_urls():
+                    yield {"url": url}
+            async for item in discovery.iter_urls_many(keywords):
+                yield item
+        
+        pipeline = CollectionPipeline(
+            self.scraping_engine,
+            self.sheets_service,
+            prepare_record=self._prepare_company_record,
+            record_filter=lambda company: self._matches_filters(company, filters),
+            budget=budget,
+            frontier=frontier,
+            on_saved=self._on_companies_saved
+        )
+        stats = await pipeline.run(search_results(), progress_callback=progress_callback)
+        
+        logger.info(
+            f"キーワード {keywords} で {stats['collected']} 件の企業情報を収集し、"
+            f"{stats['saved']} 件を保存しました（取得 {budget.used} ページ）"
+        )
+        return stats
+    
+    @staticmethod
+    def _matches_filters(company: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+        """企業情報が絞り込み条件に合致するか判定する"""
+        if not filters:
+            return True
+        
+        prefecture = filters.get("prefecture")
+        if prefecture and company.get("prefecture") != prefecture \
+                and prefecture not in (company.get("address") or ""):
+            return False
+        
+        industry = filters.get("industry")
+        if industry and industry not in (company.get("business_content") or ""):
+            return False
+        
+        keyword = filters.get("keyword")
+        if keyword and keyword not in (company.get("company_name") or "") \
+                and keyword not in (company.get("business_content") or ""):
+            return False
+        
+        return True
+    
+    async def iter_company_pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 500
+    ) -> AsyncIterator[List[CompanyRecord]]:
+        """
+        保存済みの企業情報をページ単位で読み込みながら返す
+        
+        全件をメモリに載せずに処理できるよう、シートを範囲指定で順に読み込む。
+        行は検証済みとして軽量な CompanyRecord で返す（Company への変換は呼び出し側で必要な場合のみ）。
+        
+        Args:
+            filters: 絞り込み条件（prefecture, industry, keyword）
+            page_size: 1回に読み込む行数
             
-            if not search_results:
-                logger.warning(f"検索結果が見つかりませんでした: {keyword}")
-                return []
+        Yields:
+            条件に合致した企業のリスト（空のページは返さない）
+        """
+        offset = 0
+        while True:
+            rows = await asyncio.to_thread(self.sheets_service.get_company_rows, offset, page_size)
+            companies = [
+                company for company in (
+                    self._to_record(row) for row in rows
+                    if row["url"] and self._matches_filters(row, filters)
+                )
+                if company is not None
+            ]
+            if companies:
+                yield companies
+            if len(rows) < page_size:
+                break
+            offset += page_size
+    
+    async def iter_companies_with_status(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 500
+    ) -> AsyncIterator[List[Tuple[CompanyRecord, Optional[SalesStatus]]]]:
+        """
+        企業情報と営業ステータスを結合してページ単位で返す
+        
+        営業ステータスは最初に1回だけ一括で読み込み、企業IDで突き合わせる。
+        filters に status があれば結合後に絞り込む（ステータス未登録は「未着手」扱い）。
+        
+        Args:
+            filters: 絞り込み条件（status, prefecture, industry, keyword）
+            page_size: 1回に読み込む行数
             
-            # URLリストを抽出
-            urls = [result.get("url") for result in search_results if result.get("url")]
+        Yields:
+            (企業, 営業ステータス) のリスト
+        """
+        status_map = await self.load_sales_statuses()
+        status_filter = (filters or {}).get("status")
+        
+        async for companies in self.iter_company_pages(filters=filters, page_size=page_size):
+            joined = join_sales_statuses(companies, status_map)
+            if status_filter:
+                joined = [
+                    (company, status) for company, status in joined
+                    if (status.status if status else DEFAULT_SALES_STATUS) == status_filter
+                ]
+            if joined:
+                yield joined
+    
+    async def get_companies(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[CompanyRecord]:
+        """
+        企業一覧を取得する
+        
+        Args:
+            page: ページ番号（1始まり）
+            page_size: ページサイズ
+            filters: 絞り込み条件（status, prefecture, industry, keyword）
             
-            # 並列でスクレイピング
-            company_data = asyncio.run(self.scraping_engine.scrape_multiple(urls))
+        Returns:
+            条件に合致した企業のうち、指定ページの分
+        """
+        skip = (page - 1) * page_size
+        results: List[CompanyRecord] = []
+        
+        if filters and filters.get("status"):
+            pages = (
+                [company for company, _ in joined]
+                async for joined in self.iter_companies_with_status(filters=filters)
+            )
+        else:
+            pages = self.iter_company_pages(filters=filters)
+        
+        async for companies in pages:
+            if skip >= len(companies):
+                skip -= len(companies)
+                continue
+            results.extend(companies[skip:skip + page_size - len(results)])
+            skip = 0
+            if len(results) >= page_size:
+                break
+        return results
+    
+    async def get_company_by_id(self, company_id: int) -> Optional[Company]:
+        """
+        企業IDで企業情報を取得する
+        
+        Args:
+            company_id: 企業ID
             
-            # エラーでない結果のみ返す
-            valid_companies = [
-                company for company in company_data 
-                if not company.get("error")
-            ]
+        Returns:
+            企業情報（見つからない場合 None）
+        """
+        row = await asyncio.to_thread(self.sheets_service.get_company_by_id, company_id)
+        if row is None:
+            return None
+        return CompanyRecord.from_row(row).to_company()
+    
+    async def add_company(self, company: Company) -> int:
+        """
+        企業を追加する
+        
+        Args:
+            company: 企業情報（IDが未指定の場合は採番する）
             
-            logger.info(f"キーワード '{keyword}' で {len(valid_companies)} 件の企業情報を収集しました")
-            return valid_companies
+        Returns:
+            企業ID
             
-        except Exception as e:
-            logger.error(f"企業情報収集エラー: {e}")
-            return []
+        Raises:
+            ValueError: 同じURLの企業が登録済みの場合
+        """
+        if await asyncio.to_thread(self.sheets_service.check_duplicate_by_url, company.url):
+            raise ValueError(f"Company already exists: {company.url}")
+        
+        company_data = self._prepare_company_record(company.model_dump(mode="json", exclude_none=True))
+        if company.id is None:
+            company_data["id"] = await asyncio.to_thread(self.sheets_service.get_next_company_id)
+        
+        await asyncio.to_thread(self.sheets_service.add_company, company_data)
+        self.stats.add_company(company_data)
+        return company_data["id"]
     
-    def save_companies(self, companies: List[Dict[str, Any]]) -> int:
+    async def update_company(self, company: Company) -> bool:
         """
-        企業情報を保存する（重複チェック付き）
+        企業情報を更新する
         
         Args:
-            companies: 企業情報のリスト
+            company: 企業情報（IDは必須）
             
         Returns:
-            保存した件数
+            成功時True（企業が見つからない場合False）
         """
-        saved_count = 0
+        company_data = company.model_dump(mode="json", exclude_none=True)
+        company_data["updated_at"] = datetime.now().isoformat()
         
-        for company_data in companies:
-            try:
-                # URLで重複チェック
-                url = company_data.get("url")
-                if url and self.sheets_service.check_duplicate_by_url(url):
-                    logger.info(f"重複: {company_data.get('company_name', 'Unknown')} - {url}")
-                    continue
-                
-                # Companyモデルでバリデーション
-                company = Company(**company_data)
-                
-                # 住所を分解
-                if company.address:
-                    parsed_address = company.parse_address()
-                    company_data.update(parsed_address)
-                
-                # タイムスタンプを追加
-                company_data["created_at"] = datetime.now().isoformat()
-                company_data["updated_at"] = datetime.now().isoformat()
-                
-                # 保存
-                if self.sheets_service.add_company(company_data):
-                    saved_count += 1
-                    logger.info(f"保存成功: {company.company_name}")
-                    
-            except Exception as e:
-                logger.error(f"企業情報保存エラー: {e}")
-                continue
+        updated = await asyncio.to_thread(self.sheets_service.update_company, company.id, company_data)
+        if updated:
+            self.stats.update_company(company_data)
+        return updated
+    
+    async def delete_company(self, company_id: int) -> bool:
+        """
+        企業を削除する
         
-        logger.info(f"{saved_count} 件の企業情報を保存しました")
-        return saved_count
+        Args:
+            company_id: 企業ID
+            
+        Returns:
+            成功時True（企業が見つからない場合False）
+        """
+        deleted = await asyncio.to_thread(self.sheets_service.delete_company, company_id)
+        if deleted:
+            self.stats.remove_company(str(company_id))
+        return deleted
     
-    def bulk_update_status(self, status_updates: List[Dict[str, Any]]) -> List[bool]:
+    async def get_stats(self, rebuild: bool = False) -> Dict[str, Any]:
         """
-        営業ステータスを一括更新する
+        集計値を取得する
+        
+        集計値は追加・更新・削除のたびに差分更新されるため、シートは読み込まない。
+        未集計の場合と rebuild 指定時のみ全件から集計し直す。
         
         Args:
-            status_updates: ステータス更新情報のリスト
+            rebuild: 全件から集計し直す
             
         Returns:
-            更新結果のリスト
+            総件数と都道府県・ステータス・業界・作成日ごとの件数
+        """
+        if rebuild or not self.stats.built:
+            await self.rebuild_stats()
+        return self.stats.snapshot()
+    
+    async def rebuild_stats(self, page_size: int = 500) -> None:
+        """
+        全件を読み込んで集計値を作り直す
+        
+        Args:
+            page_size: 1回に読み込む行数
+        """
+        companies = []
+        offset = 0
+        while True:
+            rows = await asyncio.to_thread(self.sheets_service.get_company_rows, offset, page_size)
+            companies.extend(row for row in rows if row["url"])
+            if len(rows) < page_size:
+                break
+            offset += page_size
+        
+        status_map = await asyncio.to_thread(self.sheets_service.get_sales_status_map)
+        self.stats.rebuild(
+            companies,
+            {company_id: row["status"] for company_id, row in status_map.items() if row["status"]}
+        )
+        logger.info(f"集計値を再構築しました: {len(companies)} 件")
+    
+    def _on_companies_saved(self, companies: List[Dict[str, Any]]) -> None:
+        """保存した企業を集計値に反映する"""
+        for company_data in companies:
+            self.stats.add_company(company_data)
+    
+    async def get_data_version(self) -> Optional[str]:
+        """
+        データバージョンを取得する（エクスポートのキャッシュキーに使用）
+        
+        Returns:
+            スプレッドシートの最終更新日時（取得できない場合 None）
         """
-        results = []
+        return await asyncio.to_thread(self.sheets_service.get_data_version)
+    
+    async def load_sales_statuses(self) -> Dict[int, SalesStatus]:
+        """
+        営業ステータスを一括で読み込む
         
-        for update in status_updates:
+        Returns:
+            企業IDから営業ステータスへの辞書
+        """
+        rows = await asyncio.to_thread(self.sheets_service.get_sales_status_map)
+        
+        statuses = {}
+        for company_id, row in rows.items():
             try:
-                # SalesStatusモデルでバリデーション
-                status = SalesStatus(
-                    company_id=update["company_id"],
-                    status=update["status"],
-                    memo=update.get("memo"),
-                    contact_person=update.get("contact_person"),
-                    updated_at=datetime.now()
+                statuses[company_id] = SalesStatus(
+                    **{key: value for key, value in row.items() if value != ""}
                 )
-                
-                # 更新
-                result = self.sheets_service.update_sales_status(
-                    status.company_id,
-                    status.model_dump(exclude_none=True)
+            except ValueError as e:
+                logger.warning(f"不正な営業ステータスをスキップしました: {company_id} - {e}")
+        return statuses
+    
+    @staticmethod
+    def _to_record(row: Dict[str, Any]) -> Optional[CompanyRecord]:
+        """シートの行を CompanyRecord に変換する（不正な行は None）"""
+        try:
+            return CompanyRecord.from_row(row)
+        except ValueError as e:
+            logger.warning(f"不正な企業データをスキップしました: {row.get('id')} - {e}")
+            return None
+    
+    def collect_companies_by_keyword(
+        self,
+        keyword: str,
+        target_sites: Optional[List[str]] = None,
+        max_pages: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        キーワードで企業情報を収集して保存する（CLI用の同期ラッパー）
+        
+        収集は collect_companies と同じパイプラインで行う。
+        FastAPI などイベントループ上からは collect_companies を使うこと。
+        
+        Args:
+            keyword: 検索キーワード
+            target_sites: 対象サイトのグループ名
+            max_pages: 1検索元あたりの最大ページ数
+            
+        Returns:
+            各段の処理件数（collected, saved, errors, skipped, duplicates など）
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "collect_companies_by_keyword cannot be called from a running event loop; "
+                "use collect_companies instead"
+            )
+        
+        async def run() -> Dict[str, Any]:
+            try:
+                return await self.collect_companies(
+                    [keyword], target_sites=target_sites, max_pages=max_pages
                 )
-                results.append(result)
-                
-                if result:
-                    logger.info(f"ステータス更新成功: 企業ID {status.company_id}")
-                    
-            except Exception as e:
-                logger.error(f"ステータス更新エラー: {e}")
-                results.append(False)
+            finally:
+                await self.scraping_engine.aclose()
         
-        return results
+        return asyncio.run(run())
+    
+    def _prepare_company_record(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        企業情報を検証し、住所の分解とタイムスタンプの付与を行う
+        
+        Args:
+            company_data: 企業情報
+            
+        Returns:
+            保存用の企業情報
+        """
+        # Companyモデルでバリデーション
+        company = Company(**company_data)
+        
+        # 住所を分解
+        if company.address:
+            parsed_address = company.parse_address()
+            company_data.update(parsed_address)
+        
+        # タイムスタンプを追加
+        company_data["created_at"] = datetime.now().isoformat()
+        company_data["updated_at"] = datetime.now().isoformat()
+        
+        return company_data
     
     def record_collection_log(self, log_data: Dict[str, Any]) -> bool:
         """
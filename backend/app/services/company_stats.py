@@ -0,0 +1,188 @@
+"""
+企業リストの集計値（マテリアライズドカウンタ）
+
+都道府県・営業ステータス・業界・作成日ごとの件数を保持し、サービス層での
+追加・更新・削除のたびに差分だけ更新する。全件からの再集計は rebuild を呼んだ場合のみ行う。
+"""
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.utils.address import get_address_parser
+
+
+# 集計対象の業界（事業内容に含まれるキーワードで判定。エクスポート画面の選択肢と対応）
+INDUSTRY_KEYWORDS = ["IT", "広告", "コンサル", "製造業"]
+OTHER_INDUSTRY = "その他"
+
+
+def company_key(company: Dict[str, Any]) -> str:
+    """集計上の企業キー（IDがなければURL）"""
+    company_id = company.get("id")
+    return str(company_id) if company_id not in (None, "") else company.get("url", "")
+
+
+def _prefecture_of(company: Dict[str, Any]) -> Optional[str]:
+    """企業の都道府県（未設定の場合は住所から判定）"""
+    if company.get("prefecture"):
+        return company["prefecture"]
+    found = get_address_parser().find_prefecture(company.get("address") or "")
+    return found[2] if found else None
+
+
+def _industries_of(company: Dict[str, Any]) -> Tuple[str, ...]:
+    """事業内容に含まれる業界（該当なしは「その他」）"""
+    business_content = company.get("business_content") or ""
+    industries = tuple(keyword for keyword in INDUSTRY_KEYWORDS if keyword in business_content)
+    return industries or (OTHER_INDUSTRY,)
+
+
+def _created_date_of(company: Dict[str, Any]) -> Optional[str]:
+    """作成日（YYYY-MM-DD）"""
+    created_at = company.get("created_at")
+    if not created_at:
+        return None
+    return str(created_at)[:10]
+
+
+class CompanyStats:
+    """企業リストの集計値を差分更新で保持する"""
+
+    def __init__(self, default_status: str):
+        """
+        初期化
+
+        Args:
+            default_status: 営業ステータス未登録の企業を数えるステータス
+        """
+        self.default_status = default_status
+        self._lock = threading.Lock()
+        self._companies: Dict[str, Tuple[Optional[str], Tuple[str, ...], Optional[str]]] = {}
+        self._statuses: Dict[int, str] = {}
+        self.by_prefecture: Counter = Counter()
+        self.by_industry: Counter = Counter()
+        self.by_created_date: Counter = Counter()
+        self.by_status: Counter = Counter()
+        self.built = False
+        self.last_updated: Optional[datetime] = None
+
+    def rebuild(
+        self,
+        companies: Iterable[Dict[str, Any]],
+        statuses: Dict[int, str]
+    ) -> None:
+        """
+        全件から集計し直す
+
+        Args:
+            companies: 企業情報の辞書
+            statuses: 企業IDから営業ステータスへの辞書
+        """
+        with self._lock:
+            self._companies.clear()
+            self._statuses.clear()
+            for counter in (self.by_prefecture, self.by_industry, self.by_created_date, self.by_status):
+                counter.clear()
+
+            for company in companies:
+                self._add(company)
+            for company_id, status in statuses.items():
+                self._set_status(company_id, status)
+
+            self.built = True
+            self.last_updated = datetime.now()
+
+    def add_company(self, company: Dict[str, Any]) -> None:
+        """企業の追加を反映する"""
+        with self._lock:
+            self._add(company)
+            self.last_updated = datetime.now()
+
+    def update_company(self, company: Dict[str, Any]) -> None:
+        """企業の更新を反映する（作成日は登録時の値を保つ）"""
+        with self._lock:
+            key = company_key(company)
+            previous = self._companies.get(key)
+            self._remove(key)
+            self._add(company, created_date=previous[2] if previous else None)
+            self.last_updated = datetime.now()
+
+    def remove_company(self, key: str) -> None:
+        """企業の削除を反映する"""
+        with self._lock:
+            self._remove(key)
+            if key.isdigit() and int(key) in self._statuses:
+                _decrement(self.by_status, self._statuses.pop(int(key)))
+            self.last_updated = datetime.now()
+
+    def set_status(self, company_id: int, status: str) -> None:
+        """営業ステータスの変更を反映する"""
+        with self._lock:
+            self._set_status(company_id, status)
+            self.last_updated = datetime.now()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の集計値を取得する
+
+        Returns:
+            総件数と各軸の件数
+        """
+        with self._lock:
+            total = len(self._companies)
+            status_summary = dict(self.by_status)
+            # ステータス未登録の企業は既定のステータスとして数える
+            status_summary[self.default_status] = status_summary.get(self.default_status, 0) + max(
+                total - sum(self.by_status.values()), 0
+            )
+            return {
+                "total_companies": total,
+                "status_summary": status_summary,
+                "prefecture_summary": dict(self.by_prefecture),
+                "industry_summary": dict(self.by_industry),
+                "created_date_summary": dict(sorted(self.by_created_date.items())),
+                "last_updated": self.last_updated
+            }
+
+    def _add(self, company: Dict[str, Any], created_date: Optional[str] = None) -> None:
+        key = company_key(company)
+        if not key:
+            return
+        if key in self._companies:
+            self._remove(key)
+
+        entry = (_prefecture_of(company), _industries_of(company), created_date or _created_date_of(company))
+        self._companies[key] = entry
+        prefecture, industries, created_date = entry
+        if prefecture:
+            self.by_prefecture[prefecture] += 1
+        self.by_industry.update(industries)
+        if created_date:
+            self.by_created_date[created_date] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._companies.pop(key, None)
+        if entry is None:
+            return
+        prefecture, industries, created_date = entry
+        if prefecture:
+            _decrement(self.by_prefecture, prefecture)
+        for industry in industries:
+            _decrement(self.by_industry, industry)
+        if created_date:
+            _decrement(self.by_created_date, created_date)
+
+    def _set_status(self, company_id: int, status: str) -> None:
+        previous = self._statuses.get(company_id)
+        if previous is not None:
+            _decrement(self.by_status, previous)
+        self._statuses[company_id] = status
+        self.by_status[status] += 1
+
+
+def _decrement(counter: Counter, value: str) -> None:
+    """件数を1減らす（0になった項目は集計から除く）"""
+    counter[value] -= 1
+    if counter[value] <= 0:
+        del counter[value]
@@ -0,0 +1,161 @@
+"""
+アプリケーション全体で共有するサービスのコンテナ
+
+Google Sheets への接続（認証とスプレッドシートのオープン）やスクレイピングの
+HTTP クライアントはアプリケーションで1つだけ作り、各ルーターで共有する。
+各サービスは初回に使われたときに作成し、アプリケーションの終了時に作成と逆の順序で閉じる。
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.services.company_service import DEFAULT_SALES_STATUS, CompanyService
+from app.services.company_stats import CompanyStats
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sales_service import SalesService
+from app.services.scraping_engine import ScrapingEngine
+
+
+DEFAULT_SCRAPING_CONFIG_PATH = "config/scraping.yaml"
+
+
+class ServiceContainer:
+    """サービスを遅延作成して共有するコンテナ"""
+
+    def __init__(
+        self,
+        spreadsheet_id: Optional[str] = None,
+        credentials_path: Optional[str] = None,
+        scraping_config_path: Optional[str] = None
+    ):
+        """
+        初期化（この時点ではどのサービスも作成しない）
+
+        Args:
+            spreadsheet_id: Google SpreadsheetのID（未指定時は環境変数 GOOGLE_SPREADSHEET_ID）
+            credentials_path: 認証情報ファイルのパス（未指定時は環境変数 GOOGLE_CREDENTIALS_PATH）
+            scraping_config_path: スクレイピング設定ファイルのパス（未指定時は環境変数 SCRAPING_CONFIG_PATH）
+        """
+        self.spreadsheet_id = spreadsheet_id or os.environ.get("GOOGLE_SPREADSHEET_ID", "")
+        self.credentials_path = credentials_path
+        self.scraping_config_path = scraping_config_path or os.environ.get(
+            "SCRAPING_CONFIG_PATH", DEFAULT_SCRAPING_CONFIG_PATH
+        )
+        self._services: Dict[str, Any] = {}
+        # 作成順の (サービス名, 終了処理)
+        self._closers: List[Tuple[str, Callable[[], Awaitable[None]]]] = []
+        # 依存関係は同期関数としてスレッドプールで解決されるため、作成はロックで1回に限る
+        self._lock = threading.RLock()
+        self._startup_task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def resolve(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        close: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Any:
+        """
+        サービスを取得する（初回のみ factory で作成する）
+
+        Args:
+            name: サービス名
+            factory: サービスを作成する関数
+            close: 終了時にサービスを閉じる関数
+
+        Returns:
+            サービス
+        """
+        service = self._services.get(name)
+        if service is not None:
+            return service
+
+        with self._lock:
+            if name not in self._services:
+                if self.closed:
+                    raise RuntimeError("ServiceContainer is already closed")
+                service = factory()
+                self._services[name] = service
+                if close is not None:
+                    self._closers.append((name, lambda: close(service)))
+                logger.info(f"サービスを初期化しました: {name}")
+            return self._services[name]
+
+    @property
+    def sheets_service(self) -> GoogleSheetsService:
+        """Google Sheetsサービス（認証とスプレッドシートのオープンは1回のみ）"""
+        return self.resolve(
+            "sheets_service",
+            lambda: GoogleSheetsService(self.spreadsheet_id, self.credentials_path)
+        )
+
+    @property
+    def scraping_engine(self) -> ScrapingEngine:
+        """スクレイピングエンジン（HTTP クライアントの接続プールを共有する）"""
+        return self.resolve("scraping_engine", self._create_scraping_engine, close=lambda engine: engine.aclose())
+
+    @property
+    def company_stats(self) -> CompanyStats:
+        """企業リストの集計値（企業の変更は CompanyService、営業ステータスの変更は SalesService が反映する）"""
+        return self.resolve("company_stats", lambda: CompanyStats(DEFAULT_SALES_STATUS))
+
+    @property
+    def company_service(self) -> CompanyService:
+        """企業情報サービス"""
+        return self.resolve(
+            "company_service",
+            lambda: CompanyService(self.sheets_service, self.scraping_engine, stats=self.company_stats)
+        )
+
+    @property
+    def sales_service(self) -> SalesService:
+        """営業ステータスサービス（終了時にリマインダーを止め、イベントを書き出す）"""
+        return self.resolve(
+            "sales_service",
+            lambda: SalesService(self.sheets_service, company_stats=self.company_stats),
+            close=lambda service: service.stop_follow_up_reminders()
+        )
+
+    def _create_scraping_engine(self) -> ScrapingEngine:
+        if os.path.exists(self.scraping_config_path):
+            return ScrapingEngine.from_config_file(self.scraping_config_path)
+        return ScrapingEngine({})
+
+    async def startup(self) -> None:
+        """
+        起動時の処理
+
+        フォローアップのリマインダーは営業ステータスの読み込みを伴うため、
+        起動を待たせないようバックグラウンドで開始する。
+        """
+        self._startup_task = asyncio.create_task(self._start_follow_up_reminders())
+
+    async def _start_follow_up_reminders(self) -> None:
+        try:
+            # 接続の確立はブロッキングなのでスレッドで行う
+            sales_service = await asyncio.to_thread(lambda: self.sales_service)
+            await sales_service.start_follow_up_reminders()
+        except Exception as e:
+            logger.error(f"フォローアップのリマインダーを開始できませんでした: {e}")
+
+    async def aclose(self) -> None:
+        """作成済みのサービスを作成と逆の順序で閉じる"""
+        if self._startup_task is not None:
+            self._startup_task.cancel()
+            await asyncio.gather(self._startup_task, return_exceptions=True)
+            self._startup_task = None
+
+        with self._lock:
+            self.closed = True
+            closers = list(reversed(self._closers))
+            self._closers.clear()
+
+        for name, close in closers:
+            try:
+                await close()
+            except Exception as e:
+                logger.error(f"サービスの終了処理に失敗しました: {name} - {e}")
+        self._services.clear()
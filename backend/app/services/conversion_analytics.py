@@ -0,0 +1,141 @@
+"""
+成約率分析（期間別のファネル集計）
+
+遷移イベントログを週・月・年の期間ごとに集計し、各ステータスへ遷移した件数
+（未着手→アプローチ中→商談中→成約/見送り のファネル）を保持する。
+成約率はダッシュボードと同じく企業単位で、期間内にアプローチ以降へ遷移した企業のうち
+成約した企業の割合とする（1社が期間内にファネルを進んでも分母は1社）。
+最初に分析を取得したときに pandas でまとめて集計し、以降のイベントは該当する期間の件数だけを更新する。
+"""
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from app.models.company import SalesStatus
+from app.services.sales_dashboard import APPROACHED_STATUSES, CONVERTED_STATUS
+from app.services.status_events import StatusEventLog
+from app.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+
+# 分析期間と pandas の期間頻度（週は月曜始まり）
+PERIOD_FREQUENCIES = {
+    "weekly": "W-SUN",
+    "monthly": "M",
+    "yearly": "Y",
+}
+
+FUNNEL_STAGES = SalesStatus.VALID_STATUSES
+
+
+class ConversionAnalytics:
+    """期間別のファネル集計を保持する"""
+
+    def __init__(self, event_log: StatusEventLog):
+        """
+        初期化
+
+        Args:
+            event_log: 営業ステータスの遷移イベントログ
+        """
+        self.event_log = event_log
+        # 分析期間 → 期間 → 遷移後ステータス → 件数
+        self._buckets: Dict[str, Dict[pd.Period, Counter]] = {
+            period: defaultdict(Counter) for period in PERIOD_FREQUENCIES
+        }
+        # 分析期間 → 期間 → アプローチ以降へ遷移した企業ID / 成約した企業ID
+        self._approached: Dict[str, Dict[pd.Period, Set[int]]] = {
+            period: defaultdict(set) for period in PERIOD_FREQUENCIES
+        }
+        self._converted: Dict[str, Dict[pd.Period, Set[int]]] = {
+            period: defaultdict(set) for period in PERIOD_FREQUENCIES
+        }
+        # 集計は最初に分析を取得したときに行う（起動時に pandas を読み込まない）
+        self.built = False
+
+    @staticmethod
+    def load_dependencies() -> None:
+        """集計に使う pandas を読み込む（イベントループを止めないようスレッドから呼ぶ）"""
+        pd.load()
+
+    def rebuild(self) -> None:
+        """イベントログ全体から集計し直す"""
+        frame = self.event_log.to_frame()
+        # ステータスが変わっていない更新（メモのみの変更など）は遷移として数えない
+        frame = frame[frame["from_status"] != frame["to_status"]]
+        approached = frame["to_status"].isin(APPROACHED_STATUSES)
+        converted = frame["to_status"] == CONVERTED_STATUS
+        for period, frequency in PERIOD_FREQUENCIES.items():
+            buckets = self._buckets[period]
+            buckets.clear()
+            self._approached[period].clear()
+            self._converted[period].clear()
+            if frame.empty:
+                continue
+            bucket_of = frame["timestamp"].dt.to_period(frequency)
+            counts = (
+                frame.groupby([bucket_of, "to_status"])
+                .size()
+                .unstack(fill_value=0)
+            )
+            for bucket, row in zip(counts.index, counts.to_dict("records")):
+                buckets[bucket].update({status: int(count) for status, count in row.items() if count})
+            for companies, mask in ((self._approached[period], approached), (self._converted[period], converted)):
+                for bucket, ids in frame["company_id"][mask].groupby(bucket_of[mask]):
+                    companies[bucket].update(int(company_id) for company_id in ids)
+        self.built = True
+
+    def record(self, company_id: int, to_status: str, timestamp: datetime) -> None:
+        """
+        遷移イベント1件を集計に反映する
+
+        Args:
+            company_id: 企業ID
+            to_status: 遷移後のステータス
+            timestamp: 遷移日時
+        """
+        # 未集計の間のイベントは、集計時にイベントログから数えられる
+        if not self.built:
+            return
+        for period, frequency in PERIOD_FREQUENCIES.items():
+            bucket = pd.Period(timestamp, freq=frequency)
+            self._buckets[period][bucket][to_status] += 1
+            if to_status in APPROACHED_STATUSES:
+                self._approached[period][bucket].add(company_id)
+            if to_status == CONVERTED_STATUS:
+                self._converted[period][bucket].add(company_id)
+
+    def get(self, period: str) -> List[Dict[str, Any]]:
+        """
+        期間別の成約率分析を取得する
+
+        Args:
+            period: "weekly", "monthly", "yearly"
+
+        Returns:
+            期間の古い順に、ファネルの遷移件数、アプローチ以降へ遷移した企業数と成約率
+        """
+        if period not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Invalid period: {period}")
+        if not self.built:
+            self.rebuild()
+
+        results = []
+        for bucket in sorted(self._buckets[period]):
+            counts = self._buckets[period][bucket]
+            funnel = {stage: counts.get(stage, 0) for stage in FUNNEL_STAGES}
+            approached = len(self._approached[period][bucket])
+            converted = len(self._converted[period][bucket])
+            results.append({
+                "period": str(bucket),
+                "start": bucket.start_time.date().isoformat(),
+                "end": bucket.end_time.date().isoformat(),
+                "funnel": funnel,
+                "transitions": sum(counts.values()),
+                "approached_companies": approached,
+                "conversion_rate": round(converted / approached * 100, 2) if approached else 0.0
+            })
+        return results
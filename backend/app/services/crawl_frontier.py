@@ -0,0 +1,314 @@
+"""
+クロールフロンティア（再開可能なURLキュー）
+
+ジョブごとにURLの処理状態（未処理・処理中・完了・失敗）と試行回数を
+JSONL形式のチェックポイントへ逐次追記し、プロセス再起動後も続きから再開できるようにする。
+イベントループ上で追記が溜まった場合は、書き出し（fsync を含む）をスレッドで行う。
+"""
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+URL_STATES = (PENDING, IN_PROGRESS, DONE, FAILED)
+
+
+class CrawlFrontier:
+    """ジョブ単位のクロールフロンティア"""
+
+    def __init__(
+        self,
+        job_id: str,
+        checkpoint_dir: str = "data/frontier",
+        max_attempts: int = 3,
+        flush_every: int = 50
+    ):
+        """
+        初期化
+
+        Args:
+            job_id: ジョブID
+            checkpoint_dir: チェックポイントの保存先ディレクトリ
+            max_attempts: 1URLあたりの最大試行回数
+            flush_every: ディスクへ書き出すまでの最大イベント数
+
+        Raises:
+            ValueError: チェックポイントが checkpoint_dir の外を指すジョブIDの場合
+        """
+        self.job_id = job_id
+        self.max_attempts = max_attempts
+        self.flush_every = flush_every
+        self.path = os.path.join(checkpoint_dir, f"{job_id}.jsonl")
+        # ジョブIDにパス区切りや ".." を含めて保存先の外を読み書きさせない
+        base_dir = os.path.realpath(checkpoint_dir)
+        if os.path.dirname(os.path.realpath(self.path)) != base_dir:
+            raise ValueError(f"不正なジョブIDです: {job_id!r}")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._pending: Deque[str] = deque()
+        self._buffer: List[str] = []
+        # この実行で処理中にしたURLと、再試行を待つ失敗URL
+        self._in_progress: Set[str] = set()
+        self._retry: Deque[str] = deque()
+        self._updated = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """チェックポイントから状態を復元する"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # 書き込み途中で停止した末尾行は無視する
+                    logger.warning(f"破損したチェックポイント行をスキップ: {self.path}")
+                    continue
+                self._entries[event["url"]] = {
+                    "state": event["state"],
+                    "attempts": event.get("attempts", 0),
+                    "error": event.get("error")
+                }
+
+        # 処理中のまま停止したURLは未処理に戻す
+        for entry in self._entries.values():
+            if entry["state"] == IN_PROGRESS:
+                entry["state"] = PENDING
+
+        self._pending = deque(
+            url for url, entry in self._entries.items() if entry["state"] == PENDING
+        )
+        self.requeue_failed()
+
+        # 追記ログを現在の状態のスナップショットに置き換える
+        self.compact()
+        logger.info(f"クロールフロンティアを復元しました: {self.job_id} {self.counts()}")
+
+    def _record(self, url: str) -> None:
+        """状態遷移をチェックポイントに追記する"""
+        entry = self._entries[url]
+        self._buffer.append(json.dumps({"url": url, **entry}, ensure_ascii=False))
+        if len(self._buffer) >= self.flush_every:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        """イベントループ上ではスレッドでの書き出しを予約し、それ以外では直ちに書き出す"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        task = loop.create_task(self.aflush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _take_buffer(self) -> List[str]:
+        lines, self._buffer = self._buffer, []
+        return lines
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def flush(self) -> None:
+        """バッファ済みのイベントをディスクに書き出す"""
+        lines = self._take_buffer()
+        if lines:
+            self._write(lines)
+
+    async def aflush(self) -> None:
+        """バッファ済みのイベントをスレッドでディスクに書き出す（書き込み順は保たれる）"""
+        async with self._write_lock:
+            lines = self._take_buffer()
+            if lines:
+                await asyncio.to_thread(self._write, lines)
+
+    def compact(self) -> None:
+        """チェックポイントを1URL1行のスナップショットに書き直す"""
+        self._buffer.clear()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for url, entry in self._entries.items():
+                f.write(json.dumps({"url": url, **entry}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def add_urls(self, urls: Iterable[str]) -> int:
+        """
+        URLを未処理として追加する（既知のURLは無視）
+
+        Args:
+            urls: 追加するURL
+
+        Returns:
+            新規に追加した件数
+        """
+        added = 0
+        for url in urls:
+            if not url or url in self._entries:
+                continue
+            self._entries[url] = {"state": PENDING, "attempts": 0, "error": None}
+            self._pending.append(url)
+            self._record(url)
+            added += 1
+        self._request_flush()
+        return added
+
+    def next_batch(self, size: int) -> List[str]:
+        """
+        未処理のURLを取り出して処理中にする
+
+        Args:
+            size: 取り出す最大件数
+
+        Returns:
+            URLのリスト
+        """
+        batch = []
+        while self._pending and len(batch) < size:
+            url = self._pending.popleft()
+            entry = self._entries[url]
+            if entry["state"] != PENDING:
+                continue
+            entry["state"] = IN_PROGRESS
+            self._in_progress.add(url)
+            self._record(url)
+            batch.append(url)
+        self._request_flush()
+        return batch
+
+    def claim(self, url: str) -> bool:
+        """
+        ストリームで見つかったURLを登録し、処理してよければ処理中にする
+
+        Args:
+            url: 対象のURL
+
+        Returns:
+            処理すべき場合True（完了済み・処理中・試行回数の上限到達の場合False）
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            entry = {"state": PENDING, "attempts": 0, "error": None}
+            self._entries[url] = entry
+        elif entry["state"] == FAILED and entry["attempts"] < self.max_attempts:
+            entry["state"] = PENDING
+        elif entry["state"] != PENDING:
+            return False
+
+        entry["state"] = IN_PROGRESS
+        self._in_progress.add(url)
+        self._record(url)
+        return True
+
+    def release(self, url: str) -> None:
+        """処理中のURLを試行回数を増やさずに未処理へ戻す"""
+        entry = self._entries[url]
+        entry["state"] = PENDING
+        self._pending.append(url)
+        self._settle(url)
+
+    def pending_urls(self) -> List[str]:
+        """未処理のURLを登録順に取得する"""
+        return [url for url, entry in self._entries.items() if entry["state"] == PENDING]
+
+    def mark_done(self, url: str) -> None:
+        """URLを完了にする"""
+        entry = self._entries[url]
+        entry["state"] = DONE
+        entry["attempts"] += 1
+        entry["error"] = None
+        self._settle(url)
+
+    def mark_failed(self, url: str, error: Optional[str] = None) -> None:
+        """URLを失敗にする（試行回数が上限未満なら再試行の対象にする）"""
+        entry = self._entries[url]
+        entry["state"] = FAILED
+        entry["attempts"] += 1
+        entry["error"] = error
+        if entry["attempts"] < self.max_attempts:
+            self._retry.append(url)
+        self._settle(url)
+
+    def _settle(self, url: str) -> None:
+        """処理中のURLの状態遷移を記録し、再試行を待つ側へ通知する"""
+        self._in_progress.discard(url)
+        self._record(url)
+        self._updated.set()
+
+    async def iter_retries(self) -> AsyncIterator[str]:
+        """
+        同じ実行の中で再試行する失敗URLを返す
+
+        処理中のURLがなくなるまで待ちながら、試行回数が上限未満の失敗URLを返す。
+        返したURLは claim で処理中にする。
+
+        Yields:
+            再試行するURL
+        """
+        while True:
+            self._updated.clear()
+            while self._retry:
+                url = self._retry.popleft()
+                entry = self._entries[url]
+                if entry["state"] == FAILED and entry["attempts"] < self.max_attempts:
+                    yield url
+            if not self._in_progress:
+                return
+            await self._updated.wait()
+
+    def requeue_failed(self) -> int:
+        """
+        試行回数が上限未満の失敗URLを未処理に戻す
+
+        Returns:
+            再投入した件数
+        """
+        requeued = 0
+        for url, entry in self._entries.items():
+            if entry["state"] == FAILED and entry["attempts"] < self.max_attempts:
+                entry["state"] = PENDING
+                self._pending.append(url)
+                self._record(url)
+                requeued += 1
+        self._request_flush()
+        return requeued
+
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのURL件数を取得する"""
+        counts = {state: 0 for state in URL_STATES}
+        for entry in self._entries.values():
+            counts[entry["state"]] += 1
+        return counts
+
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """URLの状態を取得する"""
+        return self._entries.get(url)
+
+    @property
+    def has_pending(self) -> bool:
+        """未処理のURLが残っている場合True"""
+        return bool(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._entries)
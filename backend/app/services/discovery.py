@@ -0,0 +1,256 @@
+"""
+検索結果からの企業URL探索（ディスカバリ）
+
+設定ファイルの target_sites（job_sites など）の各エントリに対応するアダプタで
+検索結果一覧をページングし、見つかった企業URLを重複排除しながら逐次返す。
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Type
+from urllib.parse import quote_plus, urljoin, urlsplit, urlunsplit
+
+from loguru import logger
+
+from app.utils.lazy_import import lazy_import
+
+bs4 = lazy_import("bs4")
+
+
+def normalize_url(url: str) -> str:
+    """
+    重複判定用にURLを正規化する
+
+    Args:
+        url: 対象のURL
+
+    Returns:
+        スキーム・ホストを小文字化し、フラグメントと末尾のスラッシュを除いたURL
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+class SearchSource(ABC):
+    """検索元サイトのアダプタ基底クラス"""
+
+    def __init__(self, site_config: Dict[str, Any]):
+        """
+        初期化
+
+        Args:
+            site_config: target_sites の1エントリ
+        """
+        self.site_config = site_config
+        self.name = site_config.get("name", self.__class__.__name__)
+
+    @abstractmethod
+    def build_page_url(self, keyword: str, page: int) -> str:
+        """検索結果一覧のページURLを組み立てる"""
+
+    @abstractmethod
+    def parse_listing(self, html: str, page_url: str) -> List[str]:
+        """検索結果一覧から企業ページのURLを抽出する"""
+
+
+SOURCE_ADAPTERS: Dict[str, Type[SearchSource]] = {}
+
+
+def register_source(adapter_name: str) -> Callable[[Type[SearchSource]], Type[SearchSource]]:
+    """
+    アダプタを登録するデコレータ
+
+    Args:
+        adapter_name: 設定ファイルの adapter キーで指定する名前
+    """
+    def decorator(cls: Type[SearchSource]) -> Type[SearchSource]:
+        SOURCE_ADAPTERS[adapter_name] = cls
+        return cls
+    return decorator
+
+
+@register_source("listing")
+class ListingPageSource(SearchSource):
+    """
+    CSSセレクタで企業リンクを抽出する汎用アダプタ
+
+    設定例::
+
+        - name: "求人サイトA"
+          base_url: "https://example-job.com"
+          search_url: "https://example-job.com/search?q={keyword}&page={page}"
+          selectors:
+            company_link: "a.company-name"
+    """
+
+    def build_page_url(self, keyword: str, page: int) -> str:
+        template = self.site_config.get(
+            "search_url",
+            self.site_config.get("base_url", "").rstrip("/") + "/search?q={keyword}&page={page}"
+        )
+        return template.format(keyword=quote_plus(keyword), page=page)
+
+    def parse_listing(self, html: str, page_url: str) -> List[str]:
+        selector = self.site_config.get("selectors", {}).get("company_link", "a[href]")
+        soup = bs4.BeautifulSoup(html, "html.parser")
+
+        urls = []
+        for link in soup.select(selector):
+            href = link.get("href")
+            if href and not href.startswith(("#", "mailto:", "javascript:")):
+                urls.append(urljoin(page_url, href))
+        return urls
+
+
+def build_sources(
+    target_sites: Dict[str, List[Dict[str, Any]]],
+    site_groups: List[str]
+) -> List[SearchSource]:
+    """
+    設定から検索元アダプタを生成する
+
+    Args:
+        target_sites: 設定ファイルの target_sites
+        site_groups: 対象とするグループ名（例: ["job_sites"]）
+
+    Returns:
+        アダプタのリスト
+    """
+    sources = []
+    for group in site_groups:
+        for site_config in target_sites.get(group) or []:
+            adapter_name = site_config.get("adapter", "listing")
+            adapter_cls = SOURCE_ADAPTERS.get(adapter_name)
+            if adapter_cls is None:
+                logger.warning(f"未登録のアダプタです: {adapter_name} ({site_config.get('name')})")
+                continue
+            sources.append(adapter_cls(site_config))
+    return sources
+
+
+class CompanyDiscovery:
+    """検索結果一覧を並列にページングして企業URLを探索する"""
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str], Awaitable[str]],
+        sources: List[SearchSource],
+        max_pages: int = 10,
+        concurrency: int = 4,
+        seen: Optional[Set[str]] = None
+    ):
+        """
+        初期化
+
+        Args:
+            fetch_page: ページ取得関数（ScrapingEngine.fetch_page）
+            sources: 検索元アダプタ
+            max_pages: 1検索元あたりの最大ページ数
+            concurrency: 一覧ページの同時取得数
+            seen: 重複判定に使う正規化済みURLの集合（複数の探索で共有可能）
+        """
+        self.fetch_page = fetch_page
+        self.sources = sources
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.seen = seen if seen is not None else set()
+        # 複数キーワードを同時に探索しても一覧ページの同時取得数は共通の上限に収める
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def iter_urls(self, keyword: str) -> AsyncIterator[Dict[str, str]]:
+        """
+        キーワードで探索し、新しい企業URLを見つけ次第返す
+
+        Args:
+            keyword: 検索キーワード
+
+        Yields:
+            {"url": 企業URL, "source_url": 一覧ページURL, "source": 検索元名}
+        """
+        found: asyncio.Queue = asyncio.Queue()
+        exhausted: Dict[str, int] = {}
+
+        async def crawl_page(source: SearchSource, page: int) -> None:
+            async with self.semaphore:
+                # 前のページで結果が尽きていれば以降のページは取得しない
+                if page > exhausted.get(source.name, self.max_pages):
+                    return
+                page_url = source.build_page_url(keyword, page)
+                try:
+                    html = await self.fetch_page(page_url)
+                except Exception as e:
+                    logger.error(f"検索結果の取得に失敗しました: {page_url} - {e}")
+                    return
+
+            links = source.parse_listing(html, page_url)
+            if not links:
+                exhausted[source.name] = min(exhausted.get(source.name, self.max_pages), page)
+            for url in links:
+                key = normalize_url(url)
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                await found.put({
+                    "url": url,
+                    "source_url": page_url,
+                    "source": source.name,
+                    "keyword": keyword
+                })
+
+        async def crawl_all() -> None:
+            try:
+                await asyncio.gather(*(
+                    crawl_page(source, page)
+                    for page in range(1, self.max_pages + 1)
+                    for source in self.sources
+                ))
+            finally:
+                await found.put(None)
+
+        task = asyncio.create_task(crawl_all())
+        try:
+            while True:
+                item = await found.get()
+                if item is None:
+                    break
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def iter_urls_many(self, keywords: List[str]) -> AsyncIterator[Dict[str, str]]:
+        """
+        複数キーワードを同時に探索し、結果を1本のストリームにまとめて返す
+
+        重複判定の集合を共有するため、複数のキーワードに該当する企業も1度だけ返す。
+
+        Args:
+            keywords: 検索キーワードのリスト
+
+        Yields:
+            {"url": 企業URL, "source_url": 一覧ページURL, "source": 検索元名, "keyword": キーワード}
+        """
+        merged: asyncio.Queue = asyncio.Queue()
+
+        async def drain(keyword: str) -> None:
+            async for item in self.iter_urls(keyword):
+                await merged.put(item)
+
+        async def drain_all() -> None:
+            try:
+                await asyncio.gather(*(drain(keyword) for keyword in keywords))
+            finally:
+                await merged.put(None)
+
+        task = asyncio.create_task(drain_all())
+        try:
+            while True:
+                item = await merged.get()
+                if item is None:
+                    break
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
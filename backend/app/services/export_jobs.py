@@ -0,0 +1,350 @@
+"""
+エクスポートジョブ（バックグラウンド生成と成果物キャッシュ）
+
+エクスポートファイルをワーカーで生成し、出力形式・フィルター条件・データバージョンから
+求めたキーでディスクにキャッシュする。データが更新されていなければ、同じ条件の
+再リクエストは生成済みのファイルをそのまま返す。
+"""
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.utils.metrics import CACHE_REQUESTS
+from app.utils.tracing import TRACER, current_trace_context
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+ERROR = "error"
+
+# (出力先のパス, 出力形式, フィルター条件, 営業ステータス含める) を受け取ってファイルを生成する関数
+ExportGenerator = Callable[[str, str, Dict[str, Any], bool], Awaitable[Any]]
+
+
+def build_cache_key(
+    file_format: str,
+    filters: Dict[str, Any],
+    include_sales_status: bool,
+    data_version: str
+) -> str:
+    """
+    成果物のキャッシュキーを求める
+
+    Args:
+        file_format: 出力形式
+        filters: フィルター条件
+        include_sales_status: 営業ステータス含める
+        data_version: データバージョン
+
+    Returns:
+        キャッシュキー（SHA-256 の16進文字列）
+    """
+    payload = json.dumps(
+        {
+            "format": file_format,
+            "filters": filters,
+            "include_sales_status": include_sales_status,
+            "data_version": data_version
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range ヘッダーを解析する
+
+    単一の bytes 範囲のみ扱い、それ以外（複数範囲など）は None を返して全体を送信させる。
+
+    Args:
+        range_header: Range ヘッダーの値
+        size: ファイルサイズ
+
+    Returns:
+        (開始位置, 終了位置) ※終了位置を含む。範囲指定がない場合 None
+
+    Raises:
+        ValueError: 範囲がファイルサイズを満たせない場合
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, separator, end_text = spec.strip().partition("-")
+    if not separator or not (start_text or end_text):
+        return None
+
+    try:
+        if not start_text:
+            # 末尾からのバイト数指定（bytes=-500）
+            suffix_length = int(end_text)
+            if suffix_length <= 0:
+                raise ValueError(f"Unsatisfiable range: {range_header}")
+            return max(size - suffix_length, 0), size - 1
+
+        start = int(start_text)
+        end = min(int(end_text), size - 1) if end_text else size - 1
+    except ValueError:
+        raise ValueError(f"Unsatisfiable range: {range_header}")
+
+    if start > end or start >= size:
+        raise ValueError(f"Unsatisfiable range: {range_header}")
+    return start, end
+
+
+async def iter_file_range(
+    path: str,
+    start: int,
+    end: int,
+    chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    ファイルの指定範囲をチャンク単位で読み込んで返す
+
+    Args:
+        path: ファイルのパス
+        start: 開始位置
+        end: 終了位置（含む）
+        chunk_size: チャンクサイズ
+
+    Yields:
+        ファイルの断片
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class ExportJobManager:
+    """エクスポートジョブの受付・生成・成果物キャッシュを管理する"""
+
+    def __init__(
+        self,
+        generate: ExportGenerator,
+        data_version: Callable[[], Awaitable[Optional[str]]],
+        cache_dir: str = "data/exports",
+        workers: int = 1,
+        max_artifacts: int = 20,
+        max_jobs: int = 100
+    ):
+        """
+        初期化
+
+        Args:
+            generate: ファイル生成関数
+            data_version: データバージョンを返す関数（None の場合はキャッシュしない）
+            cache_dir: 成果物の保存先ディレクトリ
+            workers: 同時に生成するジョブ数
+            max_artifacts: 保持する成果物の最大数（古いものから削除）
+            max_jobs: 保持するジョブ情報の最大数
+        """
+        self.generate = generate
+        self.data_version = data_version
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.max_artifacts = max_artifacts
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, str] = {}
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def submit(
+        self,
+        file_format: str,
+        filters: Dict[str, Any],
+        include_sales_status: bool
+    ) -> Dict[str, Any]:
+        """
+        エクスポートジョブを受け付ける
+
+        同じ条件・同じデータバージョンの成果物があれば即座に完了扱いにし、
+        生成中のジョブがあればそのジョブを返す。
+
+        Args:
+            file_format: 出力形式
+            filters: フィルター条件
+            include_sales_status: 営業ステータス含める
+
+        Returns:
+            ジョブ情報
+        """
+        data_version = await self.data_version()
+        if data_version is None:
+            # データバージョンが分からない場合は他のリクエストと共有しない
+            cache_key = uuid.uuid4().hex
+        else:
+            cache_key = build_cache_key(file_format, filters, include_sales_status, data_version)
+
+        inflight_job_id = self._inflight.get(cache_key)
+        if inflight_job_id is not None:
+            # 生成中の同じ成果物を待つ場合も生成を省けるのでヒットとして数える
+            CACHE_REQUESTS.labels("export_artifact", "hit").inc()
+            return self._jobs[inflight_job_id]
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "format": file_format,
+            "filters": dict(filters),
+            "include_sales_status": include_sales_status,
+            "data_version": data_version,
+            "cache_key": cache_key,
+            "cached": False,
+            "size": None,
+            "error_message": None,
+            "created_at": datetime.now(),
+            "finished_at": None,
+            # ワーカーで生成する際に受付時のトレースへつなげる
+            "trace_context": current_trace_context()
+        }
+        self._remember(job)
+
+        path = self.artifact_path(job)
+        if data_version is not None and os.path.exists(path):
+            # 最近使われた成果物として残るよう更新日時を進める
+            os.utime(path)
+            job.update({
+                "status": COMPLETED,
+                "cached": True,
+                "size": os.path.getsize(path),
+                "finished_at": datetime.now()
+            })
+            CACHE_REQUESTS.labels("export_artifact", "hit").inc()
+            logger.info(f"キャッシュ済みのエクスポートを返します: {job['job_id']} ({file_format})")
+            return job
+
+        CACHE_REQUESTS.labels("export_artifact", "miss").inc()
+        self._inflight[cache_key] = job["job_id"]
+        self._done_events[job["job_id"]] = asyncio.Event()
+        self._ensure_workers()
+        await self._queue.put(job["job_id"])
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """ジョブ情報を取得する"""
+        return self._jobs.get(job_id)
+
+    def artifact_path(self, job: Dict[str, Any]) -> str:
+        """ジョブの成果物のパスを取得する"""
+        return os.path.join(self.cache_dir, job["cache_key"])
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """
+        ジョブの完了（成功・失敗）を待つ
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ情報
+        """
+        event = self._done_events.get(job_id)
+        if event is not None:
+            await event.wait()
+        return self._jobs[job_id]
+
+    async def aclose(self) -> None:
+        """ワーカーを停止する"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _ensure_workers(self) -> None:
+        """ワーカーを必要になった時点で起動する"""
+        if self._worker_tasks:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(self._jobs[job_id])
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """ジョブのファイルを生成する"""
+        job["status"] = RUNNING
+        path = self.artifact_path(job)
+        tmp_path = f"{path}.{job['job_id']}.tmp"
+        try:
+            with TRACER.span(
+                "export_job",
+                {"job_id": job["job_id"], "format": job["format"]},
+                parent=job["trace_context"]
+            ):
+                await self.generate(tmp_path, job["format"], job["filters"], job["include_sales_status"])
+            # 生成途中のファイルをキャッシュとして返さないよう、完成後に置き換える
+            os.replace(tmp_path, path)
+            job.update({
+                "status": COMPLETED,
+                "size": os.path.getsize(path),
+                "finished_at": datetime.now()
+            })
+            logger.info(f"エクスポートを生成しました: {job['job_id']} ({job['format']}, {job['size']} bytes)")
+            self._prune_artifacts()
+        except Exception as e:
+            logger.error(f"エクスポートの生成に失敗しました: {job['job_id']} - {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            job.update({
+                "status": ERROR,
+                "error_message": str(e),
+                "finished_at": datetime.now()
+            })
+        finally:
+            self._inflight.pop(job["cache_key"], None)
+            event = self._done_events.pop(job["job_id"], None)
+            if event is not None:
+                event.set()
+
+    def _remember(self, job: Dict[str, Any]) -> None:
+        """ジョブ情報を保持する（上限を超えた分は終了済みの古いものから破棄）"""
+        self._jobs[job["job_id"]] = job
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id]["status"] in (COMPLETED, ERROR):
+                del self._jobs[job_id]
+
+    def _prune_artifacts(self) -> None:
+        """最近使われていない成果物を上限数まで削除する"""
+        artifacts = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if not name.endswith(".tmp")
+        ]
+        if len(artifacts) <= self.max_artifacts:
+            return
+        artifacts.sort(key=os.path.getmtime)
+        for path in artifacts[:len(artifacts) - self.max_artifacts]:
+            os.remove(path)
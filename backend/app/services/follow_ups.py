@@ -0,0 +1,166 @@
+"""
+フォローアップ予定の索引とリマインダー
+
+次回アクション予定日時をキーにした整列済みの索引を持ち、「今後N日分」のような
+範囲検索を二分探索で行う。リマインダーは索引の先頭（最も近い予定）まで待機し、
+期限を迎えた予定をコールバックへ通知する。
+"""
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class FollowUpIndex:
+    """次回アクション予定日時で整列したフォローアップ予定の索引"""
+
+    def __init__(self):
+        # (予定日時, 企業ID) の昇順リストと、企業IDから予定への辞書
+        self._keys: List[Tuple[datetime, int]] = []
+        self._entries: Dict[int, Dict[str, Any]] = {}
+
+    def set(self, company_id: int, due: Optional[datetime], **details: Any) -> None:
+        """
+        企業のフォローアップ予定を登録・更新する（due が None の場合は削除）
+
+        Args:
+            company_id: 企業ID
+            due: 次回アクション予定日時
+            **details: 予定に付随する情報（next_action, contact_person など）
+        """
+        self.remove(company_id)
+        if due is None:
+            return
+        insort(self._keys, (due, company_id))
+        self._entries[company_id] = {"company_id": company_id, "due_date": due, **details}
+
+    def remove(self, company_id: int) -> None:
+        """企業のフォローアップ予定を削除する"""
+        entry = self._entries.pop(company_id, None)
+        if entry is None:
+            return
+        key = (entry["due_date"], company_id)
+        position = bisect_left(self._keys, key)
+        del self._keys[position]
+
+    def range(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        予定日時が start 以上 end 未満の予定を取得する
+
+        Args:
+            start: 開始日時
+            end: 終了日時
+
+        Returns:
+            予定日時の昇順に並んだ予定
+        """
+        low = bisect_left(self._keys, (start,))
+        high = bisect_left(self._keys, (end,))
+        return [self._entries[company_id] for _, company_id in self._keys[low:high]]
+
+    def upcoming(self, days: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        今後 days 日以内の予定を取得する
+
+        Args:
+            days: 日数
+            now: 基準日時（未指定時は現在日時）
+
+        Returns:
+            予定日時の昇順に並んだ予定
+        """
+        now = now or datetime.now()
+        return self.range(now, now + timedelta(days=days))
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """moment より後で最も近い予定日時"""
+        position = bisect_right(self._keys, (moment, float("inf")))
+        return self._keys[position][0] if position < len(self._keys) else None
+
+    def clear(self) -> None:
+        """すべての予定を削除する"""
+        self._keys.clear()
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class FollowUpScheduler:
+    """期限を迎えたフォローアップ予定を通知するプロセス内スケジューラー"""
+
+    def __init__(
+        self,
+        index: FollowUpIndex,
+        on_due: Callable[[Dict[str, Any]], Optional[Awaitable[None]]],
+        lead_time: timedelta = timedelta(0)
+    ):
+        """
+        初期化
+
+        Args:
+            index: フォローアップ予定の索引
+            on_due: 期限を迎えた予定を受け取るコールバック
+            lead_time: 予定日時のどれだけ前に通知するか
+        """
+        self.index = index
+        self.on_due = on_due
+        self.lead_time = lead_time
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        # この日時までの予定は通知済み
+        self._notified_until = datetime.now() + lead_time
+
+    def start(self) -> None:
+        """スケジューラーを起動する"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """スケジューラーを停止する"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def notify(self) -> None:
+        """索引が変わったことを伝え、次の待機時間を計算し直させる"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            next_due = self.index.next_after(self._notified_until)
+            if next_due is None:
+                await self._wakeup.wait()
+                continue
+
+            delay = (next_due - self.lead_time - datetime.now()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    # 予定が追加・変更されたので待機し直す
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            # 前回の通知範囲の直後から現在（＋通知の前倒し分）までの予定を通知する
+            horizon = datetime.now() + self.lead_time
+            due = self.index.range(
+                self._notified_until + timedelta(microseconds=1),
+                horizon + timedelta(microseconds=1)
+            )
+            self._notified_until = horizon
+            for entry in due:
+                await self._fire(entry)
+
+    async def _fire(self, entry: Dict[str, Any]) -> None:
+        try:
+            result = self.on_due(entry)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"フォローアップの通知に失敗しました: {entry['company_id']} - {e}")
@@ -1,15 +1,42 @@
 """
 Google Spreadsheet連携サービス
 """
-import gspread
-from google.oauth2.service_account import Credentials
-from typing import Dict, List, Optional, Any
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
+from urllib.parse import urlsplit
 import os
 from loguru import logger
 
+from app.utils.lazy_import import lazy_import
+from app.utils.metrics import SHEETS_API_DURATION, SHEETS_API_ERRORS
+from app.utils.tracing import traced
+
+# gspread と google-auth は最初の接続時に読み込む
+gspread = lazy_import("gspread")
+service_account = lazy_import("google.oauth2.service_account")
+
+
+# Companiesシートの列順（_company_to_row と対応）
+COMPANY_COLUMNS = [
+    "id", "company_name", "url", "address", "postal_code", "prefecture", "city",
+    "address_detail", "tel", "fax", "representative", "business_content",
+    "established_date", "capital", "contact_url", "source_url",
+    "created_at", "updated_at", "capital_yen"
+]
+COMPANY_LAST_COLUMN = "S"
+# 作成日時の列（Q列。企業情報の更新時は書き換えない）
+COMPANY_CREATED_AT_INDEX = COMPANY_COLUMNS.index("created_at")
 
-def build_credentials(credentials_path: Optional[str] = None) -> Credentials:
+# SalesStatusesシートの列順（update_sales_status と対応）
+SALES_STATUS_COLUMNS = [
+    "company_id", "status", "memo", "contact_person",
+    "last_contact_date", "next_action", "updated_at", "next_action_date"
+]
+
+
+def build_credentials(credentials_path: Optional[str] = None) -> service_account.Credentials:
     """Google認証情報を構築する"""
     scopes = [
         'https://www.googleapis.com/auth/spreadsheets',
@@ -20,7 +47,7 @@ def build_credentials(credentials_path: Optional[str] = None) -> Credentials:
         credentials_path = os.environ.get('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
     
     try:
-        credentials = Credentials.from_service_account_file(
+        credentials = service_account.Credentials.from_service_account_file(
             credentials_path,
             scopes=scopes
         )
@@ -31,6 +58,65 @@ def build_credentials(credentials_path: Optional[str] = None) -> Credentials:
         return None
 
 
+# 範囲に続けて指定する値の操作（/values/{range}:append など）
+VALUES_ACTIONS = {"append", "clear"}
+
+DRIVE_VERBS = {"GET": "get", "POST": "create", "PATCH": "update", "DELETE": "delete"}
+
+
+def api_method_name(http_method: str, url: str) -> str:
+    """
+    リクエストのURLから Sheets / Drive API のメソッド名を求める（メトリクスのラベル用）
+
+    Args:
+        http_method: HTTPメソッド
+        url: リクエストのURL
+
+    Returns:
+        "values.get" "values.append" "spreadsheets.batchUpdate" "drive.files.get" など
+    """
+    path = urlsplit(url).path
+    if "/drive/" in path:
+        resource = "permissions" if "/permissions" in path else "files"
+        return f"drive.{resource}.{DRIVE_VERBS.get(http_method, http_method.lower())}"
+
+    _, found, rest = path.partition("/spreadsheets/")
+    if not found:
+        return f"other.{http_method.lower()}"
+    spreadsheet, _, sub = rest.partition("/")
+    if ":" in spreadsheet:
+        return "spreadsheets." + spreadsheet.split(":", 1)[1]
+    if not sub:
+        return "spreadsheets.get"
+    if sub.startswith("values:"):
+        return "values." + sub.split(":", 1)[1]
+    if sub.startswith("values/"):
+        action = sub.rpartition(":")[2]
+        if action in VALUES_ACTIONS:
+            return f"values.{action}"
+        return "values.update" if http_method == "PUT" else "values.get"
+    if sub.startswith("sheets/"):
+        return "sheets." + sub.rpartition(":")[2]
+    return f"other.{http_method.lower()}"
+
+
+def observe_api_response(response, *args, **kwargs) -> None:
+    """API のレスポンスごとに呼ばれ、メソッド単位の件数とレイテンシを記録する"""
+    method = api_method_name(response.request.method, response.request.url)
+    SHEETS_API_DURATION.labels(method).observe(response.elapsed.total_seconds())
+    if response.status_code >= 400:
+        SHEETS_API_ERRORS.labels(method).inc()
+
+
+def instrument_client(client) -> None:
+    """gspread のクライアントが使う HTTP セッションに計測用のフックを登録する"""
+    # gspread 6 はセッションを http_client に持つ
+    session = getattr(getattr(client, "http_client", client), "session", None)
+    hooks = getattr(session, "hooks", None)
+    if isinstance(hooks, dict) and observe_api_response not in hooks.setdefault("response", []):
+        hooks["response"].append(observe_api_response)
+
+
 class GoogleSheetsService:
     """Google Spreadsheet操作サービス"""
     
@@ -47,12 +133,14 @@ class GoogleSheetsService:
         
         if credentials:
             self.client = gspread.authorize(credentials)
+            instrument_client(self.client)
             self.spreadsheet = self.client.open_by_key(spreadsheet_id)
         else:
             # テスト時のモック対応
             self.client = None
             self.spreadsheet = None
     
+    @traced("sheets.add_company")
     def add_company(self, company_data: Dict[str, Any]) -> bool:
         """
         企業情報を追加する
@@ -67,26 +155,7 @@ class GoogleSheetsService:
             worksheet = self.spreadsheet.worksheet("Companies")
             
             # データを行形式に変換
-            row_data = [
-                company_data.get("id", ""),
-                company_data.get("company_name", ""),
-                company_data.get("url", ""),
-                company_data.get("address", ""),
-                company_data.get("postal_code", ""),
-                company_data.get("prefecture", ""),
-                company_data.get("city", ""),
-                company_data.get("address_detail", ""),
-                company_data.get("tel", ""),
-                company_data.get("fax", ""),
-                company_data.get("representative", ""),
-                company_data.get("business_content", ""),
-                company_data.get("established_date", ""),
-                company_data.get("capital", ""),
-                company_data.get("contact_url", ""),
-                company_data.get("source_url", ""),
-                company_data.get("created_at", datetime.now().isoformat()),
-                datetime.now().isoformat()
-            ]
+            row_data = self._company_to_row(company_data)
             
             result = self.append_row(worksheet, row_data)
             return result is not None
@@ -95,10 +164,64 @@ class GoogleSheetsService:
             logger.error(f"企業情報の追加に失敗しました: {e}")
             raise
     
+    @traced("sheets.add_companies")
+    def add_companies(self, companies: List[Dict[str, Any]]) -> int:
+        """
+        企業情報をまとめて追加する（1回のAPI呼び出しで書き込む）
+        
+        Args:
+            companies: 企業情報の辞書のリスト
+            
+        Returns:
+            追加した件数
+        """
+        if not companies:
+            return 0
+        
+        try:
+            worksheet = self.spreadsheet.worksheet("Companies")
+            rows = [self._company_to_row(company_data) for company_data in companies]
+            
+            result = self.append_rows(worksheet, rows)
+            return len(rows) if result is not None else 0
+            
+        except Exception as e:
+            logger.error(f"企業情報の一括追加に失敗しました: {e}")
+            raise
+    
+    def _company_to_row(self, company_data: Dict[str, Any]) -> List[Any]:
+        """企業情報をCompaniesシートの行形式に変換する"""
+        return [
+            company_data.get("id", ""),
+            company_data.get("company_name", ""),
+            company_data.get("url", ""),
+            company_data.get("address", ""),
+            company_data.get("postal_code", ""),
+            company_data.get("prefecture", ""),
+            company_data.get("city", ""),
+            company_data.get("address_detail", ""),
+            company_data.get("tel", ""),
+            company_data.get("fax", ""),
+            company_data.get("representative", ""),
+            company_data.get("business_content", ""),
+            company_data.get("established_date", ""),
+            company_data.get("capital", ""),
+            company_data.get("contact_url", ""),
+            company_data.get("source_url", ""),
+            company_data.get("created_at", datetime.now().isoformat()),
+            datetime.now().isoformat(),
+            company_data.get("capital_yen", "")
+        ]
+    
     def append_row(self, worksheet, row_data: List[Any]) -> Dict[str, Any]:
         """ワークシートに行を追加する（テスト可能なメソッド）"""
         return worksheet.append_row(row_data)
     
+    def append_rows(self, worksheet, rows: List[List[Any]]) -> Dict[str, Any]:
+        """ワークシートに複数行を追加する（テスト可能なメソッド）"""
+        return worksheet.append_rows(rows)
+    
+    @traced("sheets.check_duplicate_by_url")
     def check_duplicate_by_url(self, url: str) -> bool:
         """
         URLによる重複チェック
@@ -116,6 +239,18 @@ class GoogleSheetsService:
             logger.error(f"重複チェックに失敗しました: {e}")
             return False
     
+    @traced("sheets.get_existing_urls")
+    def get_existing_urls(self) -> Set[str]:
+        """
+        登録済みの企業URLを取得する（重複チェックを1回の読み込みで済ませるため）
+        
+        Returns:
+            URLの集合
+        """
+        worksheet = self.spreadsheet.worksheet("Companies")
+        # URLはC列、1行目はヘッダー行
+        return set(worksheet.col_values(3)[1:])
+    
     def find_by_url(self, url: str) -> Optional[Dict[str, Any]]:
         """URLで企業を検索する"""
         worksheet = self.spreadsheet.worksheet("Companies")
@@ -129,6 +264,97 @@ class GoogleSheetsService:
             # セルが見つからない場合
             return None
     
+    def find_company_row(self, company_id: int) -> Optional[int]:
+        """
+        企業IDからシートの行番号を取得する
+        
+        Args:
+            company_id: 企業ID
+            
+        Returns:
+            行番号（見つからない場合 None）
+        """
+        worksheet = self.spreadsheet.worksheet("Companies")
+        return self._find_row_by_id(worksheet, company_id)
+    
+    def _find_row_by_id(self, worksheet, company_id: int) -> Optional[int]:
+        """A列の企業IDが一致する行番号を取得する（1行目はヘッダー行）"""
+        for row_number, value in enumerate(worksheet.col_values(1)[1:], start=2):
+            if value == str(company_id):
+                return row_number
+        return None
+    
+    def get_next_company_id(self) -> int:
+        """採番済みの最大IDの次のIDを取得する"""
+        worksheet = self.spreadsheet.worksheet("Companies")
+        ids = [int(value) for value in worksheet.col_values(1)[1:] if value.isdigit()]
+        return max(ids, default=0) + 1
+    
+    def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]:
+        """
+        企業IDで企業情報を取得する
+        
+        Args:
+            company_id: 企業ID
+            
+        Returns:
+            企業情報（見つからない場合 None）
+        """
+        row_number = self.find_company_row(company_id)
+        if row_number is None:
+            return None
+        worksheet = self.spreadsheet.worksheet("Companies")
+        return self._row_to_company(worksheet.row_values(row_number))
+    
+    @traced("sheets.update_company")
+    def update_company(self, company_id: int, company_data: Dict[str, Any]) -> bool:
+        """
+        企業情報を更新する
+        
+        Args:
+            company_id: 企業ID
+            company_data: 企業情報の辞書
+            
+        Returns:
+            成功時True（企業が見つからない場合False）
+        """
+        row_number = self.find_company_row(company_id)
+        if row_number is None:
+            return False
+        
+        worksheet = self.spreadsheet.worksheet("Companies")
+        row_data = self._company_to_row({**company_data, "id": company_id})
+        # 作成日時は登録時の値を保つため、その前後の列だけを1回の呼び出しで書き込む
+        worksheet.batch_update([
+            {
+                "range": f"A{row_number}:P{row_number}",
+                "values": [row_data[:COMPANY_CREATED_AT_INDEX]]
+            },
+            {
+                "range": f"R{row_number}:{COMPANY_LAST_COLUMN}{row_number}",
+                "values": [row_data[COMPANY_CREATED_AT_INDEX + 1:]]
+            },
+        ])
+        return True
+    
+    def delete_company(self, company_id: int) -> bool:
+        """
+        企業情報を削除する
+        
+        Args:
+            company_id: 企業ID
+            
+        Returns:
+            成功時True（企業が見つからない場合False）
+        """
+        row_number = self.find_company_row(company_id)
+        if row_number is None:
+            return False
+        
+        worksheet = self.spreadsheet.worksheet("Companies")
+        worksheet.delete_rows(row_number)
+        return True
+    
     def get_companies(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         企業リストを取得する
@@ -149,27 +375,46 @@ class GoogleSheetsService:
             if limit:
                 data_rows = data_rows[:limit]
             
-            companies = []
-            for row in data_rows:
-                if len(row) >= 3:  # 最低限必要なカラム数
-                    companies.append({
-                        "id": row[0] if len(row) > 0 else "",
-                        "company_name": row[1] if len(row) > 1 else "",
-                        "url": row[2] if len(row) > 2 else "",
-                        "address": row[3] if len(row) > 3 else "",
-                        # 他のフィールドも必要に応じて追加
-                    })
-            
-            return companies
+            return [
+                self._row_to_company(row) for row in data_rows
+                if len(row) >= 3  # 最低限必要なカラム数
+            ]
             
         except Exception as e:
             logger.error(f"企業リストの取得に失敗しました: {e}")
             return []
     
+    def get_company_rows(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        企業リストを範囲指定で取得する（全件を読み込まずにページングするため）
+        
+        Args:
+            offset: 先頭からのスキップ件数（ヘッダー行を除く）
+            limit: 取得件数
+            
+        Returns:
+            企業情報のリスト（空行も含め、末尾を超えた分は含まない）
+        """
+        worksheet = self.spreadsheet.worksheet("Companies")
+        # 1行目はヘッダー行
+        first_row = offset + 2
+        last_row = first_row + limit - 1
+        rows = worksheet.get(f"A{first_row}:{COMPANY_LAST_COLUMN}{last_row}")
+        
+        return [self._row_to_company(row) for row in rows]
+    
+    def _row_to_company(self, row: List[str]) -> Dict[str, Any]:
+        """Companiesシートの行を企業情報の辞書に変換する"""
+        return {
+            column: row[index] if index < len(row) else ""
+            for index, column in enumerate(COMPANY_COLUMNS)
+        }
+    
     def get_all_values(self, worksheet) -> List[List[str]]:
         """ワークシートの全データを取得する（テスト可能なメソッド）"""
         return worksheet.get_all_values()
     
+    @traced("sheets.update_sales_status")
     def update_sales_status(self, company_id: int, status_data: Dict[str, Any]) -> bool:
         """
         営業ステータスを更新する
@@ -202,10 +447,11 @@ class GoogleSheetsService:
                     status_data.get("contact_person", ""),
                     status_data.get("last_contact_date", ""),
                     status_data.get("next_action", ""),
-                    status_data.get("updated_at", datetime.now().isoformat())
+                    status_data.get("updated_at", datetime.now().isoformat()),
+                    status_data.get("next_action_date", "")
                 ]
                 
-                worksheet.update(f"A{row_num}:G{row_num}", [row_data])
+                worksheet.update(f"A{row_num}:H{row_num}", [row_data])
             else:
                 # 新規追加
                 row_data = [
@@ -215,7 +461,8 @@ class GoogleSheetsService:
                     status_data.get("contact_person", ""),
                     status_data.get("last_contact_date", ""),
                     status_data.get("next_action", ""),
-                    datetime.now().isoformat()
+                    datetime.now().isoformat(),
+                    status_data.get("next_action_date", "")
                 ]
                 
                 self.update_status(worksheet, row_data)
@@ -226,6 +473,63 @@ class GoogleSheetsService:
             logger.error(f"ステータス更新に失敗しました: {e}")
             return False
     
+    def get_sales_status(self, company_id: int) -> Optional[Dict[str, Any]]:
+        """
+        企業IDで営業ステータスを取得する
+        
+        Args:
+            company_id: 企業ID
+            
+        Returns:
+            営業ステータス情報（未登録の場合 None）
+        """
+        worksheet = self.spreadsheet.worksheet("SalesStatuses")
+        row_number = self._find_row_by_id(worksheet, company_id)
+        if row_number is None:
+            return None
+        
+        row = worksheet.row_values(row_number)
+        return {
+            column: row[index] if index < len(row) else ""
+            for index, column in enumerate(SALES_STATUS_COLUMNS)
+        }
+    
+    def get_sales_status_map(self) -> Dict[int, Dict[str, Any]]:
+        """
+        営業ステータスを企業IDをキーとして一括取得する（シートの読み込みは1回のみ）
+        
+        Returns:
+            企業IDから営業ステータス情報への辞書
+        """
+        worksheet = self.spreadsheet.worksheet("SalesStatuses")
+        all_values = self.get_all_values(worksheet)
+        
+        statuses = {}
+        # ヘッダー行をスキップ
+        for row in all_values[1:]:
+            if not row or not str(row[0]).isdigit():
+                continue
+            statuses[int(row[0])] = {
+                column: row[index] if index < len(row) else ""
+                for index, column in enumerate(SALES_STATUS_COLUMNS)
+            }
+        return statuses
+    
+    def get_data_version(self) -> Optional[str]:
+        """
+        データバージョンとしてスプレッドシートの最終更新日時を取得する
+        
+        Returns:
+            Drive の最終更新日時（取得できない場合 None）
+        """
+        if self.spreadsheet is None:
+            return None
+        try:
+            return self.spreadsheet.get_lastUpdateTime()
+        except Exception as e:
+            logger.warning(f"スプレッドシートの最終更新日時の取得に失敗しました: {e}")
+            return None
+    
     def update_status(self, worksheet, row_data: List[Any]) -> None:
         """ステータスシートに行を追加する（テスト可能なメソッド）"""
         worksheet.append_row(row_data)
@@ -0,0 +1,190 @@
+"""
+収集した企業情報の一括正規化
+
+電話番号・FAX番号・郵便番号・資本金・設立年月日を、1件ずつではなく
+DataFrame の列単位の文字列演算（pandas の .str アクセサ）でまとめて正規化する。
+正規化できなかった値は元の値のまま残し、行番号・項目・値を errors として返す。
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from app.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+
+NORMALIZED_FIELDS = ["tel", "fax", "postal_code", "capital", "established_date"]
+
+# 全角の数字・記号を半角へ（長音符やダッシュ類は電話番号の区切りとして使われる）
+HALF_WIDTH_TABLE = str.maketrans(
+    "０１２３４５６７８９－ー―‐−（）　，．／",
+    "0123456789-----() ,./"
+)
+
+PHONE_DIGITS_PATTERN = r"^0\d{9,10}$"
+POSTAL_CODE_PATTERN = r"(\d{3})-?(\d{4})"
+CAPITAL_PATTERN = (
+    r"^(?:(?P<oku>\d+(?:\.\d+)?)億)?(?:(?P<man>\d+(?:\.\d+)?)万)?"
+    r"(?:(?P<sen>\d+(?:\.\d+)?)千)?(?P<yen>\d+)?円?$"
+)
+DATE_PATTERN = (
+    r"(?P<era>明治|大正|昭和|平成|令和)?\s*(?P<year>\d{1,4})\s*[年/.-]"
+    r"(?:\s*(?P<month>\d{1,2})\s*[月/.-]?(?:\s*(?P<day>\d{1,2})\s*日?)?)?"
+)
+
+# 和暦の元年の西暦
+ERA_START_YEARS = {
+    "明治": 1868,
+    "大正": 1912,
+    "昭和": 1926,
+    "平成": 1989,
+    "令和": 2019,
+}
+
+CAPITAL_UNITS = {"oku": 100_000_000, "man": 10_000, "sen": 1_000, "yen": 1}
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """欠損を空文字にし、全角を半角にそろえる"""
+    return series.fillna("").astype(str).str.translate(HALF_WIDTH_TABLE).str.strip()
+
+
+def _normalize_phone(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """電話・FAX番号を「0X-XXXX-XXXX」のような数字とハイフンの形にそろえる"""
+    text = _text(series)
+    text = text.str.replace(r"^\+81[-\s]*(?:\(0\))?", "0", regex=True)
+    text = (
+        text.str.replace(r"[()\s]+", "-", regex=True)
+        .str.replace(r"-{2,}", "-", regex=True)
+        .str.strip("-")
+    )
+    digits = text.str.replace(r"\D", "", regex=True)
+    valid = digits.str.match(PHONE_DIGITS_PATTERN) & text.str.fullmatch(r"[\d-]+")
+    return text, valid | (text == "")
+
+
+def _normalize_postal_code(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """郵便番号を「123-4567」の形にそろえる"""
+    text = _text(series)
+    parts = text.str.extract(POSTAL_CODE_PATTERN)
+    normalized = parts[0] + "-" + parts[1]
+    return normalized.fillna(text), parts[0].notna() | (text == "")
+
+
+def _capital_to_yen(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """資本金（「1億2000万円」「10,000,000円」など）を円単位の整数にする"""
+    text = _text(series)
+    # 「（2024年3月時点）」のような注記と桁区切りを除く
+    cleaned = (
+        text.str.replace(r"\(.*?\)", "", regex=True)
+        .str.replace(r"^資本金[:：]?", "", regex=True)
+        .str.replace(r"[,\s]", "", regex=True)
+    )
+    parts = cleaned.str.extract(CAPITAL_PATTERN)
+    amounts = sum(
+        pd.to_numeric(parts[unit], errors="coerce").fillna(0) * multiplier
+        for unit, multiplier in CAPITAL_UNITS.items()
+    )
+    matched = parts.notna().any(axis=1)
+    yen = amounts.round().astype("Int64").where(matched)
+    return yen, matched | (text == "")
+
+
+def _normalize_established_date(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """設立年月日を「YYYY-MM-DD」（日・月が不明な場合は「YYYY-MM」「YYYY」）にそろえる"""
+    text = _text(series).str.replace("元年", "1年", regex=False)
+    parts = text.str.extract(DATE_PATTERN)
+
+    year = pd.to_numeric(parts["year"], errors="coerce")
+    era_start = parts["era"].map(ERA_START_YEARS)
+    year = year.where(era_start.isna(), era_start + year - 1)
+    month = pd.to_numeric(parts["month"], errors="coerce")
+    day = pd.to_numeric(parts["day"], errors="coerce")
+
+    valid = (
+        year.between(1800, pd.Timestamp.now().year)
+        & (month.isna() | month.between(1, 12))
+        & (day.isna() | (month.notna() & day.between(1, 31)))
+    )
+    normalized = year.astype("Int64").astype(str).str.zfill(4)
+    normalized = normalized.where(
+        month.isna(), normalized + "-" + month.astype("Int64").astype(str).str.zfill(2)
+    )
+    normalized = normalized.where(
+        day.isna(), normalized + "-" + day.astype("Int64").astype(str).str.zfill(2)
+    )
+    return normalized.where(valid, text), valid | (text == "")
+
+
+_NORMALIZERS = {
+    "tel": _normalize_phone,
+    "fax": _normalize_phone,
+    "postal_code": _normalize_postal_code,
+    "established_date": _normalize_established_date,
+}
+
+
+def normalize_company_frame(frame: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    企業情報の DataFrame を一括で正規化する
+
+    資本金は元の表記を capital に残し、円単位の整数を capital_yen 列に追加する。
+
+    Args:
+        frame: 企業情報（tel, fax, postal_code, capital, established_date 列を含みうる）
+
+    Returns:
+        (正規化した DataFrame, 行ごとのエラー)
+    """
+    normalized = frame.copy()
+    errors: List[Dict[str, Any]] = []
+
+    def collect(field: str, valid: pd.Series, message: str) -> None:
+        for row, value in frame.loc[~valid, field].items():
+            errors.append({"row": row, "field": field, "value": value, "message": message})
+
+    for field, normalizer in _NORMALIZERS.items():
+        if field not in frame.columns:
+            continue
+        values, valid = normalizer(frame[field])
+        # 正規化できなかった値と欠損は元の値のまま残す
+        normalized[field] = values.where(valid & frame[field].notna(), frame[field])
+        collect(field, valid, f"Invalid {field} format")
+
+    if "capital" in frame.columns:
+        yen, valid = _capital_to_yen(frame["capital"])
+        normalized["capital_yen"] = yen
+        collect("capital", valid, "Invalid capital format")
+
+    errors.sort(key=lambda error: (error["row"], NORMALIZED_FIELDS.index(error["field"])))
+    return normalized, errors
+
+
+def normalize_company_records(
+    records: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    企業情報の辞書のリストを一括で正規化する
+
+    Args:
+        records: 企業情報のリスト
+
+    Returns:
+        (正規化した企業情報のリスト, 行ごとのエラー。row はリストの位置)
+    """
+    if not records:
+        return [], []
+
+    frame = pd.DataFrame.from_records(records)
+    normalized, errors = normalize_company_frame(frame)
+    normalized = normalized.astype(object).where(normalized.notna(), None)
+
+    results = []
+    for record, row in zip(records, normalized.to_dict("records")):
+        # 元の辞書になかった項目（他の行にだけあった列）は加えない
+        results.append({
+            key: value for key, value in row.items()
+            if key in record or key == "capital_yen" and "capital" in record
+        })
+    return results, errors
@@ -0,0 +1,135 @@
+"""
+営業ダッシュボードのスナップショット
+
+ステータス別件数・成約率・最近の更新履歴（件数上限付きのリングバッファ）を保持し、
+営業ステータスの更新のたびに差分だけ反映する。内容が変わるたびにバージョンを進め、
+ETag として返すことで、変更のないダッシュボードは 304 で応答できる。
+"""
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.models.company import SalesStatus
+
+
+# 成約率の分母に含めるステータス（アプローチ済み）
+APPROACHED_STATUSES = ["アプローチ中", "商談中", "成約", "見送り"]
+CONVERTED_STATUS = "成約"
+
+
+def calculate_conversion_rate(summary: Dict[str, int]) -> float:
+    """
+    成約率（%）を計算する
+
+    Args:
+        summary: ステータス別件数
+
+    Returns:
+        アプローチ済みの企業に占める成約の割合
+    """
+    approached = sum(summary.get(status, 0) for status in APPROACHED_STATUSES)
+    if approached == 0:
+        return 0.0
+    return round(summary.get(CONVERTED_STATUS, 0) / approached * 100, 2)
+
+
+class DashboardSnapshot:
+    """営業ダッシュボードの集計値を差分更新で保持する"""
+
+    def __init__(self, recent_limit: int = 10):
+        """
+        初期化
+
+        Args:
+            recent_limit: 保持する最近の更新履歴の件数
+        """
+        self.recent_limit = recent_limit
+        self.by_status: Counter = Counter()
+        self.recent_updates: Deque[Dict[str, Any]] = deque(maxlen=recent_limit)
+        self._statuses: Dict[int, str] = {}
+        # プロセスごとに異なる値にし、再起動後に古い ETag と一致しないようにする
+        self._instance_id = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.built = False
+
+    @property
+    def etag(self) -> str:
+        """現在の内容を表す ETag"""
+        return f'W/"dashboard-{self._instance_id}-{self.version}"'
+
+    def rebuild(self, statuses: List[SalesStatus]) -> None:
+        """
+        営業ステータスの全件から作り直す
+
+        Args:
+            statuses: 営業ステータスのリスト
+        """
+        self.by_status.clear()
+        self._statuses.clear()
+        self.recent_updates.clear()
+
+        for status in statuses:
+            self._statuses[status.company_id] = status.status
+            self.by_status[status.status] += 1
+
+        # 更新日時の新しい順に上限件数まで履歴に載せる
+        recent = sorted(
+            (status for status in statuses if status.updated_at),
+            key=lambda status: status.updated_at,
+            reverse=True
+        )[:self.recent_limit]
+        for status in reversed(recent):
+            self.recent_updates.appendleft(self._to_update(status, None))
+
+        self.built = True
+        self.version += 1
+
+    def apply(self, status: SalesStatus) -> None:
+        """
+        営業ステータスの更新を反映する
+
+        Args:
+            status: 更新後の営業ステータス
+        """
+        previous = self._statuses.get(status.company_id)
+        if previous is not None:
+            self.by_status[previous] -= 1
+            if self.by_status[previous] <= 0:
+                del self.by_status[previous]
+        self._statuses[status.company_id] = status.status
+        self.by_status[status.status] += 1
+
+        self.recent_updates.appendleft(self._to_update(status, previous))
+        self.version += 1
+
+    def status_of(self, company_id: int) -> Optional[str]:
+        """企業の現在のステータス（未登録の場合 None）"""
+        return self._statuses.get(company_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        ダッシュボードの内容を取得する
+
+        Returns:
+            summary, total_companies, recent_updates, conversion_rate
+        """
+        summary = dict(self.by_status)
+        return {
+            "summary": summary,
+            "total_companies": sum(summary.values()),
+            "recent_updates": list(self.recent_updates),
+            "conversion_rate": calculate_conversion_rate(summary)
+        }
+
+    @staticmethod
+    def _to_update(status: SalesStatus, previous: Optional[str]) -> Dict[str, Any]:
+        """更新履歴の1件分"""
+        updated_at = status.updated_at or datetime.now()
+        return {
+            "company_id": status.company_id,
+            "status": status.status,
+            "previous_status": previous,
+            "contact_person": status.contact_person,
+            "updated_at": updated_at.isoformat()
+        }
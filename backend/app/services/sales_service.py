@@ -0,0 +1,304 @@
+"""
+営業ステータスサービス層
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.models.company import SalesStatus
+from app.services.company_stats import CompanyStats
+from app.services.conversion_analytics import ConversionAnalytics
+from app.services.follow_ups import FollowUpIndex, FollowUpScheduler
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sales_dashboard import DashboardSnapshot
+from app.services.status_events import StatusEventLog
+
+
+class SalesService:
+    """営業ステータスを管理するサービスクラス"""
+
+    def __init__(
+        self,
+        sheets_service: GoogleSheetsService,
+        recent_limit: int = 10,
+        event_log: Optional[StatusEventLog] = None,
+        company_stats: Optional[CompanyStats] = None
+    ):
+        """
+        初期化
+
+        Args:
+            sheets_service: Google Sheetsサービス
+            recent_limit: ダッシュボードに表示する最近の更新履歴の件数
+            event_log: 営業ステータスの遷移イベントログ
+            company_stats: 営業ステータスの変更を反映する企業リストの集計値
+        """
+        self.sheets_service = sheets_service
+        self.company_stats = company_stats
+        self.dashboard = DashboardSnapshot(recent_limit)
+        # イベントは更新のたびに aflush でスレッドから書き出す
+        self.event_log = event_log if event_log is not None else StatusEventLog(flush_every=None)
+        self.analytics = ConversionAnalytics(self.event_log)
+        self.follow_ups = FollowUpIndex()
+        self.follow_up_scheduler: Optional[FollowUpScheduler] = None
+        # スナップショットの再構築と差分反映が入れ違わないようにする
+        self._dashboard_lock = asyncio.Lock()
+
+    async def get_sales_status(self, company_id: int) -> Optional[SalesStatus]:
+        """
+        営業ステータスを取得する
+
+        Args:
+            company_id: 企業ID
+
+        Returns:
+            営業ステータス（未登録の場合 None）
+        """
+        row = await asyncio.to_thread(self.sheets_service.get_sales_status, company_id)
+        if row is None:
+            return None
+        return self._to_sales_status(row)
+
+    async def list_sales_statuses(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[SalesStatus]:
+        """
+        営業ステータスの一覧を取得する
+
+        Args:
+            filters: 絞り込み条件（status, contact_person）
+            limit: 取得件数
+            offset: オフセット
+
+        Returns:
+            企業IDの昇順に並んだ営業ステータス
+        """
+        filters = filters or {}
+        rows = await asyncio.to_thread(self.sheets_service.get_sales_status_map)
+        statuses = []
+        for company_id in sorted(rows):
+            row = rows[company_id]
+            if any(row.get(field) != value for field, value in filters.items()):
+                continue
+            status = self._to_sales_status(row)
+            if status is not None:
+                statuses.append(status)
+        return statuses[offset:offset + limit]
+
+    async def update_sales_status(self, sales_status: SalesStatus) -> bool:
+        """
+        営業ステータスを更新し、ダッシュボード・遷移イベントログ・企業リストの集計値に反映する
+
+        Args:
+            sales_status: 更新後の営業ステータス
+
+        Returns:
+            成功時True
+        """
+        # 遷移前のステータスはダッシュボードが保持している値を使う
+        if not self.dashboard.built:
+            await self.rebuild_dashboard()
+
+        success = await asyncio.to_thread(
+            self.sheets_service.update_sales_status,
+            sales_status.company_id,
+            sales_status.model_dump(exclude_none=True)
+        )
+        if success:
+            async with self._dashboard_lock:
+                previous = self.dashboard.status_of(sales_status.company_id)
+                self.dashboard.apply(sales_status)
+                self._index_follow_up(sales_status)
+            if self.company_stats is not None:
+                self.company_stats.set_status(sales_status.company_id, sales_status.status)
+            # 行は上書きされるため、更新内容はイベントとして残す
+            event = self.event_log.append(
+                sales_status.company_id,
+                previous,
+                sales_status.status,
+                sales_status.updated_at,
+                memo=sales_status.memo,
+                contact_person=sales_status.contact_person,
+                next_action=sales_status.next_action
+            )
+            if previous != sales_status.status:
+                self.analytics.record(event["company_id"], event["to_status"], event["timestamp"])
+            await self.event_log.aflush()
+        return success
+
+    async def bulk_update_status(self, status_updates: List[Dict[str, Any]]) -> List[bool]:
+        """
+        営業ステータスを一括更新する
+
+        1件ずつ update_sales_status と同じ経路で更新し、ダッシュボード・遷移イベントログ・
+        フォローアップ予定・企業リストの集計値に反映する。
+
+        Args:
+            status_updates: ステータス更新情報のリスト
+
+        Returns:
+            更新結果のリスト
+        """
+        results = []
+        for update in status_updates:
+            try:
+                status = SalesStatus(
+                    company_id=update["company_id"],
+                    status=update["status"],
+                    memo=update.get("memo"),
+                    contact_person=update.get("contact_person"),
+                    updated_at=datetime.now()
+                )
+                result = await self.update_sales_status(status)
+            except Exception as e:
+                logger.error(f"ステータス更新エラー: {e}")
+                result = False
+            if result:
+                logger.info(f"ステータス更新成功: 企業ID {update['company_id']}")
+            results.append(result)
+        return results
+
+    async def get_status_history(
+        self,
+        company_id: int,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        企業の営業ステータスの履歴を取得する
+
+        Args:
+            company_id: 企業ID
+            limit: 新しいものから数えた最大件数
+
+        Returns:
+            日時の昇順に並んだ履歴
+        """
+        return [
+            {**event, "timestamp": event["timestamp"].isoformat()}
+            for event in self.event_log.timeline(company_id, limit=limit)
+        ]
+
+    async def get_conversion_analytics(self, period: str) -> List[Dict[str, Any]]:
+        """
+        期間別の成約率分析を取得する
+
+        Args:
+            period: "weekly", "monthly", "yearly"
+
+        Returns:
+            期間ごとのファネルの件数と成約率
+        """
+        if not self.analytics.built:
+            # pandas の読み込みはスレッドで行い、集計は更新と入れ違わないようイベントループ上で行う
+            await asyncio.to_thread(self.analytics.load_dependencies)
+            self.analytics.rebuild()
+        return self.analytics.get(period)
+
+    async def get_upcoming_follow_ups(self, days: int) -> List[Dict[str, Any]]:
+        """
+        今後のフォローアップ予定を取得する
+
+        Args:
+            days: 今日から何日分を取得するか
+
+        Returns:
+            次回アクション予定日時の昇順に並んだ予定
+        """
+        if not self.dashboard.built:
+            await self.rebuild_dashboard()
+        return [
+            {**entry, "due_date": entry["due_date"].isoformat()}
+            for entry in self.follow_ups.upcoming(days)
+        ]
+
+    async def start_follow_up_reminders(
+        self,
+        on_due: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None,
+        lead_time: timedelta = timedelta(0)
+    ) -> None:
+        """
+        フォローアップのリマインダーを起動する
+
+        Args:
+            on_due: 期限を迎えた予定を受け取るコールバック（未指定時はログ出力）
+            lead_time: 予定日時のどれだけ前に通知するか
+        """
+        if self.follow_up_scheduler is not None:
+            return
+        if not self.dashboard.built:
+            try:
+                await self.rebuild_dashboard()
+            except Exception as e:
+                logger.error(f"フォローアップ予定の読み込みに失敗しました: {e}")
+
+        self.follow_up_scheduler = FollowUpScheduler(
+            self.follow_ups, on_due or self._log_follow_up, lead_time
+        )
+        self.follow_up_scheduler.start()
+
+    async def stop_follow_up_reminders(self) -> None:
+        """フォローアップのリマインダーを停止し、未書き出しのイベントを書き出す"""
+        if self.follow_up_scheduler is not None:
+            await self.follow_up_scheduler.stop()
+            self.follow_up_scheduler = None
+        await self.event_log.aflush()
+
+    def _index_follow_up(self, sales_status: SalesStatus) -> None:
+        """フォローアップ予定を索引に反映する"""
+        self.follow_ups.set(
+            sales_status.company_id,
+            sales_status.next_action_date,
+            next_action=sales_status.next_action,
+            contact_person=sales_status.contact_person,
+            status=sales_status.status
+        )
+        if self.follow_up_scheduler is not None:
+            self.follow_up_scheduler.notify()
+
+    @staticmethod
+    def _log_follow_up(entry: Dict[str, Any]) -> None:
+        logger.info(
+            f"フォローアップ期限: 企業ID {entry['company_id']} "
+            f"{entry['due_date']:%Y-%m-%d %H:%M} {entry.get('next_action') or ''}"
+        )
+
+    async def get_dashboard(self) -> Tuple[Dict[str, Any], str]:
+        """
+        ダッシュボードの内容を取得する
+
+        初回のみ営業ステータスを全件読み込み、以降は更新時の差分反映で保たれた値を返す。
+
+        Returns:
+            (ダッシュボードの内容, ETag)
+        """
+        if not self.dashboard.built:
+            await self.rebuild_dashboard()
+        return self.dashboard.to_dict(), self.dashboard.etag
+
+    async def rebuild_dashboard(self) -> None:
+        """営業ステータスを全件読み込んでダッシュボードとフォローアップ予定の索引を作り直す"""
+        async with self._dashboard_lock:
+            rows = await asyncio.to_thread(self.sheets_service.get_sales_status_map)
+            statuses = [
+                status for status in (self._to_sales_status(row) for row in rows.values())
+                if status is not None
+            ]
+            self.dashboard.rebuild(statuses)
+            self.follow_ups.clear()
+            for status in statuses:
+                self._index_follow_up(status)
+        logger.info(f"営業ダッシュボードを再構築しました: {len(statuses)} 件")
+
+    @staticmethod
+    def _to_sales_status(row: Dict[str, Any]) -> Optional[SalesStatus]:
+        """シートの行を SalesStatus に変換する（不正な行は None）"""
+        try:
+            return SalesStatus(**{key: value for key, value in row.items() if value != ""})
+        except ValueError as e:
+            logger.warning(f"不正な営業ステータスをスキップしました: {row.get('company_id')} - {e}")
+            return None
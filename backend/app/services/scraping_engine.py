@@ -4,13 +4,22 @@
 import asyncio
 import random
 import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Any, AsyncIterator
 import httpx
-import yaml
 from loguru import logger
 
+from app.services.crawl_frontier import CrawlFrontier
+from app.services.discovery import CompanyDiscovery, build_sources
+from app.utils.lazy_import import lazy_import
+from app.utils.metrics import FETCH_DURATION, PARSE_DURATION, RATE_LIMIT_WAIT
+from app.utils.tracing import TRACER, traced
+
+bs4 = lazy_import("bs4")
+yaml = lazy_import("yaml")
+
 
 class RateLimiter:
     """レート制限を管理するクラス"""
@@ -31,41 +40,161 @@ class RateLimiter:
         current_time = time.time()
         time_since_last_request = current_time - self.last_request_time
         
+        wait_time = 0.0
         if time_since_last_request < self.interval:
             wait_time = self.interval - time_since_last_request
             await asyncio.sleep(wait_time)
         
         self.last_request_time = time.time()
+        RATE_LIMIT_WAIT.observe(wait_time)
+
+
+class FetchBudget:
+    """取得ページ数の上限（全体・ホスト単位）を管理するクラス"""
+    
+    def __init__(self, max_total_pages: Optional[int] = None, max_pages_per_host: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            max_total_pages: ジョブ全体で取得する最大ページ数（None は無制限）
+            max_pages_per_host: 1ホストあたりの最大ページ数（None は無制限）
+        """
+        self.max_total_pages = max_total_pages
+        self.max_pages_per_host = max_pages_per_host
+        self.used = 0
+        self.per_host: Dict[str, int] = {}
+    
+    @property
+    def exhausted(self) -> bool:
+        """全体の上限に達した場合True"""
+        return self.max_total_pages is not None and self.used >= self.max_total_pages
+    
+    def allow(self, url: str) -> bool:
+        """
+        URLの取得を許可できれば枠を消費する
+        
+        Args:
+            url: 取得するURL
+            
+        Returns:
+            取得してよい場合True
+        """
+        if self.exhausted:
+            return False
+        
+        host = urlsplit(url).netloc.lower()
+        host_count = self.per_host.get(host, 0)
+        if self.max_pages_per_host is not None and host_count >= self.max_pages_per_host:
+            return False
+        
+        self.per_host[host] = host_count + 1
+        self.used += 1
+        return True
+
+
+async def admit_urls(
+    search_results: AsyncIterator[Dict[str, str]],
+    budget: Optional[FetchBudget] = None,
+    frontier: Optional[CrawlFrontier] = None
+) -> AsyncIterator[Dict[str, str]]:
+    """
+    探索結果のうち取得するURLを返す
+    
+    フロンティアで完了済み・処理中のURLを除き、取得ページ数の上限内のものを処理中にして返す。
+    全体の上限に達した場合は探索を打ち切る。探索が終わった後は、処理中のURLがなくなるまで
+    失敗したURLを試行回数の上限まで再投入する。
+    
+    Args:
+        search_results: 探索結果の非同期イテレータ
+        budget: 取得ページ数の上限
+        frontier: クロールフロンティア
+        
+    Yields:
+        取得する探索結果
+    """
+    async def candidates() -> AsyncIterator[Dict[str, str]]:
+        async for item in search_results:
+            yield item
+        if frontier is not None:
+            async for url in frontier.iter_retries():
+                yield {"url": url}
+    
+    try:
+        async for item in candidates():
+            url = item["url"]
+            if frontier is not None and not frontier.claim(url):
+                continue
+            if budget is not None and not budget.allow(url):
+                if frontier is not None:
+                    # 上限で見送ったURLは次回の再開時に処理できるよう未処理に戻す
+                    frontier.release(url)
+                if budget.exhausted:
+                    break
+                continue
+            yield item
+    finally:
+        # 上限到達で打ち切った場合も探索を止める
+        aclose = getattr(search_results, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 
 class ScrapingEngine:
     """Webスクレイピングエンジン"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], transport: Optional[httpx.AsyncBaseTransport] = None):
         """
         初期化
         
         Args:
             config: 設定情報の辞書
+            transport: HTTPトランスポート（テスト用のスタブを差し込む場合に指定）
         """
         self.config = config
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
         self.rate_limiter = RateLimiter(1.0 / config.get("interval", 1))
         self.timeout = config.get("timeout", 30)
         self.max_pages_per_site = config.get("max_pages_per_site", 100)
         self.user_agents = config.get("user_agents", [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         ])
+        self.frontier_dir = config.get("frontier_dir", "data/frontier")
+        self.frontier_batch_size = config.get("frontier_batch_size", 50)
+        self.max_attempts = config.get("max_attempts", 3)
+        self.target_sites = config.get("target_sites", {})
+        self.discovery_concurrency = config.get("discovery_concurrency", 4)
+        self.fetch_concurrency = config.get("fetch_concurrency", 5)
+        self.max_total_pages = config.get("max_total_pages")
     
     @classmethod
     def from_config_file(cls, config_path: str) -> "ScrapingEngine":
         """設定ファイルからインスタンスを作成"""
         config = load_config(config_path)
-        return cls(config["scraping"])
+        return cls({**config["scraping"], "target_sites": config.get("target_sites", {})})
     
     def get_random_user_agent(self) -> str:
         """ランダムなUser-Agentを取得"""
         return random.choice(self.user_agents)
     
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        共有のHTTPクライアントを取得する（接続プールを再利用するため初回のみ作成）
+        
+        クライアントは作成時のイベントループに紐づくため、同じループ内で使い回し、
+        終了時に aclose() を呼ぶこと。
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(transport=self.transport)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """共有のHTTPクライアントを閉じる"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def fetch_page(self, url: str) -> str:
         """
         ページをフェッチする
@@ -76,21 +205,31 @@ class ScrapingEngine:
         Returns:
             HTMLコンテンツ
         """
-        await self.rate_limiter.wait()
-        
-        headers = {
-            "User-Agent": self.get_random_user_agent()
-        }
-        
-        async with httpx.AsyncClient() as client:
+        host = urlsplit(url).netloc.lower()
+        with TRACER.span("fetch_page", {"url": url, "host": host}) as span:
+            with TRACER.span("rate_limit_wait"):
+                await self.rate_limiter.wait()
+            
+            headers = {
+                "User-Agent": self.get_random_user_agent()
+            }
+            # 接続（DNS の解決を含む）・TLS・送信・受信を download の子スパンとして記録する
+            extensions = {"trace": TRACER.httpx_trace()} if TRACER.enabled else None
+            
+            client = self.get_client()
+            started = time.perf_counter()
             try:
-                response = await client.get(
-                    url,
-                    headers=headers,
-                    timeout=self.timeout,
-                    follow_redirects=True
-                )
+                with TRACER.span("download"):
+                    response = await client.get(
+                        url,
+                        headers=headers,
+                        timeout=self.timeout,
+                        follow_redirects=True,
+                        extensions=extensions
+                    )
+                span.set_attribute("status_code", response.status_code)
                 response.raise_for_status()
+                span.set_attribute("bytes", len(response.content))
                 return response.text
                 
             except httpx.TimeoutException:
@@ -99,7 +238,10 @@ class ScrapingEngine:
             except Exception as e:
                 logger.error(f"ページ取得エラー: {url} - {e}")
                 raise
+            finally:
+                FETCH_DURATION.labels(host).observe(time.perf_counter() - started)
     
+    @traced("extract_company_info")
     async def extract_company_info(self, url: str) -> Dict[str, Any]:
         """
         企業情報を抽出する
@@ -112,61 +254,7 @@ class ScrapingEngine:
         """
         try:
             html = await self.fetch_page(url)
-            soup = BeautifulSoup(html, "html.parser")
-            
-            # 基本的な情報抽出ロジック（実際のサイトに合わせて調整が必要）
-            company_info = {
-                "url": url,
-                "company_name": "",
-                "address": "",
-                "tel": "",
-                "fax": "",
-                "representative": "",
-                "business_content": "",
-                "established_date": "",
-                "capital": "",
-                "contact_url": ""
-            }
-            
-            # タイトルから会社名を取得
-            title_tag = soup.find("title")
-            if title_tag:
-                company_info["company_name"] = title_tag.text.strip()
-            
-            # h1タグからも会社名を探す
-            h1_tag = soup.find("h1")
-            if h1_tag and not company_info["company_name"]:
-                company_info["company_name"] = h1_tag.text.strip()
-            
-            # 会社情報を含む可能性のあるdivを探す
-            info_keywords = ["company-info", "corporate-info", "会社概要", "企業情報"]
-            for keyword in info_keywords:
-                info_div = soup.find("div", class_=keyword) or soup.find("div", id=keyword)
-                if info_div:
-                    # パラグラフタグから情報を抽出
-                    paragraphs = info_div.find_all("p")
-                    for p in paragraphs:
-                        text = p.get_text().strip()
-                        
-                        # 住所を抽出
-                        if "住所:" in text:
-                            company_info["address"] = text.replace("住所:", "").strip()
-                        elif "所在地:" in text:
-                            company_info["address"] = text.replace("所在地:", "").strip()
-                        
-                        # 電話番号を抽出
-                        elif "電話:" in text:
-                            company_info["tel"] = text.replace("電話:", "").strip()
-                        elif "TEL:" in text:
-                            company_info["tel"] = text.replace("TEL:", "").strip()
-                        
-                        # 代表者を抽出
-                        elif "代表者:" in text:
-                            company_info["representative"] = text.replace("代表者:", "").strip()
-                        elif "代表:" in text and "代表者" not in text:
-                            company_info["representative"] = text.replace("代表:", "").strip()
-            
-            return company_info
+            return self.parse_company_info(html, url)
             
         except asyncio.TimeoutError:
             return {
@@ -182,16 +270,110 @@ class ScrapingEngine:
                 "error_message": str(e)
             }
     
-    async def scrape_multiple(self, urls: List[str]) -> List[Dict[str, Any]]:
+    @traced("parse_company_info")
+    def parse_company_info(self, html: str, url: str) -> Dict[str, Any]:
+        """
+        取得済みのHTMLから企業情報を抽出する
+        
+        Args:
+            html: HTMLコンテンツ
+            url: 企業サイトのURL
+            
+        Returns:
+            抽出した企業情報
+        """
+        started = time.perf_counter()
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        
+        # 基本的な情報抽出ロジック（実際のサイトに合わせて調整が必要）
+        company_info = {
+            "url": url,
+            "company_name": "",
+            "address": "",
+            "tel": "",
+            "fax": "",
+            "representative": "",
+            "business_content": "",
+            "established_date": "",
+            "capital": "",
+            "contact_url": ""
+        }
+        
+        # タイトルから会社名を取得
+        title_tag = soup.find("title")
+        if title_tag:
+            company_info["company_name"] = title_tag.text.strip()
+        
+        # h1タグからも会社名を探す
+        h1_tag = soup.find("h1")
+        if h1_tag and not company_info["company_name"]:
+            company_info["company_name"] = h1_tag.text.strip()
+        
+        # 会社情報を含む可能性のあるdivを探す
+        info_keywords = ["company-info", "corporate-info", "会社概要", "企業情報"]
+        for keyword in info_keywords:
+            info_div = soup.find("div", class_=keyword) or soup.find("div", id=keyword)
+            if info_div:
+                # パラグラフタグから情報を抽出
+                paragraphs = info_div.find_all("p")
+                for p in paragraphs:
+                    text = p.get_text().strip()
+                    
+                    # 住所を抽出
+                    if "住所:" in text:
+                        company_info["address"] = text.replace("住所:", "").strip()
+                    elif "所在地:" in text:
+                        company_info["address"] = text.replace("所在地:", "").strip()
+                    
+                    # 電話番号を抽出
+                    elif "電話:" in text:
+                        company_info["tel"] = text.replace("電話:", "").strip()
+                    elif "TEL:" in text:
+                        company_info["tel"] = text.replace("TEL:", "").strip()
+                    
+                    # 代表者を抽出
+                    elif "代表者:" in text:
+                        company_info["representative"] = text.replace("代表者:", "").strip()
+                    elif "代表:" in text and "代表者" not in text:
+                        company_info["representative"] = text.replace("代表:", "").strip()
+        
+        PARSE_DURATION.observe(time.perf_counter() - started)
+        return company_info
+    
+    def create_frontier(self, job_id: str) -> CrawlFrontier:
+        """
+        ジョブ用のクロールフロンティアを作成する（既存のチェックポイントがあれば復元）
+        
+        Args:
+            job_id: ジョブID
+            
+        Returns:
+            クロールフロンティア
+        """
+        return CrawlFrontier(
+            job_id,
+            checkpoint_dir=self.frontier_dir,
+            max_attempts=self.max_attempts
+        )
+    
+    async def scrape_multiple(
+        self,
+        urls: List[str],
+        frontier: Optional[CrawlFrontier] = None
+    ) -> List[Dict[str, Any]]:
         """
         複数のURLから並列で情報を収集する
         
         Args:
             urls: URLのリスト
+            frontier: 指定時はフロンティアに記録しながら未処理のURLのみ収集する
             
         Returns:
             企業情報のリスト
         """
+        if frontier is not None:
+            return await self._scrape_with_frontier(urls, frontier)
+        
         tasks = []
         for url in urls[:self.max_pages_per_site]:
             task = self.extract_company_info(url)
@@ -213,20 +395,191 @@ class ScrapingEngine:
         
         return processed_results
     
-    async def search_companies(self, keyword: str) -> List[Dict[str, str]]:
+    async def _scrape_with_frontier(
+        self,
+        urls: List[str],
+        frontier: CrawlFrontier
+    ) -> List[Dict[str, Any]]:
+        """
+        フロンティアをチェックポイントとしてバッチ単位で収集する
+        
+        失敗したURLは全件の処理後に試行回数の上限まで再投入する。
+        
+        Args:
+            urls: URLのリスト
+            frontier: クロールフロンティア
+            
+        Returns:
+            今回の実行で取得できた企業情報のリスト
+        """
+        frontier.add_urls(urls[:self.max_pages_per_site])
+        
+        results = []
+        while True:
+            batch = frontier.next_batch(self.frontier_batch_size)
+            if not batch:
+                if frontier.requeue_failed() == 0:
+                    break
+                continue
+            
+            batch_results = await asyncio.gather(
+                *(self.extract_company_info(url) for url in batch),
+                return_exceptions=True
+            )
+            
+            for url, result in zip(batch, batch_results):
+                if isinstance(result, Exception):
+                    frontier.mark_failed(url, str(result))
+                elif result.get("error"):
+                    frontier.mark_failed(url, result.get("error_message"))
+                else:
+                    frontier.mark_done(url)
+                    results.append(result)
+            await frontier.aflush()
+        
+        logger.info(f"クロール状況 [{frontier.job_id}]: {frontier.counts()}")
+        return results
+    
+    def create_discovery(
+        self,
+        target_sites: Optional[List[str]] = None,
+        max_pages: Optional[int] = None
+    ) -> CompanyDiscovery:
+        """
+        設定に基づいて企業URLの探索器を作成する
+        
+        Args:
+            target_sites: 対象サイトのグループ名（既定は job_sites）
+            max_pages: 1検索元あたりの最大ページ数
+            
+        Returns:
+            探索器
+        """
+        sources = build_sources(self.target_sites, target_sites or ["job_sites"])
+        return CompanyDiscovery(
+            self.fetch_page,
+            sources,
+            max_pages=max_pages or self.config.get("max_search_pages", 10),
+            concurrency=self.discovery_concurrency
+        )
+    
+    async def search_companies(
+        self,
+        keyword: str,
+        target_sites: Optional[List[str]] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, str]]:
         """
-        キーワードで企業を検索する（実装は検索エンジンAPIに依存）
+        キーワードで企業を検索する
         
         Args:
             keyword: 検索キーワード
+            target_sites: 対象サイトのグループ名
+            max_pages: 1検索元あたりの最大ページ数
             
         Returns:
             検索結果のリスト
         """
-        # TODO: 実際の検索エンジンAPIまたはスクレイピングを実装
-        # ここでは仮の実装
         logger.info(f"検索キーワード: {keyword}")
-        return []
+        discovery = self.create_discovery(target_sites, max_pages)
+        return [item async for item in discovery.iter_urls(keyword)]
+    
+    def create_budget(self) -> FetchBudget:
+        """設定に基づいて取得ページ数の上限を作成する"""
+        return FetchBudget(
+            max_total_pages=self.max_total_pages,
+            max_pages_per_host=self.max_pages_per_site
+        )
+    
+    async def scrape_stream(
+        self,
+        search_results: AsyncIterator[Dict[str, str]],
+        concurrency: Optional[int] = None,
+        budget: Optional[FetchBudget] = None,
+        frontier: Optional[CrawlFrontier] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        探索結果を受け取り次第取得し、企業情報を逐次返す
+        
+        探索（一覧ページの取得）と企業ページの取得を並行して進める。
+        
+        Args:
+            search_results: 探索結果の非同期イテレータ
+            concurrency: 企業ページの同時取得数
+            budget: 取得ページ数の上限（上限を超えたURLは取得しない）
+            frontier: 指定時は完了済みのURLを飛ばし、処理結果を記録する
+            
+        Yields:
+            企業情報（失敗時は error キー付き）
+        """
+        concurrency = concurrency or self.fetch_concurrency
+        pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def produce():
+            try:
+                # 取り消された場合も探索を止める
+                async with aclosing(admit_urls(search_results, budget, frontier)) as items:
+                    async for item in items:
+                        await pending.put(item)
+            finally:
+                for _ in range(concurrency):
+                    await pending.put(None)
+        
+        async def fetch_worker():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                info = await self.extract_company_info(item["url"])
+                if item.get("source_url"):
+                    info.setdefault("source_url", item["source_url"])
+                if frontier is not None:
+                    if info.get("error"):
+                        frontier.mark_failed(item["url"], info.get("error_message"))
+                    else:
+                        frontier.mark_done(item["url"])
+                await results.put(info)
+        
+        async def run_all():
+            try:
+                await asyncio.gather(produce(), *(fetch_worker() for _ in range(concurrency)))
+            finally:
+                await results.put(None)
+        
+        task = asyncio.create_task(run_all())
+        try:
+            while True:
+                info = await results.get()
+                if info is None:
+                    break
+                yield info
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+            if frontier is not None:
+                await frontier.aflush()
+    
+    def discover_and_scrape(
+        self,
+        keyword: str,
+        target_sites: Optional[List[str]] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        キーワードで企業URLを探索しながら企業情報を収集する
+        
+        Args:
+            keyword: 検索キーワード
+            target_sites: 対象サイトのグループ名
+            max_pages: 1検索元あたりの最大ページ数
+            
+        Returns:
+            企業情報の非同期イテレータ
+        """
+        discovery = self.create_discovery(target_sites, max_pages)
+        return self.scrape_stream(discovery.iter_urls(keyword))
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
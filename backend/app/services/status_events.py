@@ -0,0 +1,244 @@
+"""
+営業ステータスのイベントストア
+
+営業ステータスの更新のたびに (企業ID, 遷移前, 遷移後, 日時, 更新内容) を JSONL 形式で
+追記する（既存のイベントは書き換えない）。メモリ上では企業IDごとに日時順の索引を持ち、
+企業単位の履歴（タイムライン）を全件走査せずに読み出せる。
+成約率分析などの集計もこのイベントから行う。
+イベントループ上では aflush で書き出し（fsync を含む）をスレッドで行い、同時に届いた
+更新のイベントは1回の書き込みにまとめる。
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from app.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+
+EVENT_COLUMNS = ["company_id", "from_status", "to_status", "timestamp"]
+
+# イベントに記録する更新内容
+EVENT_DETAIL_FIELDS = ["memo", "contact_person", "next_action"]
+
+
+class StatusEventLog:
+    """営業ステータスのイベントストア"""
+
+    def __init__(self, path: str = "data/status_events.jsonl", flush_every: Optional[int] = 1):
+        """
+        初期化
+
+        Args:
+            path: ログファイルのパス
+            flush_every: ディスクへ書き出すまでの最大イベント数（1の場合は追記のたびに書き出す。
+                None の場合は追記時には書き出さず、呼び出し側が flush または aflush で書き出す）
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.events: List[Dict[str, Any]] = []
+        # 企業ID → 日時順のイベント
+        self._by_company: Dict[int, List[Dict[str, Any]]] = {}
+        self._buffer: List[str] = []
+        self._write_lock = asyncio.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """ログファイルからイベントを読み込む"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # 書き込み途中で停止した末尾行は無視する
+                    logger.warning(f"破損したイベント行をスキップ: {self.path}")
+                    continue
+                event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+                self._index(event)
+
+    def _index(self, event: Dict[str, Any]) -> None:
+        """イベントを索引に加える"""
+        self.events.append(event)
+        timeline = self._by_company.setdefault(event["company_id"], [])
+        if not timeline or timeline[-1]["timestamp"] <= event["timestamp"]:
+            timeline.append(event)
+        else:
+            # 日時が前後して届いたイベントも日時順に並べる
+            insort(timeline, event, key=lambda item: item["timestamp"])
+
+    def append(
+        self,
+        company_id: int,
+        from_status: Optional[str],
+        to_status: str,
+        timestamp: Optional[datetime] = None,
+        **details: Any
+    ) -> Dict[str, Any]:
+        """
+        イベントを追記する
+
+        Args:
+            company_id: 企業ID
+            from_status: 遷移前のステータス（初回登録時は None）
+            to_status: 遷移後のステータス
+            timestamp: 更新日時（未指定時は現在日時）
+            **details: 更新内容（memo, contact_person, next_action）
+
+        Returns:
+            追記したイベント
+        """
+        event = {
+            "company_id": company_id,
+            "from_status": from_status,
+            "to_status": to_status,
+            "timestamp": timestamp or datetime.now(),
+            **{field: details[field] for field in EVENT_DETAIL_FIELDS if details.get(field) is not None}
+        }
+        self._index(event)
+        self._buffer.append(self._serialize(event))
+        if self.flush_every is not None and len(self._buffer) >= self.flush_every:
+            self.flush()
+        return event
+
+    def append_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        複数のイベントをまとめて追記する（書き込みは1回）
+
+        Args:
+            events: company_id, from_status, to_status, timestamp と更新内容を持つ辞書
+
+        Returns:
+            追記した件数
+        """
+        count = 0
+        for event in events:
+            self._buffer.append(self._serialize(event))
+            self._index(dict(event))
+            count += 1
+        self.flush()
+        return count
+
+    def _take_buffer(self) -> List[str]:
+        lines, self._buffer = self._buffer, []
+        return lines
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def flush(self) -> None:
+        """バッファ済みのイベントをディスクに書き出す"""
+        lines = self._take_buffer()
+        if lines:
+            self._write(lines)
+
+    async def aflush(self) -> None:
+        """
+        バッファ済みのイベントをスレッドでディスクに書き出す
+
+        書き込みは1つずつ順に行う。前の書き込みを待つ間に追記されたイベントは
+        次の書き込みにまとめられる。
+        """
+        async with self._write_lock:
+            lines = self._take_buffer()
+            if lines:
+                await asyncio.to_thread(self._write, lines)
+
+    def compact(self) -> int:
+        """
+        ログを企業ID・日時順に書き直す
+
+        重複したイベント（同じ企業・日時・遷移）と破損した行を取り除き、
+        ファイルの並びを索引と同じ順序にそろえる。
+
+        Returns:
+            書き直した後のイベント数
+        """
+        self.flush()
+        compacted = []
+        for company_id in sorted(self._by_company):
+            timeline = []
+            seen = set()
+            for event in self._by_company[company_id]:
+                key = (event["timestamp"], event["from_status"], event["to_status"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                timeline.append(event)
+            self._by_company[company_id] = timeline
+            compacted.extend(timeline)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for event in compacted:
+                f.write(self._serialize(event) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        removed = len(self.events) - len(compacted)
+        self.events = sorted(compacted, key=lambda event: event["timestamp"])
+        logger.info(f"イベントログを圧縮しました: {len(compacted)} 件（{removed} 件を削除）")
+        return len(compacted)
+
+    def timeline(
+        self,
+        company_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        企業の履歴を取得する
+
+        Args:
+            company_id: 企業ID
+            since: この日時以降のイベントのみ
+            until: この日時より前のイベントのみ
+            limit: 新しいものから数えた最大件数
+
+        Returns:
+            日時の昇順に並んだイベント
+        """
+        timeline = self._by_company.get(company_id, [])
+        low = bisect_left(timeline, since, key=lambda event: event["timestamp"]) if since else 0
+        high = (
+            bisect_left(timeline, until, key=lambda event: event["timestamp"]) if until
+            else len(timeline)
+        )
+        if limit is not None:
+            low = max(low, high - limit)
+        return timeline[low:high]
+
+    def to_frame(self) -> pd.DataFrame:
+        """イベントを DataFrame として取得する"""
+        frame = pd.DataFrame(self.events, columns=EVENT_COLUMNS)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+        return frame
+
+    @staticmethod
+    def _serialize(event: Dict[str, Any]) -> str:
+        return json.dumps({**event, "timestamp": event["timestamp"].isoformat()}, ensure_ascii=False)
+
+    def __len__(self) -> int:
+        return len(self.events)
@@ -0,0 +1,215 @@
+"""
+住所の分解
+
+都道府県名と市区町村名から文字単位のトライ木を一度だけ構築し、住所を先頭から
+最長一致でたどって都道府県・市区町村を切り出す。市区町村は同梱の表
+（app/data/municipalities.csv: 政令指定都市とその区、東京23区、名称の途中に
+「市」「町」「村」「郡」を含む市町村）を優先し、表にない市区町村は
+「○○郡○○町」と接尾辞（市・区・町・村）の規則で判定する。
+"""
+import csv
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.metrics import CACHE_REQUESTS
+
+
+# 都道府県（全国地方公共団体コード順）
+PREFECTURES = [
+    "北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県",
+    "茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県",
+    "新潟県", "富山県", "石川県", "福井県", "山梨県", "長野県", "岐阜県",
+    "静岡県", "愛知県", "三重県", "滋賀県", "京都府", "大阪府", "兵庫県",
+    "奈良県", "和歌山県", "鳥取県", "島根県", "岡山県", "広島県", "山口県",
+    "徳島県", "香川県", "愛媛県", "高知県", "福岡県", "佐賀県", "長崎県",
+    "熊本県", "大分県", "宮崎県", "鹿児島県", "沖縄県"
+]
+
+MUNICIPALITY_TABLE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "municipalities.csv"
+)
+
+POSTAL_CODE_PATTERN = re.compile(r'〒?(\d{3}-?\d{4})')
+
+# 表にない市区町村の判定規則（番地を巻き込まないよう数字は含めない）
+COUNTY_PATTERN = re.compile(r'^([^市区町村郡\d０-９\s]{1,6}郡[^市区町村郡\d０-９\s]{1,6}?[町村])')
+MUNICIPALITY_PATTERN = re.compile(r'^([^\d０-９\s]{1,8}?[市区町村])')
+
+# トライ木の終端に値を置くキー（1文字のキーと衝突しない）
+_END = ""
+
+
+class _Trie:
+    """文字単位のトライ木"""
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def add(self, word: str, value: Any) -> None:
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = value
+
+    def prefixes(self, text: str, start: int = 0) -> List[Tuple[int, Any]]:
+        """text[start:] の先頭に一致する語の (終了位置, 値) を短い順に返す"""
+        matches = []
+        node = self.root
+        for position in range(start, len(text)):
+            node = node.get(text[position])
+            if node is None:
+                break
+            if _END in node:
+                matches.append((position + 1, node[_END]))
+        return matches
+
+
+def _empty_result() -> Dict[str, str]:
+    return {
+        "postal_code": "",
+        "prefecture": "",
+        "city": "",
+        "address_detail": ""
+    }
+
+
+class AddressParser:
+    """都道府県・市区町村のトライ木による住所パーサー"""
+
+    def __init__(self, municipalities: Iterable[Tuple[str, str]] = ()):
+        """
+        初期化
+
+        Args:
+            municipalities: (都道府県, 市区町村) の組
+        """
+        self._prefectures = _Trie()
+        for prefecture in PREFECTURES:
+            self._prefectures.add(prefecture, prefecture)
+
+        # 市区町村名 → その名称を持つ都道府県（「北区」「中央区」などは複数）
+        self._municipalities = _Trie()
+        owners: Dict[str, Set[str]] = {}
+        for prefecture, municipality in municipalities:
+            owners.setdefault(municipality, set()).add(prefecture)
+        for municipality, prefectures in owners.items():
+            self._municipalities.add(municipality, frozenset(prefectures))
+
+    @classmethod
+    def from_csv(cls, path: str = MUNICIPALITY_TABLE) -> "AddressParser":
+        """市区町村表（prefecture, municipality 列の CSV）から構築する"""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = [(row["prefecture"], row["municipality"]) for row in csv.DictReader(f)]
+        return cls(rows)
+
+    def find_prefecture(self, address: str) -> Optional[Tuple[int, int, str]]:
+        """
+        住所中で最初に現れる都道府県を探す
+
+        Returns:
+            (開始位置, 終了位置, 都道府県)。見つからない場合は None
+        """
+        for start in range(len(address)):
+            matches = self._prefectures.prefixes(address, start)
+            if matches:
+                end, prefecture = matches[-1]
+                return start, end, prefecture
+        return None
+
+    def _match_municipality(self, text: str, prefecture: str) -> Tuple[str, str]:
+        """
+        先頭の市区町村を切り出す
+
+        Returns:
+            (市区町村, 都道府県)。都道府県が未確定で表から一意に決まる場合は補う
+        """
+        for end, prefectures in reversed(self._municipalities.prefixes(text)):
+            if prefecture:
+                if prefecture in prefectures:
+                    return text[:end], prefecture
+            elif len(prefectures) == 1:
+                return text[:end], next(iter(prefectures))
+            else:
+                return text[:end], prefecture
+
+        match = COUNTY_PATTERN.match(text) or MUNICIPALITY_PATTERN.match(text)
+        if match:
+            return match.group(1), prefecture
+        return "", prefecture
+
+    def parse(self, address: Optional[str]) -> Dict[str, str]:
+        """
+        住所を構成要素に分解する
+
+        Args:
+            address: 住所
+
+        Returns:
+            postal_code, prefecture, city, address_detail
+        """
+        parsed = _empty_result()
+        if not address:
+            return parsed
+
+        postal_match = POSTAL_CODE_PATTERN.search(address)
+        if postal_match:
+            parsed["postal_code"] = postal_match.group(1)
+            address = address.replace(postal_match.group(0), "")
+        address = address.strip()
+
+        found = self.find_prefecture(address)
+        if found:
+            _, end, parsed["prefecture"] = found
+            remaining = address[end:].strip()
+        else:
+            # 都道府県を省略した住所は、表の市区町村で始まる場合のみ分解する
+            if not self._municipalities.prefixes(address):
+                return parsed
+            remaining = address
+
+        city, parsed["prefecture"] = self._match_municipality(remaining, parsed["prefecture"])
+        parsed["city"] = city
+        parsed["address_detail"] = remaining[len(city):].strip()
+        return parsed
+
+    def parse_many(self, addresses: Iterable[Optional[str]]) -> List[Dict[str, str]]:
+        """
+        複数の住所をまとめて分解する（同じ住所は1度だけ分解する）
+
+        Args:
+            addresses: 住所のリスト
+
+        Returns:
+            入力と同じ順序の分解結果
+        """
+        cache: Dict[Optional[str], Dict[str, str]] = {}
+        results = []
+        for address in addresses:
+            if address not in cache:
+                cache[address] = self.parse(address)
+            results.append(dict(cache[address]))
+        CACHE_REQUESTS.labels("address_parse", "hit").inc(len(results) - len(cache))
+        CACHE_REQUESTS.labels("address_parse", "miss").inc(len(cache))
+        return results
+
+
+_default_parser: Optional[AddressParser] = None
+
+
+def get_address_parser() -> AddressParser:
+    """同梱の市区町村表から構築したパーサー（初回呼び出し時に構築）"""
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = AddressParser.from_csv()
+    return _default_parser
+
+
+def parse_address(address: Optional[str]) -> Dict[str, str]:
+    """住所を構成要素に分解する"""
+    return get_address_parser().parse(address)
+
+
+def parse_addresses(addresses: Iterable[Optional[str]]) -> List[Dict[str, str]]:
+    """複数の住所をまとめて分解する"""
+    return get_address_parser().parse_many(addresses)
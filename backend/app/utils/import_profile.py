@@ -0,0 +1,102 @@
+"""
+起動時のインポート時間の計測
+
+新しいインタープリターで ``python -X importtime`` を使って対象モジュールをインポートし、
+モジュールごとのインポート時間（自身のみ・依存を含む累計）を集計する。
+計測済みのモジュールの影響を受けないよう、現在のプロセスでは計測しない。
+"""
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+
+# 起動時に読み込まれていないことを確認する重い依存
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "openpyxl", "gspread", "google.auth", "bs4", "yaml"]
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    -X importtime の出力を解析する
+
+    Args:
+        output: 標準エラー出力
+
+    Returns:
+        インポート順のモジュールごとの計測値（self_us, cumulative_us はマイクロ秒、depth は入れ子の深さ）
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # 見出し行
+            continue
+        name = fields[2].rstrip()
+        timings.append({
+            "module": name.strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+    return timings
+
+
+def profile_imports(module: str = "app.main", cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    モジュールのインポート時間を新しいインタープリターで計測する
+
+    Args:
+        module: 対象のモジュール
+        cwd: 実行するディレクトリ（app パッケージの親）
+
+    Returns:
+        total_ms（合計）、modules（モジュールごとの計測値）、heavy_modules（読み込まれた重い依存）
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print('\\n'.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}: {result.stderr.strip().splitlines()[-1:]}")
+
+    timings = parse_importtime(result.stderr)
+    total_us = sum(timing["cumulative_us"] for timing in timings if timing["depth"] == 0)
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "modules": timings,
+        "heavy_modules": result.stdout.split(),
+    }
+
+
+def format_import_profile(profile: Dict[str, Any], limit: int = 20) -> str:
+    """
+    計測結果を表形式の文字列にする
+
+    Args:
+        profile: profile_imports の結果
+        limit: 表示するモジュール数（自身のインポート時間の長い順）
+
+    Returns:
+        レポート
+    """
+    lines = [
+        f"import {profile['module']}: {profile['total_ms']:.1f}ms "
+        f"({len(profile['modules'])} modules)",
+        f"heavy modules loaded at startup: {', '.join(profile['heavy_modules']) or 'none'}",
+        "",
+        f"{'self(ms)':>10} {'cumulative(ms)':>15}  module",
+    ]
+    slowest = sorted(profile["modules"], key=lambda timing: timing["self_us"], reverse=True)
+    for timing in slowest[:limit]:
+        lines.append(
+            f"{timing['self_us'] / 1000:>10.1f} {timing['cumulative_us'] / 1000:>15.1f}  {timing['module']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+"""
+大きな一覧レスポンスの JSON 化と圧縮
+
+FastAPI の既定の経路（response_model による辞書化・再検証・jsonable_encoder）を通さず、
+pydantic のモデルは pydantic-core で、それ以外は orjson で直接 JSON のバイト列にする。
+クライアントの Accept-Encoding に応じて brotli（brotli パッケージがある場合のみ）または
+gzip で圧縮する。
+"""
+import gzip
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import brotli
+except ImportError:  # brotli は任意の依存
+    brotli = None
+
+
+# これより小さいレスポンスは圧縮しない（圧縮の手間に見合わない）
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dump_json(content: Any, adapter: Optional[TypeAdapter] = None) -> bytes:
+    """
+    レスポンスの内容を JSON のバイト列にする
+
+    Args:
+        content: モデル、または JSON にできる値
+        adapter: content の型の TypeAdapter（モデルのリストなどに指定する）
+
+    Returns:
+        JSON のバイト列
+    """
+    if adapter is not None:
+        return adapter.dump_json(content)
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _default(value: Any) -> Any:
+    """orjson が直接扱えない値（pydantic のモデルなど）の変換"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict:
+    """
+    Accept-Encoding を符号化方式から q 値への辞書にする
+
+    Args:
+        header: Accept-Encoding ヘッダーの値
+
+    Returns:
+        {"gzip": 1.0, "br": 0.5} のような辞書
+    """
+    encodings = {}
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(header: Optional[str]) -> Optional[str]:
+    """
+    圧縮方式を選ぶ（q 値の高い方。同じ場合は br を優先）
+
+    Args:
+        header: Accept-Encoding ヘッダーの値
+
+    Returns:
+        "br" / "gzip"。圧縮しない場合は None
+    """
+    encodings = parse_accept_encoding(header)
+    wildcard = encodings.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = encodings.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """body を指定の方式で圧縮する"""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def json_response(
+    request: Request,
+    content: Any,
+    adapter: Optional[TypeAdapter] = None,
+    status_code: int = 200
+) -> Response:
+    """
+    JSON レスポンスを作る（必要に応じて圧縮する）
+
+    Args:
+        request: リクエスト（Accept-Encoding を参照する）
+        content: モデル、または JSON にできる値
+        adapter: content の型の TypeAdapter
+        status_code: ステータスコード
+
+    Returns:
+        レスポンス
+    """
+    body = dump_json(content, adapter)
+    headers = {"Vary": "Accept-Encoding"}
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= MIN_COMPRESS_SIZE:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
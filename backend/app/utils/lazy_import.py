@@ -0,0 +1,90 @@
+"""
+重いモジュールの遅延インポート
+
+pandas・pyarrow・openpyxl・gspread・BeautifulSoup・yaml などは、それを使う処理が
+初めて呼ばれたときに読み込む。API ワーカーや CLI の起動時にはこれらを読み込まないため、
+起動時間とメモリ使用量を抑えられる。
+
+    pd = lazy_import("pandas")
+
+    def to_frame(records):
+        return pd.DataFrame(records)  # ここで初めて pandas を読み込む
+
+遅延したモジュールの型を注釈に使うモジュールでは、定義時に読み込まれないよう
+``from __future__ import annotations`` を指定する。
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Any, Optional
+
+from loguru import logger
+
+
+class LazyModule:
+    """属性に初めてアクセスしたときにモジュールを読み込む代理オブジェクト"""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str):
+        """
+        初期化
+
+        Args:
+            name: モジュール名（"pyarrow.parquet" のようなサブモジュールも可）
+        """
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def load(self) -> ModuleType:
+        """モジュールを読み込む（読み込み済みならそれを返す）"""
+        module: Optional[ModuleType] = self._module
+        if module is not None:
+            return module
+
+        with self._lock:
+            if self._module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self._name)
+                object.__setattr__(self, "_module", module)
+                logger.debug(
+                    f"モジュールを読み込みました: {self._name} "
+                    f"({(time.perf_counter() - started) * 1000:.1f}ms)"
+                )
+            return self._module
+
+    @property
+    def loaded(self) -> bool:
+        """読み込み済みか"""
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self.load(), attr)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    モジュールを遅延インポートする
+
+    Args:
+        name: モジュール名
+
+    Returns:
+        初回の属性アクセス時にモジュールを読み込む代理オブジェクト
+    """
+    return LazyModule(name)
@@ -0,0 +1,273 @@
+"""
+Prometheus 形式のメトリクス
+
+カウンターとヒストグラムをプロセス内で集計し、/metrics で Prometheus のテキスト形式
+（version 0.0.4）として出力する。本番でも常時有効にできるよう、記録は
+ラベルの組ごとの値の加算とバケットの二分探索だけで済ませ、累積値への変換は出力時に行う。
+
+    FETCH_DURATION.labels("example.com").observe(0.12)
+    CACHE_REQUESTS.labels("export_artifact", "hit").inc()
+
+キャッシュのヒット率は cache_requests_total の result="hit" と result="miss" の比で求める。
+"""
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# 秒単位のレイテンシ向けの既定のバケット
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ラベルの組の上限（ホスト名などで系列が際限なく増えないようにする）
+DEFAULT_MAX_SERIES = 1000
+OVERFLOW_LABEL = "__other__"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    """ラベルの組ごとのカウンター"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """値を加算する"""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    """ラベルの組ごとのヒストグラム"""
+
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # 最後の要素は +Inf バケット
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """観測値を記録する"""
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """(バケットごとの件数, 合計)"""
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class _Metric:
+    """メトリクスの共通処理（ラベルの組ごとの値の管理）"""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """
+        ラベルの値に対応する系列を取得する
+
+        系列数が上限に達した後の新しいラベルの組は、値をすべて "__other__" にした系列へまとめる。
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        with self._lock:
+            if key not in self._children and len(self._children) >= self.max_series:
+                key = (OVERFLOW_LABEL,) * len(self.labelnames)
+            if key not in self._children:
+                self._children[key] = self._new_child()
+            return self._children[key]
+
+    def clear(self) -> None:
+        """記録した値をすべて消す"""
+        with self._lock:
+            self._children = {(): self._new_child()} if not self.labelnames else {}
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """テキスト形式で出力する"""
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """ラベルのないカウンターを加算する"""
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in sorted(self._children.items())
+        ]
+
+
+class Histogram(_Metric):
+    """バケット単位の分布を記録するヒストグラム"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, documentation, labelnames, max_series)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """ラベルのないヒストグラムに記録する"""
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, child in sorted(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """メトリクスの登録先"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """メトリクスを登録する（同名のものがあればそれを返す）"""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = (), **kwargs) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, **kwargs))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def render(self) -> str:
+        """登録済みのメトリクスをすべてテキスト形式で出力する"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+SHEETS_API_DURATION = REGISTRY.histogram(
+    "sheets_api_request_duration_seconds",
+    "Google Sheets / Drive API request latency by API method",
+    ("method",)
+)
+SHEETS_API_ERRORS = REGISTRY.counter(
+    "sheets_api_errors_total",
+    "Google Sheets / Drive API responses with an error status by API method",
+    ("method",)
+)
+FETCH_DURATION = REGISTRY.histogram(
+    "scraping_fetch_duration_seconds",
+    "Page fetch latency by host (excluding rate-limiter wait)",
+    ("host",)
+)
+PARSE_DURATION = REGISTRY.histogram(
+    "scraping_parse_duration_seconds",
+    "Time to extract company information from one page",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "scraping_rate_limit_wait_seconds",
+    "Time spent waiting for the rate limiter before a fetch",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit / miss)",
+    ("cache", "result")
+)
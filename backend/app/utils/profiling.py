@@ -0,0 +1,238 @@
+"""
+稼働中のワーカーのプロファイリング
+
+指定した秒数のあいだ、別スレッドから一定間隔で全スレッドのスタックを採取する
+サンプリング方式の CPU プロファイルと、tracemalloc による期間中に確保されて
+解放されていないメモリを記録する。外部のプロファイラーは使わない。
+
+結果は次の形式で出力できる。
+
+- collapsed: "スレッド;関数;関数 サンプル数" の集約スタック（flamegraph.pl などで読み込める）
+- speedscope: https://www.speedscope.app で開けるファイル（CPU とメモリの2つのプロファイル）
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_INTERVAL = 0.01
+# メモリの確保元として記録するスタックの深さ
+TRACEMALLOC_FRAMES = 25
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (関数名, ファイル, 行番号)
+Frame = Tuple[str, str, int]
+
+
+def _short_path(path: str) -> str:
+    """sys.path からの相対パスにする（最も長く一致したものを使う）"""
+    best = ""
+    for entry in sys.path:
+        if entry and path.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return path[len(best):].lstrip(os.sep) if best else path
+
+
+def _frame_name(frame: Frame) -> str:
+    """表示名（スレッドは名前のみ、メモリの確保元はファイルと行のみ）"""
+    name, path, line = frame
+    if not path:
+        label = name
+    elif not name:
+        label = f"{path}:{line}"
+    else:
+        label = f"{name} ({path}:{line})"
+    return label.replace(";", ":")
+
+
+class SamplingProfiler:
+    """全スレッドのスタックを一定間隔で採取するプロファイラー"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, trace_memory: bool = True):
+        """
+        初期化
+
+        Args:
+            interval: 採取間隔（秒）
+            trace_memory: tracemalloc でメモリの確保元も記録する
+        """
+        self.interval = interval
+        self.trace_memory = trace_memory
+        # スタック（外側から順の Frame のタプル）ごとのサンプル数
+        self.stacks: Dict[Tuple[Frame, ...], int] = {}
+        self.sample_count = 0
+        self.duration = 0.0
+        self.memory: List[Dict[str, Any]] = []
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._memory_start: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._code_names: Dict[Any, Frame] = {}
+
+    def start(self) -> None:
+        """採取を開始する"""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            self._memory_start = tracemalloc.take_snapshot()
+
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """採取を終了する"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started_at
+
+        if self._memory_start is not None:
+            self.memory = self._memory_growth(self._memory_start, tracemalloc.take_snapshot())
+            self._memory_start = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own_id)
+
+    def _sample(self, own_id: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._code_frame(frame.f_code))
+                frame = frame.f_back
+            stack.append((names.get(thread_id, f"thread-{thread_id}"), "", 0))
+            key = tuple(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.sample_count += 1
+
+    def _code_frame(self, code) -> Frame:
+        # コードオブジェクトごとに名前を一度だけ組み立てる
+        frame = self._code_names.get(code)
+        if frame is None:
+            frame = (code.co_qualname, _short_path(code.co_filename), code.co_firstlineno)
+            self._code_names[code] = frame
+        return frame
+
+    @staticmethod
+    def _memory_growth(start: tracemalloc.Snapshot, end: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """期間中に増えた確保を確保元のスタックごとに集計する"""
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        growth = []
+        for diff in end.filter_traces(ignore).compare_to(start.filter_traces(ignore), "traceback"):
+            if diff.size_diff <= 0:
+                continue
+            growth.append({
+                # tracemalloc のスタックは外側から順（最後が確保した行）
+                "stack": [
+                    ("", _short_path(frame.filename), frame.lineno)
+                    for frame in diff.traceback
+                ],
+                "size": diff.size_diff,
+                "count": diff.count_diff,
+            })
+        growth.sort(key=lambda entry: entry["size"], reverse=True)
+        return growth
+
+    def collapsed(self) -> str:
+        """CPU プロファイルを集約スタック形式にする"""
+        lines = [
+            ";".join(_frame_name(frame) for frame in stack) + f" {count}"
+            for stack, count in sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        ]
+        return "\n".join(lines) + "\n"
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """自身で実行していたサンプル数の多い関数"""
+        counts: Dict[Frame, int] = {}
+        for stack, count in self.stacks.items():
+            counts[stack[-1]] = counts.get(stack[-1], 0) + count
+        top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {"function": _frame_name(frame), "samples": count, "seconds": round(count * self.interval, 3)}
+            for frame, count in top
+        ]
+
+    def top_allocations(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """期間中に増えたメモリの多い確保元"""
+        return [
+            {
+                "location": f"{entry['stack'][-1][1]}:{entry['stack'][-1][2]}" if entry["stack"] else "",
+                "size_kb": round(entry["size"] / 1024, 1),
+                "count": entry["count"],
+            }
+            for entry in self.memory[:limit]
+        ]
+
+    def speedscope(self, name: str = "profile") -> Dict[str, Any]:
+        """speedscope のファイル形式にする（CPU とメモリの2つのプロファイル）"""
+        frames: List[Dict[str, Any]] = []
+        indexes: Dict[Frame, int] = {}
+
+        def index_of(frame: Frame) -> int:
+            if frame not in indexes:
+                indexes[frame] = len(frames)
+                entry: Dict[str, Any] = {"name": _frame_name(frame)}
+                if frame[1]:
+                    entry.update({"file": frame[1], "line": frame[2]})
+                frames.append(entry)
+            return indexes[frame]
+
+        cpu_samples = [[index_of(frame) for frame in stack] for stack in self.stacks]
+        cpu_weights = [count * self.interval for count in self.stacks.values()]
+        memory_samples = [[index_of(frame) for frame in entry["stack"]] for entry in self.memory]
+        memory_weights = [entry["size"] for entry in self.memory]
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "eigyo-list-backend",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{name} CPU",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(cpu_weights),
+                    "samples": cpu_samples,
+                    "weights": cpu_weights,
+                },
+                {
+                    "type": "sampled",
+                    "name": f"{name} memory (allocated and not freed)",
+                    "unit": "bytes",
+                    "startValue": 0,
+                    "endValue": sum(memory_weights),
+                    "samples": memory_samples,
+                    "weights": memory_weights,
+                },
+            ],
+        }
+
+    def summary(self, limit: int = 20) -> Dict[str, Any]:
+        """結果の概要"""
+        return {
+            "duration": round(self.duration, 3),
+            "interval": self.interval,
+            "samples": self.sample_count,
+            "top_functions": self.top_functions(limit),
+            "memory_growth_kb": round(sum(entry["size"] for entry in self.memory) / 1024, 1),
+            "top_allocations": self.top_allocations(limit),
+        }
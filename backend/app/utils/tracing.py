@@ -0,0 +1,515 @@
+"""
+軽量なスパントレーシング
+
+処理の区間（スパン）を contextvars で入れ子にたどり、終了したスパンをローカルの JSONL ファイルへ
+書き出す。外部のコレクターは不要で、各行は OTLP のスパンに近い項目名
+（trace_id, span_id, parent_span_id, start_time_unix_nano, ...）を持つ。
+
+    with TRACER.span("fetch_page", {"url": url}):
+        ...
+
+    @traced("sheets.add_companies")
+    def add_companies(self, companies): ...
+
+現在のスパンは asyncio のタスク・asyncio.to_thread に自動で引き継がれる。キューを介して
+別のワーカーで処理するジョブは、受付時に current_trace_context() を保存し、処理時に
+parent に渡して同じトレースにつなげる。
+
+トレーサーは configure_tracing() で書き出し先を設定するまで無効で、無効の間のスパンは
+何も記録しない。書き出し先のファイルは max_bytes を超えると "<path>.1" 以降へ
+ローテーションし、backups 世代より古いものは削除する。
+"""
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+
+DEFAULT_TRACE_PATH = "data/traces/spans.jsonl"
+# 1ファイルの上限サイズと保持する旧ファイルの数
+DEFAULT_TRACE_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_TRACE_BACKUPS = 2
+
+OK = "ok"
+ERROR = "error"
+
+# W3C Trace Context の traceparent ヘッダー（version-trace_id-span_id-flags）
+TRACEPARENT_HEADER = "traceparent"
+
+
+class Span:
+    """処理の区間"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = OK
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """属性を設定する"""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """スパンを失敗として記録する"""
+        self.status = ERROR
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def context(self) -> Dict[str, str]:
+        """別のワーカーへ引き継ぐためのトレースコンテキスト"""
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """現在のスパン"""
+    return _current_span.get()
+
+
+def current_trace_context() -> Optional[Dict[str, str]]:
+    """現在のスパンのトレースコンテキスト（スパンの外では None）"""
+    span = _current_span.get()
+    return span.context if span is not None else None
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    traceparent ヘッダーをトレースコンテキストにする
+
+    Args:
+        header: "00-<trace_id 32桁>-<span_id 16桁>-<flags>"
+
+    Returns:
+        トレースコンテキスト。形式が不正な場合は None
+    """
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return {"trace_id": parts[1], "span_id": parts[2]}
+
+
+class JsonlSpanExporter:
+    """終了したスパンを JSONL ファイルへまとめて追記する"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_TRACE_PATH,
+        flush_every: int = 200,
+        max_bytes: int = DEFAULT_TRACE_MAX_BYTES,
+        backups: int = DEFAULT_TRACE_BACKUPS
+    ):
+        """
+        初期化
+
+        Args:
+            path: 書き出し先のパス
+            flush_every: この件数が溜まるたびに書き出す
+            max_bytes: 書き出し先のファイルの上限サイズ（超える前にローテーションする）
+            backups: 保持する旧ファイルの数
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # 書き出しとローテーションは複数のスレッドから同時に行わない
+        self._write_lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """スパンを書き出し待ちに加える"""
+        with self._lock:
+            self._buffer.append(span.to_dict())
+            if len(self._buffer) < self.flush_every:
+                return
+            pending, self._buffer = self._buffer, []
+        self._write(pending)
+
+    def flush(self) -> None:
+        """書き出し待ちのスパンをファイルへ書き出す"""
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        self._write(pending)
+
+    def _write(self, spans: List[Dict[str, Any]]) -> None:
+        if not spans:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = "".join(json.dumps(span, ensure_ascii=False, default=str) + "\n" for span in spans).encode("utf-8")
+        with self._write_lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, "ab") as f:
+                    f.write(data)
+            except OSError as e:
+                logger.error(f"トレースの書き出しに失敗しました: {self.path} - {e}")
+
+    def _rotate(self) -> None:
+        """現在のファイルを "<path>.1" に移し、旧ファイルを1世代ずつ送る"""
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else f"{self.path}.{index - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+
+
+class _SpanScope:
+    """スパンの開始から終了までを with 文で扱う"""
+
+    __slots__ = ("_tracer", "_name", "_attributes", "_parent", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Optional[Dict[str, Any]], parent: Optional[Dict[str, str]]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._parent = parent
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._span = self._tracer.start_span(self._name, self._attributes, self._parent)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self._span.record_error(exc)
+        self._tracer.end_span(self._span)
+        return False
+
+
+class _NoopSpan:
+    """トレーサーが無効のときのスパン（記録しない）"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """スパンを作成して書き出すトレーサー"""
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None):
+        """
+        初期化
+
+        Args:
+            exporter: 書き出し先（None の場合は無効）
+        """
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Dict[str, str]] = None
+    ):
+        """
+        スパンを開始する（with 文で使う）
+
+        Args:
+            name: スパン名
+            attributes: 属性
+            parent: 親のトレースコンテキスト（省略時は現在のスパン）
+        """
+        if self.exporter is None:
+            return _NOOP_SPAN
+        return _SpanScope(self, name, attributes, parent)
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Dict[str, str]] = None
+    ) -> Span:
+        """
+        現在のスパンを変えずにスパンを開始する（コールバックで終了を受け取る場合に使う）
+
+        Args:
+            name: スパン名
+            attributes: 属性
+            parent: 親のトレースコンテキスト（省略時は現在のスパン）
+
+        Returns:
+            スパン（end_span で終了する）
+        """
+        if parent is None:
+            parent = current_trace_context()
+        if parent is None:
+            return Span(name, secrets.token_hex(16), None, attributes)
+        return Span(name, parent["trace_id"], parent["span_id"], attributes)
+
+    def end_span(self, span: Span) -> None:
+        """スパンを終了して書き出す"""
+        span.end_ns = time.time_ns()
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def flush(self) -> None:
+        """書き出し待ちのスパンを書き出す"""
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    def httpx_trace(self) -> Callable[[str, Dict[str, Any]], Any]:
+        """
+        httpx（httpcore）の trace 拡張に渡すコールバックを作る
+
+        接続（DNS の解決を含む）、TLS、リクエスト送信、レスポンスヘッダー・本文の受信を
+        それぞれ現在のスパンの子スパンとして記録する。リクエストごとに作成すること。
+        """
+        open_spans: Dict[str, Span] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            name, _, phase = event_name.rpartition(".")
+            if phase == "started":
+                open_spans[name] = self.start_span(name)
+                return
+            span = open_spans.pop(name, None)
+            if span is None:
+                return
+            if phase == "failed" and isinstance(info.get("exception"), BaseException):
+                span.record_error(info["exception"])
+            self.end_span(span)
+
+        return trace
+
+
+TRACER = Tracer()
+
+
+def configure_tracing(
+    path: Optional[str] = DEFAULT_TRACE_PATH,
+    flush_every: int = 200,
+    max_bytes: int = DEFAULT_TRACE_MAX_BYTES,
+    backups: int = DEFAULT_TRACE_BACKUPS
+) -> Tracer:
+    """
+    トレーサーの書き出し先を設定する
+
+    Args:
+        path: JSONL の書き出し先（None の場合はトレースを無効にする）
+        flush_every: この件数が溜まるたびに書き出す
+        max_bytes: 書き出し先のファイルの上限サイズ
+        backups: 保持する旧ファイルの数
+
+    Returns:
+        トレーサー
+    """
+    TRACER.flush()
+    TRACER.exporter = JsonlSpanExporter(path, flush_every, max_bytes, backups) if path else None
+    return TRACER
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """
+    関数の呼び出しをスパンとして記録するデコレーター（同期・非同期の両方に使える）
+
+    Args:
+        name: スパン名
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with TRACER.span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_files(path: str) -> List[str]:
+    """ローテーションした旧ファイルを含め、存在するスパンのファイルを古い順に返す"""
+    backups = []
+    while os.path.exists(f"{path}.{len(backups) + 1}"):
+        backups.append(f"{path}.{len(backups) + 1}")
+    files = list(reversed(backups))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def _iter_span_lines(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """旧ファイルを含めてスパンの行とその内容を古い順に返す（途中で途切れた行は読み飛ばす）"""
+    for file_path in trace_files(path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield line, json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def load_spans(path: str, trace_ids: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    JSONL ファイル（ローテーションした旧ファイルを含む）からスパンを読み込む
+
+    Args:
+        path: スパンの JSONL ファイル
+        trace_ids: 指定時はこのトレースのスパンのみ読み込む
+
+    Returns:
+        スパンのリスト（途中で途切れた行は読み飛ばす）
+    """
+    return [
+        span for _, span in _iter_span_lines(path)
+        if trace_ids is None or span.get("trace_id") in trace_ids
+    ]
+
+
+def _duration_ns(span: Dict[str, Any]) -> int:
+    return max(0, (span.get("end_time_unix_nano") or 0) - span["start_time_unix_nano"])
+
+
+def summarize_job_trace(spans: Iterable[Dict[str, Any]], job_id: str) -> Dict[str, Any]:
+    """
+    ジョブのスパンからフレームグラフ用の集計を作る
+
+    属性 job_id がジョブIDのスパンをルートとし、その子孫を集計する。子スパンが並行して
+    実行されている場合、自身の時間（self）は 0 に切り詰める。
+
+    Args:
+        spans: スパンのリスト
+        job_id: ジョブID
+
+    Returns:
+        job_id, trace_ids, span_count, wall_ms, by_name（スパン名ごとの count, total_ms,
+        self_ms, max_ms）, collapsed（"親;子;孫 自身のマイクロ秒" 形式の集約スタック）
+    """
+    spans = list(spans)
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        children.setdefault(span.get("parent_span_id"), []).append(span)
+
+    roots = [span for span in spans if span.get("attributes", {}).get("job_id") == job_id]
+    by_name: Dict[str, Dict[str, float]] = {}
+    stacks: Dict[str, int] = {}
+    span_count = 0
+
+    def visit(span: Dict[str, Any], stack: str) -> None:
+        nonlocal span_count
+        span_count += 1
+        duration = _duration_ns(span)
+        child_spans = children.get(span["span_id"], [])
+        self_ns = max(0, duration - sum(_duration_ns(child) for child in child_spans))
+
+        entry = by_name.setdefault(span["name"], {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += duration / 1e6
+        entry["self_ms"] += self_ns / 1e6
+        entry["max_ms"] = max(entry["max_ms"], duration / 1e6)
+
+        path = f"{stack};{span['name']}" if stack else span["name"]
+        stacks[path] = stacks.get(path, 0) + self_ns // 1000
+        for child in child_spans:
+            visit(child, path)
+
+    for root in roots:
+        visit(root, "")
+
+    wall_ns = 0
+    if roots:
+        wall_ns = (
+            max(root.get("end_time_unix_nano") or 0 for root in roots)
+            - min(root["start_time_unix_nano"] for root in roots)
+        )
+
+    return {
+        "job_id": job_id,
+        "trace_ids": sorted({root["trace_id"] for root in roots}),
+        "span_count": span_count,
+        "wall_ms": max(0, wall_ns) / 1e6,
+        "by_name": sorted(
+            ({"name": name, **{key: round(value, 3) for key, value in entry.items()}} for name, entry in by_name.items()),
+            key=lambda entry: entry["total_ms"],
+            reverse=True
+        ),
+        "collapsed": [f"{path} {micros}" for path, micros in sorted(stacks.items())],
+    }
+
+
+def load_job_trace(path: str, job_id: str) -> Dict[str, Any]:
+    """
+    JSONL ファイル（ローテーションした旧ファイルを含む）からジョブのトレースを読み込んで集計する
+
+    Args:
+        path: スパンの JSONL ファイル
+        job_id: ジョブID
+
+    Returns:
+        summarize_job_trace の結果
+    """
+    # ファイルは1回だけ読み、ジョブのトレースが分かるまで行はトレースごとに文字列で保持する
+    lines_by_trace: Dict[str, List[str]] = {}
+    trace_ids: Set[str] = set()
+    for line, span in _iter_span_lines(path):
+        lines_by_trace.setdefault(span.get("trace_id"), []).append(line)
+        if span.get("attributes", {}).get("job_id") == job_id:
+            trace_ids.add(span["trace_id"])
+    spans = [json.loads(line) for trace_id in sorted(trace_ids) for line in lines_by_trace[trace_id]]
+    return summarize_job_trace(spans, job_id)
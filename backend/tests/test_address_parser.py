@@ -0,0 +1,63 @@
+"""
+住所パーサーのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pytest
+
+from app.utils.address import AddressParser, get_address_parser, parse_addresses
+
+
+class TestAddressParser:
+    """住所パーサーのテストクラス"""
+
+    @pytest.mark.parametrize("address, prefecture, city, detail", [
+        ("千葉県市川市八幡1-1-1", "千葉県", "市川市", "八幡1-1-1"),
+        ("三重県四日市市諏訪町1-5", "三重県", "四日市市", "諏訪町1-5"),
+        ("奈良県大和郡山市北郡山町248-4", "奈良県", "大和郡山市", "北郡山町248-4"),
+        ("神奈川県足柄下郡箱根町湯本256", "神奈川県", "足柄下郡箱根町", "湯本256"),
+        ("大阪府大阪市北区梅田1-1", "大阪府", "大阪市北区", "梅田1-1"),
+        ("東京都北区王子1-1", "東京都", "北区", "王子1-1"),
+    ])
+    def test_名称に市や郡を含む市区町村と政令指定都市の区を分解できる(self, address, prefecture, city, detail):
+        """市区町村の切り出しのテスト"""
+        # Act
+        parsed = get_address_parser().parse(address)
+
+        # Assert
+        assert (parsed["prefecture"], parsed["city"], parsed["address_detail"]) == (prefecture, city, detail)
+
+    def test_都道府県を省略した住所は市区町村表から都道府県を補う(self):
+        """都道府県の補完のテスト"""
+        # Act
+        parsed = get_address_parser().parse("〒220-0012 横浜市西区みなとみらい2-2-1")
+
+        # Assert
+        assert parsed == {
+            "postal_code": "220-0012",
+            "prefecture": "神奈川県",
+            "city": "横浜市西区",
+            "address_detail": "みなとみらい2-2-1"
+        }
+
+    def test_表にない市区町村は接尾辞で判定する(self):
+        """規則による判定のテスト"""
+        # Arrange
+        parser = AddressParser()
+
+        # Act
+        parsed = parser.parse("静岡県富士市本町1-1")
+
+        # Assert
+        assert (parsed["city"], parsed["address_detail"]) == ("富士市", "本町1-1")
+
+    def test_複数の住所をまとめて分解できる(self):
+        """バッチ分解のテスト"""
+        # Arrange
+        addresses = ["千葉県市川市八幡1-1-1", None, "千葉県市川市八幡1-1-1", "住所不明"]
+
+        # Act
+        results = parse_addresses(addresses)
+
+        # Assert
+        assert [result["city"] for result in results] == ["市川市", "", "市川市", ""]
+        assert results[0] is not results[2]
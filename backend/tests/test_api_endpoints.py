@@ -1,19 +1,66 @@
 """
 FastAPI エンドポイントのテスト
+
+サービスは app.dependency_overrides でスタブに差し替え、lifespan を実行する
+with TestClient(app) でアプリケーションを起動する。
 """
+import io
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import openpyxl
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
-from datetime import datetime
 
+from app.api import scraping
+from app.api.dependencies import get_company_service, get_sales_service, get_scraping_engine
+from app.api.export import EXPORT_HEADERS, SALES_STATUS_HEADERS
 from app.main import app
-from app.models.company import Company, SalesStatus
+from app.models.company import Company, CompanyRecord, SalesStatus
+from app.services.company_service import CompanyService
+from app.services.sales_service import SalesService
+from app.services.scraping_engine import ScrapingEngine
+
+
+def company_pages(*pages):
+    """iter_companies_with_status / iter_company_pages のスタブ"""
+    async def iterate(filters=None, page_size=500):
+        for page in pages:
+            yield page
+
+    return iterate
+
+
+@pytest.fixture
+def company_service():
+    """CompanyService のスタブ（非同期メソッドは AsyncMock になる）"""
+    return Mock(spec=CompanyService)
+
+
+@pytest.fixture
+def sales_service():
+    """SalesService のスタブ"""
+    return Mock(spec=SalesService)
 
 
 @pytest.fixture
-def client():
-    """テスト用クライアント"""
-    return TestClient(app)
+def scraping_engine():
+    """ScrapingEngine のスタブ"""
+    return Mock(spec=ScrapingEngine)
+
+
+@pytest.fixture
+def client(company_service, sales_service, scraping_engine):
+    """サービスをスタブに差し替えたテスト用クライアント"""
+    app.dependency_overrides.update({
+        get_company_service: lambda: company_service,
+        get_sales_service: lambda: sales_service,
+        get_scraping_engine: lambda: scraping_engine,
+    })
+    # スクレイピングの実行状況はモジュール単位で持つため、テストごとに元に戻す
+    with patch.dict(scraping.scraping_status), TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
 
 
 @pytest.fixture
@@ -46,284 +93,321 @@ def sample_sales_status():
 
 class TestCompaniesAPI:
     """企業情報CRUD APIのテスト"""
-    
-    def test_get_companies_success(self, client):
+
+    def test_get_companies_success(self, client, company_service):
         """企業一覧取得 - 成功"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.get_companies.return_value = []
-            
-            response = client.get("/api/companies")
-            
-            assert response.status_code == 200
-            assert response.json() == {"companies": []}
-    
-    def test_get_companies_with_filters(self, client):
+        company_service.get_companies.return_value = []
+
+        response = client.get("/api/companies/")
+
+        assert response.status_code == 200
+        assert response.json()["companies"] == []
+        assert response.json()["total"] == 0
+
+    def test_get_companies_with_filters(self, client, company_service):
         """企業一覧取得 - フィルター付き"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.get_companies.return_value = []
-            
-            response = client.get("/api/companies?status=未着手&prefecture=東京都")
-            
-            assert response.status_code == 200
-            mock_service.get_companies.assert_called_once()
-    
-    def test_get_company_by_id_success(self, client, sample_company):
+        company_service.get_companies.return_value = [
+            CompanyRecord(id=1, company_name="テスト株式会社", url="https://test.com", prefecture="東京都")
+        ]
+
+        response = client.get("/api/companies/?status=未着手&prefecture=東京都")
+
+        assert response.status_code == 200
+        assert response.json()["companies"][0]["company_name"] == "テスト株式会社"
+        company_service.get_companies.assert_awaited_once_with(
+            page=1, page_size=100, filters={"status": "未着手", "prefecture": "東京都"}
+        )
+
+    def test_get_company_by_id_success(self, client, company_service, sample_company):
         """企業詳細取得 - 成功"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.get_company_by_id.return_value = sample_company
-            
-            response = client.get("/api/companies/1")
-            
-            assert response.status_code == 200
-            assert response.json()["company"]["company_name"] == "テスト株式会社"
-    
-    def test_get_company_by_id_not_found(self, client):
+        company_service.get_company_by_id.return_value = sample_company
+
+        response = client.get("/api/companies/1")
+
+        assert response.status_code == 200
+        assert response.json()["company"]["company_name"] == "テスト株式会社"
+        company_service.get_company_by_id.assert_awaited_once_with(1)
+
+    def test_get_company_by_id_not_found(self, client, company_service):
         """企業詳細取得 - 見つからない"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.get_company_by_id.return_value = None
-            
-            response = client.get("/api/companies/999")
-            
-            assert response.status_code == 404
-            assert response.json()["detail"] == "Company not found"
-    
-    def test_create_company_success(self, client):
+        company_service.get_company_by_id.return_value = None
+
+        response = client.get("/api/companies/999")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Company not found"
+
+    def test_create_company_success(self, client, company_service):
         """企業作成 - 成功"""
         company_data = {
             "company_name": "新規企業",
             "url": "https://new-company.com",
             "address": "大阪府大阪市1-1-1"
         }
-        
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.add_company.return_value = 1
-            
-            response = client.post("/api/companies", json=company_data)
-            
-            assert response.status_code == 201
-            assert response.json()["message"] == "Company created successfully"
-            assert response.json()["company_id"] == 1
-    
-    def test_create_company_validation_error(self, client):
+        company_service.add_company.return_value = 1
+
+        response = client.post("/api/companies/", json=company_data)
+
+        assert response.status_code == 201
+        assert response.json()["message"] == "Company created successfully"
+        assert response.json()["company_id"] == 1
+        created = company_service.add_company.await_args.args[0]
+        assert created.company_name == "新規企業"
+        assert created.created_at is not None
+
+    def test_create_company_validation_error(self, client, company_service):
         """企業作成 - バリデーションエラー"""
         invalid_data = {
             "company_name": "",  # 空文字
             "url": "invalid-url"  # 無効なURL
         }
-        
-        response = client.post("/api/companies", json=invalid_data)
-        
+
+        response = client.post("/api/companies/", json=invalid_data)
+
         assert response.status_code == 422
-    
-    def test_update_company_success(self, client):
+        company_service.add_company.assert_not_called()
+
+    def test_update_company_success(self, client, company_service):
         """企業更新 - 成功"""
         update_data = {
             "company_name": "更新された企業名",
+            "url": "https://test.com",
             "tel": "06-1234-5678"
         }
-        
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.update_company.return_value = True
-            
-            response = client.put("/api/companies/1", json=update_data)
-            
-            assert response.status_code == 200
-            assert response.json()["message"] == "Company updated successfully"
-    
-    def test_update_company_not_found(self, client):
+        company_service.update_company.return_value = True
+
+        response = client.put("/api/companies/1", json=update_data)
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Company updated successfully"
+        updated = company_service.update_company.await_args.args[0]
+        assert updated.id == 1
+        assert updated.tel == "06-1234-5678"
+
+    def test_update_company_not_found(self, client, company_service):
         """企業更新 - 見つからない"""
-        update_data = {"company_name": "更新企業"}
-        
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.update_company.return_value = False
-            
-            response = client.put("/api/companies/999", json=update_data)
-            
-            assert response.status_code == 404
-    
-    def test_delete_company_success(self, client):
+        update_data = {"company_name": "更新企業", "url": "https://test.com"}
+        company_service.update_company.return_value = False
+
+        response = client.put("/api/companies/999", json=update_data)
+
+        assert response.status_code == 404
+
+    def test_delete_company_success(self, client, company_service):
         """企業削除 - 成功"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.delete_company.return_value = True
-            
-            response = client.delete("/api/companies/1")
-            
-            assert response.status_code == 200
-            assert response.json()["message"] == "Company deleted successfully"
-    
-    def test_delete_company_not_found(self, client):
+        company_service.delete_company.return_value = True
+
+        response = client.delete("/api/companies/1")
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Company deleted successfully"
+        company_service.delete_company.assert_awaited_once_with(1)
+
+    def test_delete_company_not_found(self, client, company_service):
         """企業削除 - 見つからない"""
-        with patch('app.api.companies.company_service') as mock_service:
-            mock_service.delete_company.return_value = False
-            
-            response = client.delete("/api/companies/999")
-            
-            assert response.status_code == 404
+        company_service.delete_company.return_value = False
+
+        response = client.delete("/api/companies/999")
+
+        assert response.status_code == 404
 
 
 class TestScrapingAPI:
     """スクレイピング実行APIのテスト"""
-    
-    def test_start_scraping_success(self, client):
-        """スクレイピング開始 - 成功"""
+
+    def test_start_scraping_success(self, client, company_service):
+        """スクレイピング開始 - 成功（バックグラウンドで実行される）"""
         scraping_config = {
             "keywords": ["IT企業", "広告代理店"],
             "target_sites": ["job_sites"],
             "max_pages": 10
         }
-        
-        with patch('app.api.scraping.company_service') as mock_service:
-            mock_service.collect_companies.return_value = {"collected": 5, "errors": 0}
-            
-            response = client.post("/api/scraping/start", json=scraping_config)
-            
-            assert response.status_code == 200
-            assert response.json()["message"] == "Scraping completed successfully"
-            assert response.json()["result"]["collected"] == 5
-    
-    def test_start_scraping_validation_error(self, client):
+        company_service.collect_companies.return_value = {"collected": 5, "errors": 0}
+
+        response = client.post("/api/scraping/start", json=scraping_config)
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Scraping started successfully"
+        job_id = response.json()["result"]["details"]["job_id"]
+        assert company_service.collect_companies.await_args.kwargs["keywords"] == ["IT企業", "広告代理店"]
+        assert company_service.collect_companies.await_args.kwargs["job_id"] == job_id
+
+        status = client.get("/api/scraping/status").json()
+        assert status["status"] == "completed"
+        assert status["collected"] == 5
+
+    def test_start_scraping_validation_error(self, client, company_service):
         """スクレイピング開始 - バリデーションエラー"""
         invalid_config = {
             "keywords": [],  # 空のキーワード
             "max_pages": -1  # 無効な値
         }
-        
+
         response = client.post("/api/scraping/start", json=invalid_config)
-        
+
+        assert response.status_code == 422
+        company_service.collect_companies.assert_not_called()
+
+    def test_start_scraping_invalid_job_id(self, client, company_service):
+        """スクレイピング開始 - 払い出した形式以外のジョブIDは受け付けない"""
+        scraping_config = {"keywords": ["IT企業"], "job_id": "../../x"}
+
+        response = client.post("/api/scraping/start", json=scraping_config)
+
         assert response.status_code == 422
-    
+        company_service.collect_companies.assert_not_called()
+
     def test_get_scraping_status(self, client):
         """スクレイピング状況取得"""
-        with patch('app.api.scraping.scraping_service') as mock_service:
-            mock_service.get_status.return_value = {
-                "status": "running",
-                "progress": 50,
-                "collected": 25,
-                "total": 50
-            }
-            
-            response = client.get("/api/scraping/status")
-            
-            assert response.status_code == 200
-            assert response.json()["status"] == "running"
-            assert response.json()["progress"] == 50
-    
-    def test_stop_scraping(self, client):
+        scraping.scraping_status.update({
+            "status": "running",
+            "job_id": "job-1",
+            "progress": 50,
+            "collected": 25,
+            "total": 50,
+            "start_time": datetime.now()
+        })
+
+        response = client.get("/api/scraping/status")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "running"
+        assert response.json()["progress"] == 50
+        assert response.json()["job_id"] == "job-1"
+
+    @pytest.mark.xfail(reason="ScrapingEngine に停止の仕組み（stop）がまだない", strict=True)
+    def test_stop_scraping(self, client, scraping_engine):
         """スクレイピング停止"""
-        with patch('app.api.scraping.scraping_service') as mock_service:
-            mock_service.stop.return_value = True
-            
-            response = client.post("/api/scraping/stop")
-            
-            assert response.status_code == 200
-            assert response.json()["message"] == "Scraping stopped successfully"
+        scraping.scraping_status["status"] = "running"
+
+        response = client.post("/api/scraping/stop")
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Scraping stopped successfully"
+        scraping_engine.stop.assert_awaited_once()
+
+    def test_stop_scraping_not_running(self, client):
+        """スクレイピング停止 - 実行中でない"""
+        response = client.post("/api/scraping/stop")
+
+        assert response.status_code == 400
 
 
 class TestSalesStatusAPI:
     """営業ステータス管理APIのテスト"""
-    
-    def test_get_sales_status_success(self, client, sample_sales_status):
+
+    def test_get_sales_status_success(self, client, sales_service, sample_sales_status):
         """営業ステータス取得 - 成功"""
-        with patch('app.api.sales.google_sheets_service') as mock_service:
-            mock_service.get_sales_status.return_value = sample_sales_status
-            
-            response = client.get("/api/sales/1")
-            
-            assert response.status_code == 200
-            assert response.json()["status"]["status"] == "未着手"
-    
-    def test_get_sales_status_not_found(self, client):
+        sales_service.get_sales_status.return_value = sample_sales_status
+
+        response = client.get("/api/sales/1")
+
+        assert response.status_code == 200
+        assert response.json()["status"]["status"] == "未着手"
+
+    def test_get_sales_status_not_found(self, client, sales_service):
         """営業ステータス取得 - 見つからない"""
-        with patch('app.api.sales.google_sheets_service') as mock_service:
-            mock_service.get_sales_status.return_value = None
-            
-            response = client.get("/api/sales/999")
-            
-            assert response.status_code == 404
-    
-    def test_update_sales_status_success(self, client):
+        sales_service.get_sales_status.return_value = None
+
+        response = client.get("/api/sales/999")
+
+        assert response.status_code == 404
+
+    def test_update_sales_status_success(self, client, sales_service):
         """営業ステータス更新 - 成功"""
         status_data = {
             "status": "アプローチ中",
             "memo": "初回メール送信済み",
             "contact_person": "佐藤"
         }
-        
-        with patch('app.api.sales.google_sheets_service') as mock_service:
-            mock_service.update_sales_status.return_value = True
-            
-            response = client.put("/api/sales/1", json=status_data)
-            
-            assert response.status_code == 200
-            assert response.json()["message"] == "Sales status updated successfully"
-    
-    def test_update_sales_status_invalid_status(self, client):
+        sales_service.update_sales_status.return_value = True
+
+        response = client.put("/api/sales/1", json=status_data)
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Sales status updated successfully"
+        updated = sales_service.update_sales_status.await_args.args[0]
+        assert (updated.company_id, updated.status, updated.contact_person) == (1, "アプローチ中", "佐藤")
+
+    def test_update_sales_status_invalid_status(self, client, sales_service):
         """営業ステータス更新 - 無効なステータス"""
         invalid_data = {
             "status": "無効なステータス"
         }
-        
+
         response = client.put("/api/sales/1", json=invalid_data)
-        
-        assert response.status_code == 422
-    
-    def test_get_sales_dashboard(self, client):
+
+        assert response.status_code == 400
+        sales_service.update_sales_status.assert_not_called()
+
+    def test_get_sales_dashboard(self, client, sales_service):
         """営業ダッシュボード取得"""
-        with patch('app.api.sales.google_sheets_service') as mock_service:
-            mock_service.get_sales_summary.return_value = {
-                "未着手": 10,
-                "アプローチ中": 5,
-                "商談中": 3,
-                "成約": 2,
-                "見送り": 1
-            }
-            
-            response = client.get("/api/sales/dashboard")
-            
-            assert response.status_code == 200
-            assert response.json()["summary"]["未着手"] == 10
-            assert response.json()["summary"]["成約"] == 2
+        summary = {
+            "未着手": 10,
+            "アプローチ中": 5,
+            "商談中": 3,
+            "成約": 2,
+            "見送り": 1
+        }
+        sales_service.get_dashboard.return_value = (
+            {"summary": summary, "total_companies": 21, "recent_updates": [], "conversion_rate": 9.5},
+            '"dashboard-1"'
+        )
+
+        response = client.get("/api/sales/dashboard")
+        not_modified = client.get("/api/sales/dashboard", headers={"If-None-Match": '"dashboard-1"'})
+
+        assert response.status_code == 200
+        assert response.json()["summary"]["未着手"] == 10
+        assert response.json()["summary"]["成約"] == 2
+        assert response.headers["etag"] == '"dashboard-1"'
+        assert not_modified.status_code == 304
 
 
 class TestExportAPI:
     """エクスポートAPIのテスト"""
-    
-    def test_export_csv_success(self, client):
+
+    def test_export_csv_success(self, client, company_service, sample_company, sample_sales_status):
         """CSV エクスポート - 成功"""
-        with patch('app.api.export.company_service') as mock_service:
-            mock_service.get_companies.return_value = []
-            
-            response = client.get("/api/export/csv")
-            
-            assert response.status_code == 200
-            assert response.headers["content-type"] == "text/csv; charset=utf-8"
-            assert "attachment" in response.headers["content-disposition"]
-    
-    def test_export_csv_with_filters(self, client):
+        record = CompanyRecord(**dict(sample_company))
+        company_service.iter_companies_with_status.side_effect = company_pages([(record, sample_sales_status)])
+
+        response = client.get("/api/export/csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert "attachment" in response.headers["content-disposition"]
+        lines = response.content.decode("utf-8-sig").splitlines()
+        assert lines[0] == ",".join(EXPORT_HEADERS + SALES_STATUS_HEADERS)
+        assert "テスト株式会社" in lines[1] and "未着手" in lines[1]
+
+    def test_export_csv_with_filters(self, client, company_service):
         """CSV エクスポート - フィルター付き"""
-        with patch('app.api.export.company_service') as mock_service:
-            mock_service.get_companies.return_value = []
-            
-            response = client.get("/api/export/csv?status=成約&prefecture=東京都")
-            
-            assert response.status_code == 200
-            mock_service.get_companies.assert_called_once()
-    
-    def test_export_excel_success(self, client):
+        company_service.iter_companies_with_status.side_effect = company_pages()
+
+        response = client.get("/api/export/csv?status=成約&prefecture=東京都")
+
+        assert response.status_code == 200
+        assert company_service.iter_companies_with_status.call_args.kwargs["filters"] == {
+            "status": "成約", "prefecture": "東京都"
+        }
+
+    def test_export_excel_success(self, client, company_service):
         """Excel エクスポート - 成功"""
-        with patch('app.api.export.company_service') as mock_service:
-            mock_service.get_companies.return_value = []
-            
-            response = client.get("/api/export/excel")
-            
-            assert response.status_code == 200
-            assert "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" in response.headers["content-type"]
-            assert "attachment" in response.headers["content-disposition"]
-    
+        company_service.iter_companies_with_status.side_effect = company_pages()
+
+        response = client.get("/api/export/excel")
+
+        assert response.status_code == 200
+        assert "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" in response.headers["content-type"]
+        assert "attachment" in response.headers["content-disposition"]
+        ws = openpyxl.load_workbook(io.BytesIO(response.content)).active
+        assert [cell.value for cell in ws[1]] == EXPORT_HEADERS + SALES_STATUS_HEADERS
+
     def test_export_template_success(self, client):
         """テンプレート エクスポート - 成功"""
         response = client.get("/api/export/template")
-        
+
         assert response.status_code == 200
         assert "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" in response.headers["content-type"]
         assert "template" in response.headers["content-disposition"].lower()
@@ -331,19 +415,19 @@ class TestExportAPI:
 
 class TestHealthCheck:
     """ヘルスチェックAPIのテスト"""
-    
+
     def test_health_check(self, client):
         """ヘルスチェック"""
         response = client.get("/health")
-        
+
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
         assert "timestamp" in response.json()
-    
+
     def test_api_info(self, client):
         """API 情報取得"""
         response = client.get("/api/info")
-        
+
         assert response.status_code == 200
         assert "version" in response.json()
-        assert "title" in response.json()
\ No newline at end of file
+        assert "title" in response.json()
@@ -0,0 +1,149 @@
+"""
+企業情報収集パイプラインのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pytest
+from unittest.mock import Mock
+
+from app.services.collection_pipeline import CollectionPipeline
+from app.services.crawl_frontier import CrawlFrontier, DONE
+from app.services.scraping_engine import ScrapingEngine
+
+
+async def search_results(count):
+    """探索結果のスタブ"""
+    for i in range(count):
+        yield {"url": f"https://company{i}.com", "source_url": "https://jobs.test/search"}
+
+
+@pytest.fixture
+def scraping_engine():
+    """ページ取得をスタブ化したScrapingEngine"""
+    engine = ScrapingEngine({
+        "interval": 1,
+        "fetch_concurrency": 1,
+        "parse_concurrency": 1,
+        "save_batch_size": 2,
+        "pipeline_queue_size": 1
+    })
+    events = []
+
+    async def fetch_page(url):
+        events.append(("fetch", url))
+        return f"<html><head><title>{url}</title></head></html>"
+
+    engine.fetch_page = fetch_page
+    engine.events = events
+    return engine
+
+
+class TestCollectionPipeline:
+    """収集パイプラインのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_取得と保存を並行してバッチ単位で書き込める(self, scraping_engine):
+        """段階的パイプラインのテスト"""
+        # Arrange
+        sheets_service = Mock()
+        sheets_service.get_existing_urls.return_value = {"https://company0.com"}
+
+        def add_companies(batch):
+            scraping_engine.events.append(("save", len(batch)))
+            return len(batch)
+
+        sheets_service.add_companies.side_effect = add_companies
+        pipeline = CollectionPipeline(
+            scraping_engine, sheets_service, prepare_record=lambda record: record
+        )
+
+        # Act
+        stats = await pipeline.run(search_results(30))
+
+        # Assert
+        assert stats["duplicates"] == 1
+        assert stats["saved"] == 29
+        assert all(size <= 2 for kind, size in scraping_engine.events if kind == "save")
+        # キューが満杯になると取得が待たされ、最初の保存は全件の取得が終わる前に行われる
+        first_save = next(i for i, event in enumerate(scraping_engine.events) if event[0] == "save")
+        last_fetch = max(i for i, event in enumerate(scraping_engine.events) if event[0] == "fetch")
+        assert first_save < last_fetch
+
+    @pytest.mark.asyncio
+    async def test_保存するバッチは列単位で正規化してから書き込む(self, scraping_engine):
+        """保存段の一括正規化のテスト"""
+        # Arrange
+        sheets_service = Mock()
+        sheets_service.get_existing_urls.return_value = set()
+        saved = []
+
+        def add_companies(batch):
+            saved.extend(batch)
+            return len(batch)
+
+        sheets_service.add_companies.side_effect = add_companies
+
+        def prepare_record(record):
+            return {**record, "postal_code": "１０００００１", "capital": "1000万円"}
+
+        pipeline = CollectionPipeline(scraping_engine, sheets_service, prepare_record=prepare_record)
+
+        # Act
+        stats = await pipeline.run(search_results(3))
+
+        # Assert
+        assert stats["saved"] == 3
+        assert {record["postal_code"] for record in saved} == {"100-0001"}
+        assert {record["capital_yen"] for record in saved} == {10_000_000}
+
+    @pytest.mark.asyncio
+    async def test_検証に失敗したレコードはエラーとして数える(self, scraping_engine):
+        """正規化段のエラーハンドリングテスト"""
+        # Arrange
+        sheets_service = Mock()
+        sheets_service.get_existing_urls.return_value = set()
+        sheets_service.add_companies.side_effect = lambda batch: len(batch)
+
+        def prepare_record(record):
+            if record["url"].endswith("1.com"):
+                raise ValueError("invalid")
+            return record
+
+        pipeline = CollectionPipeline(scraping_engine, sheets_service, prepare_record=prepare_record)
+
+        # Act
+        stats = await pipeline.run(search_results(3))
+
+        # Assert
+        assert stats["errors"] == 1
+        assert stats["saved"] == 2
+
+    @pytest.mark.asyncio
+    async def test_取得に失敗したURLは同じ実行の中で試行回数の上限まで再取得する(self, scraping_engine, tmp_path):
+        """実行中の再試行のテスト"""
+        # Arrange
+        sheets_service = Mock()
+        sheets_service.get_existing_urls.return_value = set()
+        sheets_service.add_companies.side_effect = lambda batch: len(batch)
+        frontier = CrawlFrontier("retry", checkpoint_dir=str(tmp_path), max_attempts=3)
+        fetch_page = scraping_engine.fetch_page
+        failures = {"https://company1.com": 1, "https://company2.com": 5}
+
+        async def flaky_fetch_page(url):
+            if failures.get(url, 0) > 0:
+                failures[url] -= 1
+                raise ConnectionError("connection reset")
+            return await fetch_page(url)
+
+        scraping_engine.fetch_page = flaky_fetch_page
+        pipeline = CollectionPipeline(
+            scraping_engine, sheets_service, prepare_record=lambda record: record, frontier=frontier
+        )
+
+        # Act
+        stats = await pipeline.run(search_results(3))
+
+        # Assert
+        assert stats["saved"] == 2
+        assert frontier.get_entry("https://company1.com") == {"state": DONE, "attempts": 2, "error": None}
+        assert frontier.get_entry("https://company2.com")["attempts"] == 3
+        assert failures["https://company2.com"] == 2
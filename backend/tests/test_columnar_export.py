@@ -0,0 +1,91 @@
+"""
+列指向フォーマットエクスポートのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.models.company import Company, SalesStatus
+from app.services.columnar_export import to_record_batch, write_columnar_file
+
+
+def make_pages():
+    """2ページ分の (企業, 営業ステータス) を作る"""
+    return [
+        [
+            (
+                Company(id=1, company_name="株式会社A", url="https://a.com", prefecture="東京都",
+                        created_at=datetime(2024, 1, 1, 9, 0)),
+                SalesStatus(company_id=1, status="商談中", last_contact_date=datetime(2024, 1, 5)),
+            ),
+            (
+                Company(id=2, company_name="株式会社B", url="https://b.com", prefecture="大阪府"),
+                None,
+            ),
+        ],
+        [
+            (
+                Company(id=3, company_name="株式会社C", url="https://c.com", prefecture="東京都"),
+                SalesStatus(company_id=3, status="成約"),
+            ),
+        ],
+    ]
+
+
+async def iter_pages(pages):
+    for page in pages:
+        yield page
+
+
+class TestColumnarExport:
+    """列指向フォーマットエクスポートのテストクラス"""
+
+    def test_日時と辞書エンコードの型で列が作られる(self):
+        """RecordBatch のスキーマのテスト"""
+        # Act
+        batch = to_record_batch(make_pages()[0], include_sales_status=True)
+
+        # Assert
+        assert batch.num_rows == 2
+        assert pa.types.is_dictionary(batch.schema.field("prefecture").type)
+        assert pa.types.is_dictionary(batch.schema.field("status").type)
+        assert batch.schema.field("created_at").type == pa.timestamp("us")
+        assert batch.column("prefecture").to_pylist() == ["東京都", "大阪府"]
+        assert batch.column("status").to_pylist() == ["商談中", None]
+        assert batch.column("last_contact_date").to_pylist()[0] == datetime(2024, 1, 5)
+
+    @pytest.mark.asyncio
+    async def test_Parquetに書き出して型付きで読み戻せる(self, tmp_path):
+        """Parquet 書き出しのテスト"""
+        # Arrange
+        path = tmp_path / "companies.parquet"
+
+        # Act
+        rows = await write_columnar_file(str(path), iter_pages(make_pages()), True, "parquet")
+
+        # Assert
+        frame = pq.read_table(path).to_pandas()
+        assert rows == 3
+        assert frame["company_name"].tolist() == ["株式会社A", "株式会社B", "株式会社C"]
+        assert frame["prefecture"].dtype.name == "category"
+        assert frame["status"].dtype.name == "category"
+
+    @pytest.mark.asyncio
+    async def test_Arrow_IPCストリームに書き出せる(self, tmp_path):
+        """Arrow IPC 書き出しのテスト"""
+        # Arrange
+        path = tmp_path / "companies.arrows"
+
+        # Act
+        rows = await write_columnar_file(str(path), iter_pages(make_pages()), False, "arrow")
+
+        # Assert
+        with pa.ipc.open_stream(pa.OSFile(str(path))) as reader:
+            table = reader.read_all()
+        assert rows == 3
+        assert table.num_rows == 3
+        assert "status" not in table.schema.names
+        assert table.column("id").to_pylist() == [1, 2, 3]
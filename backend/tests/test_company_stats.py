@@ -0,0 +1,61 @@
+"""
+企業リスト集計値のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+from app.services.company_stats import CompanyStats
+
+
+class TestCompanyStats:
+    """企業リスト集計値のテストクラス"""
+
+    def test_全件から集計できる(self):
+        """再集計のテスト"""
+        # Arrange
+        stats = CompanyStats("未着手")
+        companies = [
+            {"id": "1", "url": "https://a.com", "prefecture": "東京都",
+             "business_content": "ITコンサル", "created_at": "2024-01-01T09:00:00"},
+            {"id": "2", "url": "https://b.com", "address": "大阪府大阪市",
+             "business_content": "飲食", "created_at": "2024-01-02T09:00:00"},
+            {"id": "", "url": "https://c.com", "prefecture": "東京都"},
+        ]
+
+        # Act
+        stats.rebuild(companies, {1: "成約"})
+        snapshot = stats.snapshot()
+
+        # Assert
+        assert snapshot["total_companies"] == 3
+        assert snapshot["prefecture_summary"] == {"東京都": 2, "大阪府": 1}
+        assert snapshot["industry_summary"] == {"IT": 1, "コンサル": 1, "その他": 2}
+        assert snapshot["created_date_summary"] == {"2024-01-01": 1, "2024-01-02": 1}
+        assert snapshot["status_summary"] == {"成約": 1, "未着手": 2}
+
+    def test_更新とステータス変更を差分で反映できる(self):
+        """差分更新のテスト"""
+        # Arrange
+        stats = CompanyStats("未着手")
+        stats.rebuild([{"id": "1", "url": "https://a.com", "prefecture": "東京都"}], {})
+
+        # Act
+        stats.set_status(1, "商談中")
+        stats.set_status(1, "成約")
+        stats.update_company({"id": 1, "url": "https://a.com", "prefecture": "福岡県"})
+        snapshot = stats.snapshot()
+
+        # Assert
+        assert snapshot["prefecture_summary"] == {"福岡県": 1}
+        assert snapshot["status_summary"] == {"成約": 1, "未着手": 0}
+
+    def test_作成日時のない更新では作成日の件数を保つ(self):
+        """作成日の差分更新のテスト"""
+        # Arrange
+        stats = CompanyStats("未着手")
+        stats.rebuild([{"id": "1", "url": "https://a.com", "created_at": "2024-01-01T09:00:00"}], {})
+
+        # Act
+        stats.update_company({"id": 1, "url": "https://a.com", "updated_at": "2024-03-01T09:00:00"})
+        snapshot = stats.snapshot()
+
+        # Assert
+        assert snapshot["created_date_summary"] == {"2024-01-01": 1}
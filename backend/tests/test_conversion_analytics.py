@@ -0,0 +1,106 @@
+"""
+成約率分析のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services.conversion_analytics import ConversionAnalytics
+from app.services.status_events import StatusEventLog
+
+
+def make_event_log(path):
+    """2か月分の遷移イベントを記録したログを作る"""
+    event_log = StatusEventLog(str(path))
+    event_log.append(1, "未着手", "アプローチ中", datetime(2024, 1, 8))
+    event_log.append(2, "未着手", "アプローチ中", datetime(2024, 1, 9))
+    event_log.append(1, "アプローチ中", "商談中", datetime(2024, 1, 20))
+    event_log.append(1, "商談中", "成約", datetime(2024, 2, 5))
+    event_log.append(2, "アプローチ中", "見送り", datetime(2024, 2, 6))
+    return event_log
+
+
+class TestConversionAnalytics:
+    """成約率分析のテストクラス"""
+
+    def test_月別のファネルを集計できる(self, tmp_path):
+        """ログからの集計テスト"""
+        # Arrange
+        analytics = ConversionAnalytics(make_event_log(tmp_path / "events.jsonl"))
+
+        # Act
+        monthly = analytics.get("monthly")
+
+        # Assert
+        assert [bucket["period"] for bucket in monthly] == ["2024-01", "2024-02"]
+        assert monthly[0]["funnel"]["アプローチ中"] == 2
+        assert monthly[0]["funnel"]["商談中"] == 1
+        assert monthly[1]["funnel"] == {"未着手": 0, "アプローチ中": 0, "商談中": 0, "成約": 1, "見送り": 1}
+        assert monthly[1]["conversion_rate"] == 50.0
+        assert analytics.get("yearly")[0]["transitions"] == 5
+        # 2社にアプローチして1社が成約
+        assert analytics.get("yearly")[0]["approached_companies"] == 2
+        assert analytics.get("yearly")[0]["conversion_rate"] == 50.0
+
+    def test_同じ期間にファネルを進んだ企業は成約率の分母で1社と数える(self, tmp_path):
+        """企業単位の成約率のテスト"""
+        # Arrange
+        event_log = StatusEventLog(str(tmp_path / "events.jsonl"))
+        event_log.append(1, "未着手", "アプローチ中", datetime(2024, 3, 4))
+        event_log.append(1, "アプローチ中", "商談中", datetime(2024, 3, 5))
+        event_log.append(1, "商談中", "成約", datetime(2024, 3, 6))
+        event_log.append(2, "未着手", "アプローチ中", datetime(2024, 3, 7))
+        analytics = ConversionAnalytics(event_log)
+        analytics.get("weekly")
+
+        # Act
+        event = event_log.append(3, "未着手", "アプローチ中", datetime(2024, 3, 8))
+        analytics.record(event["company_id"], event["to_status"], event["timestamp"])
+        weekly = analytics.get("weekly")
+        reloaded = ConversionAnalytics(event_log).get("weekly")
+
+        # Assert
+        assert weekly == reloaded
+        assert weekly[0]["transitions"] == 5
+        assert weekly[0]["approached_companies"] == 3
+        assert weekly[0]["conversion_rate"] == 33.33
+
+    def test_追記したイベントは再集計と同じ結果になる(self, tmp_path):
+        """差分反映のテスト"""
+        # Arrange
+        event_log = make_event_log(tmp_path / "events.jsonl")
+        analytics = ConversionAnalytics(event_log)
+        analytics.get("weekly")
+
+        # Act
+        event = event_log.append(3, None, "アプローチ中", datetime(2024, 2, 7))
+        analytics.record(event["company_id"], event["to_status"], event["timestamp"])
+        incremental = analytics.get("weekly")
+        reloaded = ConversionAnalytics(StatusEventLog(str(tmp_path / "events.jsonl"))).get("weekly")
+
+        # Assert
+        assert incremental == reloaded
+        assert incremental[-1]["period"] == "2024-02-05/2024-02-11"
+
+    def test_集計は初回の取得まで行わず集計前のイベントも一度だけ数える(self, tmp_path):
+        """遅延集計のテスト"""
+        # Arrange
+        event_log = make_event_log(tmp_path / "events.jsonl")
+        analytics = ConversionAnalytics(event_log)
+
+        # Act
+        built_on_init = analytics.built
+        event = event_log.append(3, None, "アプローチ中", datetime(2024, 2, 7))
+        analytics.record(event["company_id"], event["to_status"], event["timestamp"])
+        yearly = analytics.get("yearly")
+
+        # Assert
+        assert built_on_init is False
+        assert yearly[0]["transitions"] == 6
+
+    def test_不正な期間はエラーになる(self, tmp_path):
+        """期間のバリデーションテスト"""
+        analytics = ConversionAnalytics(StatusEventLog(str(tmp_path / "events.jsonl")))
+        with pytest.raises(ValueError):
+            analytics.get("daily")
@@ -0,0 +1,102 @@
+"""
+クロールフロンティアのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.crawl_frontier import CrawlFrontier, PENDING, DONE, FAILED
+from app.services.scraping_engine import ScrapingEngine
+
+
+class TestCrawlFrontier:
+    """クロールフロンティアのテストクラス"""
+
+    def test_チェックポイントから処理状態を復元できる(self, tmp_path):
+        """再起動時の復元テスト"""
+        # Arrange
+        frontier = CrawlFrontier("job1", checkpoint_dir=str(tmp_path))
+        frontier.add_urls(["https://a.com", "https://b.com", "https://c.com"])
+        batch = frontier.next_batch(2)
+        frontier.mark_done(batch[0])
+        frontier.flush()
+        # batch[1] は処理中のままプロセスが停止した想定
+
+        # Act
+        restored = CrawlFrontier("job1", checkpoint_dir=str(tmp_path))
+
+        # Assert
+        assert restored.get_entry("https://a.com")["state"] == DONE
+        assert restored.get_entry("https://b.com")["state"] == PENDING
+        assert restored.next_batch(10) == ["https://b.com", "https://c.com"]
+
+    def test_失敗したURLは試行回数の上限まで再投入される(self, tmp_path):
+        """リトライ上限のテスト"""
+        # Arrange
+        frontier = CrawlFrontier("job2", checkpoint_dir=str(tmp_path), max_attempts=2)
+        frontier.add_urls(["https://fail.com"])
+
+        # Act
+        for _ in range(3):
+            for url in frontier.next_batch(1):
+                frontier.mark_failed(url, "error")
+            frontier.requeue_failed()
+
+        # Assert
+        entry = frontier.get_entry("https://fail.com")
+        assert entry["state"] == FAILED
+        assert entry["attempts"] == 2
+        assert not frontier.has_pending
+
+    def test_保存先の外を指すジョブIDは受け付けない(self, tmp_path):
+        """チェックポイントのパスの検証テスト"""
+        # Arrange
+        checkpoint_dir = tmp_path / "frontier"
+        outside = tmp_path / "outside.jsonl"
+        outside.write_text('{"url": "https://a.com", "state": "done"}\n', encoding="utf-8")
+
+        # Act & Assert
+        for job_id in ["../outside", "sub/job", str(tmp_path / "outside")]:
+            with pytest.raises(ValueError):
+                CrawlFrontier(job_id, checkpoint_dir=str(checkpoint_dir))
+        assert outside.read_text(encoding="utf-8") == '{"url": "https://a.com", "state": "done"}\n'
+
+    @pytest.mark.asyncio
+    async def test_再開時は完了済みのURLを再取得しない(self, tmp_path):
+        """scrape_multipleのフロンティア連携テスト"""
+        # Arrange
+        engine = ScrapingEngine({"interval": 1, "frontier_dir": str(tmp_path)})
+        urls = ["https://a.com", "https://b.com"]
+        frontier = engine.create_frontier("job3")
+        frontier.add_urls(urls)
+        frontier.mark_done(frontier.next_batch(1)[0])
+        frontier.flush()
+
+        # Act
+        with patch.object(engine, "extract_company_info", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = {"company_name": "B社", "url": "https://b.com"}
+            results = await engine.scrape_multiple(urls, frontier=engine.create_frontier("job3"))
+
+        # Assert
+        mock_extract.assert_called_once_with("https://b.com")
+        assert len(results) == 1
+
+    @pytest.mark.asyncio
+    async def test_イベントループ上ではチェックポイントをスレッドで書き出す(self, tmp_path):
+        """非同期の書き出しテスト"""
+        # Arrange
+        frontier = CrawlFrontier("job4", checkpoint_dir=str(tmp_path), flush_every=2)
+        frontier.add_urls(["https://a.com", "https://b.com"])
+
+        # Act
+        with patch("app.services.crawl_frontier.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            for url in frontier.next_batch(2):
+                frontier.mark_done(url)
+            await frontier.aflush()
+
+        # Assert
+        assert to_thread.called
+        restored = CrawlFrontier("job4", checkpoint_dir=str(tmp_path))
+        assert restored.counts()["done"] == 2
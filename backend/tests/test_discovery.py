@@ -0,0 +1,143 @@
+"""
+企業URL探索（ディスカバリ）のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pytest
+import httpx
+from collections import Counter
+from unittest.mock import Mock
+
+from app.services.company_service import CompanyService
+from app.services.discovery import normalize_url
+from app.services.crawl_frontier import CrawlFrontier, PENDING
+from app.services.scraping_engine import ScrapingEngine, FetchBudget, admit_urls
+
+
+LISTING_PAGES = {
+    1: '<a class="company" href="/companies/1">A社</a><a class="company" href="/companies/2">B社</a>',
+    2: '<a class="company" href="/companies/2/">B社</a><a class="company" href="/companies/3">C社</a>',
+    3: '',
+}
+
+
+company_fetches = Counter()
+
+
+def stand_in_handler(request: httpx.Request) -> httpx.Response:
+    """求人サイトのスタンドイン（ローカルHTTPスタブ）"""
+    if request.url.path == "/search":
+        page = int(request.url.params["page"])
+        return httpx.Response(200, text=f"<html><body>{LISTING_PAGES.get(page, '')}</body></html>")
+    company_no = request.url.path.rstrip("/").split("/")[-1]
+    company_fetches[request.url.path] += 1
+    return httpx.Response(200, text=f"<html><head><title>テスト{company_no}株式会社</title></head></html>")
+
+
+@pytest.fixture
+def scraping_engine():
+    """スタンドインに接続したScrapingEngine"""
+    config = {
+        "interval": 0.001,
+        "target_sites": {
+            "job_sites": [{
+                "name": "求人サイトA",
+                "base_url": "https://jobs.test",
+                "search_url": "https://jobs.test/search?q={keyword}&page={page}",
+                "selectors": {"company_link": "a.company"}
+            }]
+        }
+    }
+    return ScrapingEngine(config, transport=httpx.MockTransport(stand_in_handler))
+
+
+class TestDiscovery:
+    """企業URL探索のテストクラス"""
+
+    def test_URLを重複判定用に正規化できる(self):
+        """URL正規化のテスト"""
+        assert normalize_url("HTTPS://Jobs.Test/companies/2/#top") == "https://jobs.test/companies/2"
+
+    @pytest.mark.asyncio
+    async def test_検索結果をページングして重複なく企業URLを取得できる(self, scraping_engine):
+        """ページング・重複排除のテスト"""
+        # Act
+        results = await scraping_engine.search_companies("IT企業", max_pages=5)
+
+        # Assert
+        urls = sorted(result["url"] for result in results)
+        assert urls == [
+            "https://jobs.test/companies/1",
+            "https://jobs.test/companies/2",
+            "https://jobs.test/companies/3",
+        ]
+        assert all(result["source"] == "求人サイトA" for result in results)
+
+    @pytest.mark.asyncio
+    async def test_探索しながら企業情報を収集できる(self, scraping_engine):
+        """探索と取得の並行処理テスト"""
+        # Act
+        companies = [
+            company async for company in scraping_engine.discover_and_scrape("IT企業", max_pages=3)
+        ]
+
+        # Assert
+        names = sorted(company["company_name"] for company in companies)
+        assert names == ["テスト1株式会社", "テスト2株式会社", "テスト3株式会社"]
+        assert all(company["source_url"].startswith("https://jobs.test/search") for company in companies)
+
+    @pytest.mark.asyncio
+    async def test_複数キーワードに該当する企業も1回だけ取得する(self, scraping_engine):
+        """複数キーワードのファンアウト収集テスト"""
+        # Arrange
+        company_fetches.clear()
+        sheets_service = Mock()
+        sheets_service.get_existing_urls.return_value = set()
+        sheets_service.add_companies.side_effect = lambda batch: len(batch)
+        company_service = CompanyService(sheets_service, scraping_engine)
+
+        # Act
+        result = await company_service.collect_companies(
+            keywords=["IT企業", "広告代理店", "Web制作"], max_pages=3
+        )
+
+        # Assert
+        assert result["collected"] == 3
+        assert set(company_fetches.values()) == {1}
+
+    def test_全体とホスト単位の取得上限を守る(self):
+        """取得ページ数上限のテスト"""
+        # Arrange
+        budget = FetchBudget(max_total_pages=3, max_pages_per_host=2)
+
+        # Act
+        allowed = [
+            budget.allow(url) for url in [
+                "https://a.com/1", "https://a.com/2", "https://a.com/3",
+                "https://b.com/1", "https://c.com/1",
+            ]
+        ]
+
+        # Assert
+        assert allowed == [True, True, False, True, False]
+        assert budget.exhausted
+
+    @pytest.mark.asyncio
+    async def test_上限で見送ったURLは未処理に戻し全体の上限で探索を打ち切る(self, tmp_path):
+        """取得対象の選別のテスト"""
+        # Arrange
+        frontier = CrawlFrontier("admit", checkpoint_dir=str(tmp_path))
+        budget = FetchBudget(max_total_pages=2, max_pages_per_host=1)
+        searched = []
+
+        async def search_results():
+            for url in ["https://a.com/1", "https://a.com/1", "https://a.com/2", "https://b.com/1", "https://c.com/1", "https://d.com/1"]:
+                searched.append(url)
+                yield {"url": url}
+
+        # Act
+        admitted = [item["url"] async for item in admit_urls(search_results(), budget, frontier)]
+
+        # Assert
+        assert admitted == ["https://a.com/1", "https://b.com/1"]
+        assert frontier.get_entry("https://a.com/2")["state"] == PENDING
+        assert "https://d.com/1" not in searched
@@ -0,0 +1,78 @@
+"""
+Excel エクスポートのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import io
+import os
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from app.api.export import (
+    EXCEL_MAX_COLUMN_WIDTH,
+    EXPORT_HEADERS,
+    SALES_STATUS_HEADERS,
+    iter_file_chunks,
+    write_excel_file,
+)
+from app.models.company import Company, SalesStatus
+
+
+class StubCompanyService:
+    """結合済みの企業と営業ステータスをページ単位で返すスタブ"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    async def iter_companies_with_status(self, filters=None, page_size=500):
+        for page in self.pages:
+            yield page
+
+
+def make_pages():
+    """2ページ分の (企業, 営業ステータス) を作る"""
+    return [
+        [
+            (
+                Company(id=1, company_name="株式会社A", url="https://a.com", prefecture="東京都",
+                        business_content="システム開発" * 20, created_at=datetime(2024, 1, 1, 9, 0)),
+                SalesStatus(company_id=1, status="商談中"),
+            ),
+            (Company(id=2, company_name="株式会社B", url="https://b.com"), None),
+        ],
+        [
+            (
+                Company(id=3, company_name="株式会社C", url="https://c.com"),
+                SalesStatus(company_id=3, status="成約"),
+            ),
+        ],
+    ]
+
+
+class TestExcelExport:
+    """Excel エクスポートのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_複数ページを書き出してヘッダーと列幅付きで読み戻せる(self, tmp_path):
+        """書き込み専用モードの書き出しと送信のテスト"""
+        # Arrange
+        path = tmp_path / "companies.xlsx"
+        company_service = StubCompanyService(make_pages())
+
+        # Act
+        await write_excel_file(company_service, str(path), {}, True)
+        content = b"".join([chunk async for chunk in iter_file_chunks(str(path), delete=True)])
+
+        # Assert
+        ws = openpyxl.load_workbook(io.BytesIO(content))["企業リスト"]
+        rows = list(ws.iter_rows(values_only=True))
+        assert list(rows[0]) == EXPORT_HEADERS + SALES_STATUS_HEADERS
+        assert ws["A1"].font.bold
+        assert [row[1] for row in rows[1:]] == ["株式会社A", "株式会社B", "株式会社C"]
+        assert rows[3][EXPORT_HEADERS.index("事業内容")] is None
+        assert rows[3][len(EXPORT_HEADERS)] == "成約"
+        # 列幅は先頭ページの値から決まり、上限で切り詰められる
+        assert ws.column_dimensions["B"].width == len("株式会社A") + 2
+        assert ws.column_dimensions["L"].width == EXCEL_MAX_COLUMN_WIDTH
+        assert not os.path.exists(path)
@@ -0,0 +1,99 @@
+"""
+エクスポートジョブのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import asyncio
+
+import pytest
+
+from app.services.export_jobs import COMPLETED, ERROR, ExportJobManager, parse_range_header
+
+
+def make_manager(tmp_path, versions):
+    """生成回数を記録するマネージャーを作る"""
+    generated = []
+
+    async def generate(path, file_format, filters, include_sales_status):
+        generated.append((file_format, filters))
+        await asyncio.sleep(0.01)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{file_format}:{filters}")
+
+    async def data_version():
+        return versions[0]
+
+    return ExportJobManager(generate, data_version, cache_dir=str(tmp_path)), generated
+
+
+class TestExportJobManager:
+    """エクスポートジョブマネージャーのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_データが変わらなければ生成済みのファイルを返す(self, tmp_path):
+        """成果物キャッシュのテスト"""
+        # Arrange
+        versions = ["v1"]
+        manager, generated = make_manager(tmp_path, versions)
+        first = await manager.submit("csv", {"prefecture": "東京都"}, True)
+        await manager.wait(first["job_id"])
+
+        # Act
+        second = await manager.submit("csv", {"prefecture": "東京都"}, True)
+        versions[0] = "v2"
+        third = await manager.submit("csv", {"prefecture": "東京都"}, True)
+        await manager.wait(third["job_id"])
+        await manager.aclose()
+
+        # Assert
+        assert first["status"] == COMPLETED and not first["cached"]
+        assert second["status"] == COMPLETED and second["cached"]
+        assert third["status"] == COMPLETED and not third["cached"]
+        assert len(generated) == 2
+
+    @pytest.mark.asyncio
+    async def test_生成中の同じ条件のジョブはまとめられる(self, tmp_path):
+        """同時リクエストの重複排除テスト"""
+        # Arrange
+        manager, generated = make_manager(tmp_path, ["v1"])
+
+        # Act
+        jobs = await asyncio.gather(*(manager.submit("excel", {}, False) for _ in range(3)))
+        await manager.wait(jobs[0]["job_id"])
+        await manager.aclose()
+
+        # Assert
+        assert len({job["job_id"] for job in jobs}) == 1
+        assert len(generated) == 1
+
+    @pytest.mark.asyncio
+    async def test_生成に失敗したジョブはエラーになりキャッシュされない(self, tmp_path):
+        """生成失敗のテスト"""
+        # Arrange
+        async def generate(path, file_format, filters, include_sales_status):
+            raise RuntimeError("API Error")
+
+        async def data_version():
+            return "v1"
+
+        manager = ExportJobManager(generate, data_version, cache_dir=str(tmp_path))
+
+        # Act
+        job = await manager.submit("csv", {}, True)
+        await manager.wait(job["job_id"])
+        await manager.aclose()
+
+        # Assert
+        assert job["status"] == ERROR
+        assert job["error_message"] == "API Error"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_Range_ヘッダーを解析できる(self):
+        """Range ヘッダー解析のテスト"""
+        assert parse_range_header(None, 100) is None
+        assert parse_range_header("bytes=10-19", 100) == (10, 19)
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+        assert parse_range_header("bytes=-30", 100) == (70, 99)
+        assert parse_range_header("bytes=50-500", 100) == (50, 99)
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+        with pytest.raises(ValueError):
+            parse_range_header("bytes=100-", 100)
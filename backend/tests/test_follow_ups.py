@@ -0,0 +1,71 @@
+"""
+フォローアップ予定の索引とリマインダーのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.follow_ups import FollowUpIndex, FollowUpScheduler
+
+
+class TestFollowUpIndex:
+    """フォローアップ予定の索引のテストクラス"""
+
+    def test_予定日時の範囲で検索できる(self):
+        """範囲検索のテスト"""
+        # Arrange
+        now = datetime(2024, 4, 1, 9, 0)
+        index = FollowUpIndex()
+        index.set(1, now + timedelta(days=10), next_action="見積提出")
+        index.set(2, now + timedelta(days=1), next_action="電話")
+        index.set(3, now + timedelta(days=3), next_action="訪問")
+        index.set(4, now - timedelta(days=1), next_action="期限切れ")
+
+        # Act
+        upcoming = index.upcoming(7, now=now)
+
+        # Assert
+        assert [entry["company_id"] for entry in upcoming] == [2, 3]
+        assert upcoming[0]["next_action"] == "電話"
+
+    def test_予定を更新すると古い日時から外れる(self):
+        """更新・削除のテスト"""
+        # Arrange
+        now = datetime(2024, 4, 1, 9, 0)
+        index = FollowUpIndex()
+        index.set(1, now + timedelta(days=1))
+        index.set(2, now + timedelta(days=2))
+
+        # Act
+        index.set(1, now + timedelta(days=20))
+        index.set(2, None)
+
+        # Assert
+        assert index.upcoming(7, now=now) == []
+        assert len(index) == 1
+        assert index.next_after(now) == now + timedelta(days=20)
+
+
+class TestFollowUpScheduler:
+    """リマインダーのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_期限を迎えた予定を通知する(self):
+        """期限通知のテスト"""
+        # Arrange
+        index = FollowUpIndex()
+        notified = []
+        scheduler = FollowUpScheduler(index, lambda entry: notified.append(entry["company_id"]))
+        scheduler.start()
+
+        # Act
+        index.set(1, datetime.now() + timedelta(milliseconds=50))
+        index.set(2, datetime.now() + timedelta(hours=1))
+        scheduler.notify()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        # Assert
+        assert notified == [1]
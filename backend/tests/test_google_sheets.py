@@ -126,4 +126,40 @@ class TestGoogleSheetsService:
             with pytest.raises(Exception) as exc_info:
                 sheets_service.add_company({"company_name": "エラーテスト"})
             
-            assert "API Error" in str(exc_info.value) 
\ No newline at end of file
+            assert "API Error" in str(exc_info.value) 
+    
+    def test_営業ステータスを企業IDをキーに一括取得できる(self, sheets_service):
+        """営業ステータス一括取得のテスト"""
+        # Arrange
+        mock_data = [
+            ["company_id", "status", "memo"],  # ヘッダー行
+            ["1", "アプローチ中", "初回メール送信済み"],
+            ["2", "成約"],
+        ]
+        sheets_service.spreadsheet.worksheet.return_value = Mock()
+        
+        # Act
+        with patch.object(sheets_service, 'get_all_values', return_value=mock_data) as mock_get:
+            statuses = sheets_service.get_sales_status_map()
+        
+        # Assert
+        assert statuses[1]["status"] == "アプローチ中"
+        assert statuses[2]["memo"] == ""
+        mock_get.assert_called_once()
+    
+    def test_企業情報の更新では作成日時の列を書き換えない(self, sheets_service):
+        """企業情報更新のテスト"""
+        # Arrange
+        mock_worksheet = Mock()
+        sheets_service.spreadsheet.worksheet.return_value = mock_worksheet
+        
+        # Act
+        with patch.object(sheets_service, 'find_company_row', return_value=5):
+            result = sheets_service.update_company(1, {"company_name": "更新株式会社", "url": "https://example.com"})
+        
+        # Assert
+        assert result is True
+        mock_worksheet.update.assert_not_called()
+        ranges = mock_worksheet.batch_update.call_args.args[0]
+        assert [entry["range"] for entry in ranges] == ["A5:P5", "R5:S5"]
+        assert ranges[0]["values"][0][:2] == [1, "更新株式会社"]
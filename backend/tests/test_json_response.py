@@ -0,0 +1,66 @@
+"""
+一覧レスポンスの JSON 化と圧縮のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import gzip
+import json
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from app.models.company import SalesStatus
+from app.models.responses import SalesStatusResponse
+from app.utils.json_response import choose_encoding, json_response
+
+
+def make_request(accept_encoding: str = "") -> Request:
+    """Accept-Encoding だけを持つリクエスト"""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestJsonResponse:
+    """一覧レスポンスのテストクラス"""
+
+    def test_Accept_Encodingのq値に従って圧縮方式を選ぶ(self):
+        """圧縮方式の選択のテスト"""
+        # Act & Assert
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0, deflate") is None
+        assert choose_encoding("*") in ("br", "gzip")
+        assert choose_encoding("") is None
+
+    def test_モデルのリストを再検証せずにJSONにしてgzipで圧縮する(self):
+        """JSON 化と圧縮のテスト"""
+        # Arrange
+        items = [
+            SalesStatusResponse(
+                status=SalesStatus(company_id=i, status="商談中", updated_at=datetime(2024, 1, 1, 9, 0)),
+                message="ok"
+            )
+            for i in range(50)
+        ]
+        adapter = TypeAdapter(List[SalesStatusResponse])
+
+        # Act
+        response = json_response(make_request("gzip"), items, adapter=adapter)
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        body = json.loads(gzip.decompress(response.body))
+        assert len(body) == 50
+        assert body[0]["status"]["updated_at"] == "2024-01-01T09:00:00"
+
+    def test_小さいレスポンスや圧縮を受け付けない場合は圧縮しない(self):
+        """非圧縮のテスト"""
+        # Act
+        small = json_response(make_request("gzip"), {"count": 1})
+        plain = json_response(make_request(), {"items": list(range(1000))})
+
+        # Assert
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in plain.headers
+        assert json.loads(plain.body)["items"][-1] == 999
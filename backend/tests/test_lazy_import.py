@@ -0,0 +1,61 @@
+"""
+遅延インポートと起動時のインポート時間計測のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import os
+
+from app.utils.import_profile import parse_importtime, profile_imports
+from app.utils.lazy_import import lazy_import
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImport:
+    """遅延インポートのテストクラス"""
+
+    def test_属性に初めてアクセスしたときにモジュールが読み込まれる(self):
+        """遅延読み込みのテスト"""
+        # Arrange
+        module = lazy_import("json.decoder")
+
+        # Act
+        loaded_before = module.loaded
+        decoder = module.JSONDecoder()
+
+        # Assert
+        assert loaded_before is False
+        assert module.loaded is True
+        assert decoder.decode('{"a": 1}') == {"a": 1}
+
+    def test_アプリケーションの起動時に重い依存は読み込まれない(self):
+        """起動時のインポートのテスト"""
+        # Act
+        profile = profile_imports("app.main", cwd=BACKEND_DIR)
+
+        # Assert
+        assert profile["heavy_modules"] == []
+        assert any(timing["module"] == "app.main" for timing in profile["modules"])
+
+
+class TestImportProfile:
+    """インポート時間計測のテストクラス"""
+
+    def test_importtimeの出力をモジュールごとに解析できる(self):
+        """出力解析のテスト"""
+        # Arrange
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   encodings.aliases",
+            "import time:       300 |        420 | encodings",
+            "some other stderr line",
+        ])
+
+        # Act
+        timings = parse_importtime(output)
+
+        # Assert
+        assert timings == [
+            {"module": "encodings.aliases", "self_us": 120, "cumulative_us": 120, "depth": 1},
+            {"module": "encodings", "self_us": 300, "cumulative_us": 420, "depth": 0},
+        ]
@@ -0,0 +1,110 @@
+"""
+メトリクスのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import metrics
+from app.services.google_sheets import api_method_name
+from app.utils.metrics import HTTP_REQUEST_DURATION, Counter, Histogram, MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """メトリクスの集計と出力のテストクラス"""
+
+    def test_ヒストグラムは累積のバケットと合計と件数を出力する(self):
+        """ヒストグラム出力のテスト"""
+        # Arrange
+        registry = MetricsRegistry()
+        histogram = registry.histogram("fetch_seconds", "Fetch latency", ("host",), buckets=(0.1, 1.0))
+
+        # Act
+        histogram.labels("example.com").observe(0.05)
+        histogram.labels("example.com").observe(0.1)
+        histogram.labels("example.com").observe(3.0)
+        text = registry.render()
+
+        # Assert
+        assert "# TYPE fetch_seconds histogram" in text
+        assert 'fetch_seconds_bucket{host="example.com",le="0.1"} 2' in text
+        assert 'fetch_seconds_bucket{host="example.com",le="1"} 2' in text
+        assert 'fetch_seconds_bucket{host="example.com",le="+Inf"} 3' in text
+        assert 'fetch_seconds_sum{host="example.com"} 3.15' in text
+        assert 'fetch_seconds_count{host="example.com"} 3' in text
+
+    def test_系列数が上限を超えたラベルはまとめて数える(self):
+        """系列数の上限のテスト"""
+        # Arrange
+        counter = Counter("requests_total", "Requests", ("host",), max_series=2)
+
+        # Act
+        for host in ["a.example", "b.example", "c.example", "d.example"]:
+            counter.labels(host).inc()
+        text = counter.render()
+
+        # Assert
+        assert 'requests_total{host="a.example"} 1' in text
+        assert 'requests_total{host="__other__"} 2' in text
+        assert "c.example" not in text
+
+    def test_ラベルのないヒストグラムはそのまま記録できる(self):
+        """ラベルなしのテスト"""
+        # Arrange
+        histogram = Histogram("parse_seconds", "Parse time", buckets=(0.01,))
+
+        # Act
+        histogram.observe(0.002)
+
+        # Assert
+        assert 'parse_seconds_bucket{le="0.01"} 1' in histogram.render()
+
+
+class TestMetricsEndpoint:
+    """メトリクス API のテストクラス"""
+
+    def test_ルートのテンプレートごとにレイテンシが記録される(self):
+        """ルート単位の計測のテスト"""
+        # Arrange
+        app = FastAPI()
+        app.add_middleware(metrics.MetricsMiddleware)
+        app.include_router(metrics.router)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {"id": item_id}
+
+        client = TestClient(app)
+        before = HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", "200").snapshot()[0][-1]
+
+        # Act
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/no-such-path")
+        response = client.get("/metrics")
+
+        # Assert
+        counts, _ = HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", "200").snapshot()
+        assert sum(counts) - before >= 2
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'route="/items/{item_id}"' in response.text
+        assert 'route="unmatched",status="404"' in response.text
+        assert "/items/1" not in response.text
+
+
+class TestSheetsApiMethodName:
+    """Sheets API のメソッド名の判定のテストクラス"""
+
+    def test_URLからAPIのメソッド名が求まる(self):
+        """メソッド名の判定のテスト"""
+        # Arrange
+        base = "https://sheets.googleapis.com/v4/spreadsheets/sheet-id"
+
+        # Act & Assert
+        assert api_method_name("GET", base) == "spreadsheets.get"
+        assert api_method_name("POST", base + ":batchUpdate") == "spreadsheets.batchUpdate"
+        assert api_method_name("GET", base + "/values/Companies%21A2%3AR101") == "values.get"
+        assert api_method_name("PUT", base + "/values/Companies%21A2%3AR2") == "values.update"
+        assert api_method_name("POST", base + "/values/Companies%21A1:append") == "values.append"
+        assert api_method_name("GET", base + "/values:batchGet") == "values.batchGet"
+        assert api_method_name("GET", "https://www.googleapis.com/drive/v3/files/sheet-id") == "drive.files.get"
@@ -0,0 +1,47 @@
+"""
+企業モデルの検証コストのマイクロベンチマーク
+pytest-benchmark が必要（未導入の環境ではスキップ）
+
+    pytest tests/test_performance_models.py --benchmark-only
+"""
+import pytest
+
+from app.models.company import Company, CompanyRecord
+
+pytest.importorskip("pytest_benchmark")
+
+
+ROW = {
+    "id": "1",
+    "company_name": "テスト株式会社",
+    "url": "https://example.com",
+    "address": "〒100-0001 東京都千代田区千代田1-1",
+    "postal_code": "100-0001",
+    "prefecture": "東京都",
+    "city": "千代田区",
+    "address_detail": "千代田1-1",
+    "tel": "03-1234-5678",
+    "business_content": "IT・システム開発",
+    "created_at": "2024-01-01T09:00:00",
+    "updated_at": "2024-01-01T09:00:00",
+}
+
+
+class TestCompanyValidationBenchmark:
+    """1件あたりの検証コストのベンチマーク"""
+
+    def test_通常の検証(self, benchmark):
+        """Company(**row) の検証コスト"""
+        company = benchmark(Company, **ROW)
+        assert company.id == 1
+
+    def test_保存済みの行の高速経路(self, benchmark):
+        """CompanyRecord.from_row から Company への組み立てコスト"""
+        company = benchmark(lambda: CompanyRecord.from_row(ROW).to_company())
+        assert company.id == 1
+
+    def test_住所の分解(self, benchmark):
+        """Company.parse_address のコスト"""
+        company = Company(**ROW)
+        parsed = benchmark(company.parse_address)
+        assert parsed["city"] == "千代田区"
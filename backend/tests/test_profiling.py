@@ -0,0 +1,106 @@
+"""
+プロファイリングのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import admin
+from app.utils.profiling import SamplingProfiler
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """サンプリングプロファイラーのテストクラス"""
+
+    def test_実行中のスレッドのスタックとメモリの確保元を記録できる(self):
+        """プロファイル採取のテスト"""
+        # Arrange
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        profiler = SamplingProfiler(interval=0.002)
+        retained = []
+
+        # Act
+        worker.start()
+        profiler.start()
+        retained.append(bytearray(512 * 1024))
+        time.sleep(0.1)
+        profiler.stop()
+        stop.set()
+        worker.join()
+
+        # Assert
+        collapsed = profiler.collapsed()
+        assert profiler.sample_count > 0
+        assert any(line.startswith("busy-worker;") and "busy_loop" in line for line in collapsed.splitlines())
+        assert profiler.summary()["memory_growth_kb"] >= 512
+        assert "test_profiling.py:" in profiler.top_allocations(1)[0]["location"]
+
+    def test_speedscopeの形式でCPUとメモリのプロファイルを出力できる(self):
+        """speedscope 出力のテスト"""
+        # Arrange
+        profiler = SamplingProfiler(interval=0.01, trace_memory=False)
+        profiler.stacks = {
+            (("MainThread", "", 0), ("main", "app/main.py", 1), ("work", "app/work.py", 10)): 3,
+        }
+        profiler.memory = [{"stack": [("", "app/work.py", 12)], "size": 2048, "count": 1}]
+
+        # Act
+        document = profiler.speedscope("test")
+
+        # Assert
+        names = [frame["name"] for frame in document["shared"]["frames"]]
+        cpu, memory = document["profiles"]
+        assert names == ["MainThread", "main (app/main.py:1)", "work (app/work.py:10)", "app/work.py:12"]
+        assert cpu["samples"] == [[0, 1, 2]] and cpu["weights"] == [0.03]
+        assert memory["unit"] == "bytes" and memory["samples"] == [[3]] and memory["weights"] == [2048]
+
+
+class TestProfileEndpoint:
+    """プロファイル API のテストクラス"""
+
+    def make_client(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/api/admin")
+        return TestClient(app)
+
+    def test_管理者トークンがなければプロファイルを採取できない(self, monkeypatch):
+        """認可のテスト"""
+        # Arrange
+        client = self.make_client()
+
+        # Act
+        monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+        disabled = client.post("/api/admin/profile", params={"seconds": 0.01})
+        monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+        invalid = client.post("/api/admin/profile", params={"seconds": 0.01}, headers={"X-Admin-Token": "wrong"})
+
+        # Assert
+        assert disabled.status_code == 403
+        assert invalid.status_code == 401
+
+    def test_指定した秒数のプロファイルを集約スタック形式で取得できる(self, monkeypatch):
+        """プロファイル API のテスト"""
+        # Arrange
+        monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+        client = self.make_client()
+
+        # Act
+        response = client.post(
+            "/api/admin/profile",
+            params={"seconds": 0.05, "interval_ms": 5, "format": "collapsed", "memory": False},
+            headers={"X-Admin-Token": "secret"}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "MainThread" in response.text
@@ -0,0 +1,78 @@
+"""
+企業情報の一括正規化のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pandas as pd
+
+from app.services.record_normalizer import normalize_company_frame, normalize_company_records
+
+
+class TestRecordNormalizer:
+    """企業情報の一括正規化のテストクラス"""
+
+    def test_電話番号と郵便番号の表記をそろえる(self):
+        """電話番号・郵便番号のテスト"""
+        # Arrange
+        frame = pd.DataFrame({
+            "tel": ["０３（１２３４）５６７８", "+81-6-1234-5678", "0120 123 456"],
+            "fax": ["03-1234-5679", None, ""],
+            "postal_code": ["〒１００ー０００１", "5300001", ""],
+        })
+
+        # Act
+        normalized, errors = normalize_company_frame(frame)
+
+        # Assert
+        assert normalized["tel"].tolist() == ["03-1234-5678", "06-1234-5678", "0120-123-456"]
+        assert normalized["fax"].iloc[[0, 2]].tolist() == ["03-1234-5679", ""]
+        assert pd.isna(normalized["fax"].iloc[1])
+        assert normalized["postal_code"].tolist() == ["100-0001", "530-0001", ""]
+        assert errors == []
+
+    def test_資本金を円単位の整数にする(self):
+        """資本金のテスト"""
+        # Arrange
+        frame = pd.DataFrame({
+            "capital": ["1000万円", "1億2,000万円", "10,000,000円（2024年3月時点）", "非公開"],
+        })
+
+        # Act
+        normalized, errors = normalize_company_frame(frame)
+
+        # Assert
+        assert normalized["capital_yen"].tolist()[:3] == [10_000_000, 120_000_000, 10_000_000]
+        assert pd.isna(normalized["capital_yen"].iloc[3])
+        assert normalized["capital"].iloc[0] == "1000万円"
+        assert errors == [{"row": 3, "field": "capital", "value": "非公開", "message": "Invalid capital format"}]
+
+    def test_設立年月日を西暦にそろえる(self):
+        """設立年月日のテスト"""
+        # Arrange
+        frame = pd.DataFrame({
+            "established_date": ["平成元年4月1日", "2010/4", "1990年", "昭和五十年"],
+        })
+
+        # Act
+        normalized, errors = normalize_company_frame(frame)
+
+        # Assert
+        assert normalized["established_date"].tolist() == ["1989-04-01", "2010-04", "1990", "昭和五十年"]
+        assert [(error["row"], error["field"]) for error in errors] == [(3, "established_date")]
+
+    def test_正規化できない値は元のまま残し行ごとに報告する(self):
+        """辞書のリストの一括正規化のテスト"""
+        # Arrange
+        records = [
+            {"company_name": "A社", "tel": "12345", "capital": "1000万円"},
+            {"company_name": "B社", "postal_code": "100-0001"},
+        ]
+
+        # Act
+        normalized, errors = normalize_company_records(records)
+
+        # Assert
+        assert normalized == [
+            {"company_name": "A社", "tel": "12345", "capital": "1000万円", "capital_yen": 10_000_000},
+            {"company_name": "B社", "postal_code": "100-0001"},
+        ]
+        assert [(error["row"], error["field"], error["value"]) for error in errors] == [(0, "tel", "12345")]
@@ -0,0 +1,165 @@
+"""
+営業ステータスサービス層のテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from app.models.company import SalesStatus
+from app.services.company_stats import CompanyStats
+from app.services.sales_service import SalesService
+from app.services.status_events import StatusEventLog
+
+
+class TestSalesDashboard:
+    """営業ダッシュボードのテストクラス"""
+
+    @pytest.fixture
+    def sales_service(self, tmp_path):
+        """テスト用のSalesServiceインスタンス"""
+        mock_sheets_service = Mock()
+        mock_sheets_service.get_sales_status_map.return_value = {
+            1: {"company_id": "1", "status": "商談中", "updated_at": "2024-01-01T09:00:00"},
+            2: {"company_id": "2", "status": "成約", "updated_at": "2024-01-02T09:00:00"},
+            3: {"company_id": "3", "status": "未着手", "updated_at": ""},
+        }
+        mock_sheets_service.update_sales_status.return_value = True
+        event_log = StatusEventLog(str(tmp_path / "status_events.jsonl"))
+        return SalesService(mock_sheets_service, recent_limit=2, event_log=event_log)
+
+    @pytest.mark.asyncio
+    async def test_ステータス別件数と成約率を集計できる(self, sales_service):
+        """初回構築のテスト"""
+        # Act
+        dashboard, etag = await sales_service.get_dashboard()
+
+        # Assert
+        assert dashboard["summary"] == {"商談中": 1, "成約": 1, "未着手": 1}
+        assert dashboard["total_companies"] == 3
+        assert dashboard["conversion_rate"] == 50.0
+        assert [update["company_id"] for update in dashboard["recent_updates"]] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_更新を差分で反映しETagが変わる(self, sales_service):
+        """差分反映のテスト"""
+        # Arrange
+        _, etag_before = await sales_service.get_dashboard()
+
+        # Act
+        await sales_service.update_sales_status(SalesStatus(company_id=1, status="成約"))
+        await sales_service.update_sales_status(SalesStatus(company_id=3, status="アプローチ中"))
+        dashboard, etag_after = await sales_service.get_dashboard()
+
+        # Assert
+        assert etag_after != etag_before
+        assert dashboard["summary"] == {"成約": 2, "アプローチ中": 1}
+        assert [
+            (update["company_id"], update["previous_status"]) for update in dashboard["recent_updates"]
+        ] == [(3, "未着手"), (1, "商談中")]
+        sales_service.sheets_service.get_sales_status_map.assert_called_once()
+        assert [
+            (event["company_id"], event["from_status"], event["to_status"])
+            for event in sales_service.event_log.events
+        ] == [(1, "商談中", "成約"), (3, "未着手", "アプローチ中")]
+
+    @pytest.mark.asyncio
+    async def test_更新がなければETagは変わらない(self, sales_service):
+        """ETag のテスト"""
+        # Act
+        _, first = await sales_service.get_dashboard()
+        _, second = await sales_service.get_dashboard()
+
+        # Assert
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_次回アクション予定日時で今後の予定を取得できる(self, sales_service):
+        """フォローアップ予定のテスト"""
+        # Arrange
+        due = datetime.now() + timedelta(days=2)
+        await sales_service.get_dashboard()
+
+        # Act
+        await sales_service.update_sales_status(
+            SalesStatus(company_id=2, status="成約", next_action="契約書送付", next_action_date=due)
+        )
+        await sales_service.update_sales_status(
+            SalesStatus(company_id=1, status="商談中", next_action_date=due + timedelta(days=30))
+        )
+        follow_ups = await sales_service.get_upcoming_follow_ups(7)
+
+        # Assert
+        assert [(entry["company_id"], entry["next_action"]) for entry in follow_ups] == [(2, "契約書送付")]
+        assert follow_ups[0]["due_date"] == due.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_営業ステータスの一覧を絞り込んで取得できる(self, sales_service):
+        """一覧取得のテスト"""
+        # Act
+        statuses = await sales_service.list_sales_statuses(filters={"status": "商談中"})
+        paged = await sales_service.list_sales_statuses(limit=1, offset=1)
+
+        # Assert
+        assert [status.company_id for status in statuses] == [1]
+        assert [status.company_id for status in paged] == [2]
+
+    @pytest.mark.asyncio
+    async def test_更新を企業リストの集計値のステータス件数にも反映する(self, sales_service):
+        """集計値への反映のテスト"""
+        # Arrange
+        company_stats = CompanyStats("未着手")
+        company_stats.rebuild([{"id": "1", "url": "https://a.com"}, {"id": "2", "url": "https://b.com"}], {1: "商談中"})
+        sales_service.company_stats = company_stats
+
+        # Act
+        await sales_service.update_sales_status(SalesStatus(company_id=1, status="成約"))
+
+        # Assert
+        assert company_stats.snapshot()["status_summary"] == {"成約": 1, "未着手": 1}
+
+    @pytest.mark.asyncio
+    async def test_一括更新も単一更新と同じくダッシュボードとイベントログに反映する(self, sales_service):
+        """一括更新のテスト"""
+        # Arrange
+        company_stats = CompanyStats("未着手")
+        company_stats.rebuild([{"id": str(i), "url": f"https://{i}.com"} for i in (1, 2, 3)], {})
+        sales_service.company_stats = company_stats
+        status_updates = [
+            {"company_id": 1, "status": "アプローチ中"},
+            {"company_id": 2, "status": "成約"},
+            {"company_id": 3},
+        ]
+
+        # Act
+        results = await sales_service.bulk_update_status(status_updates)
+        dashboard, _ = await sales_service.get_dashboard()
+
+        # Assert
+        assert results == [True, True, False]
+        assert dashboard["summary"] == {"アプローチ中": 1, "成約": 1, "未着手": 1}
+        assert [(event["company_id"], event["to_status"]) for event in sales_service.event_log.events] == [
+            (1, "アプローチ中"), (2, "成約")
+        ]
+        assert company_stats.snapshot()["status_summary"] == {"アプローチ中": 1, "成約": 1, "未着手": 1}
+
+    @pytest.mark.asyncio
+    async def test_UTCの次回アクション予定日時もローカル時刻として扱える(self, sales_service):
+        """タイムゾーン付きの日時のテスト"""
+        # Arrange
+        due = datetime.now(timezone.utc) + timedelta(days=1)
+        due_text = due.strftime("%Y-%m-%dT%H:%M:%SZ")
+        sales_service.sheets_service.get_sales_status_map.return_value[3]["next_action_date"] = due_text
+
+        # Act
+        await sales_service.update_sales_status(
+            SalesStatus(company_id=1, status="商談中", next_action_date=due_text)
+        )
+        follow_ups = await sales_service.get_upcoming_follow_ups(7)
+        await sales_service.rebuild_dashboard()
+        rebuilt = await sales_service.get_upcoming_follow_ups(7)
+
+        # Assert
+        expected = due.astimezone().replace(tzinfo=None, microsecond=0).isoformat()
+        assert sorted((entry["company_id"], entry["due_date"]) for entry in follow_ups) == [(1, expected), (3, expected)]
+        assert [entry["company_id"] for entry in rebuilt] == [3]
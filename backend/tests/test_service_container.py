@@ -0,0 +1,73 @@
+"""
+サービスコンテナのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_container
+from app.services.container import ServiceContainer
+
+
+class TestServiceContainer:
+    """サービスコンテナのテストクラス"""
+
+    def test_サービスは初回に一度だけ作成され共有される(self):
+        """遅延作成のテスト"""
+        # Arrange
+        container = ServiceContainer(spreadsheet_id="sheet-id")
+        created = []
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        # Act
+        first = container.resolve("service", factory)
+        second = container.resolve("service", factory)
+
+        # Assert
+        assert len(created) == 1
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_終了時は作成と逆の順序で閉じ以後は作成できない(self):
+        """終了処理のテスト"""
+        # Arrange
+        container = ServiceContainer(spreadsheet_id="sheet-id")
+        closed = []
+
+        async def close(name):
+            closed.append(name)
+
+        async def fail(name):
+            raise RuntimeError("close failed")
+
+        container.resolve("sheets", lambda: "sheets", close=close)
+        container.resolve("broken", lambda: "broken", close=fail)
+        container.resolve("engine", lambda: "engine", close=close)
+
+        # Act
+        await container.aclose()
+
+        # Assert
+        assert closed == ["engine", "sheets"]
+        with pytest.raises(RuntimeError):
+            container.resolve("sheets", lambda: "sheets")
+
+    def test_lifespanを実行していないアプリではコンテナの取得時に原因がわかるエラーになる(self):
+        """get_container のテスト"""
+        # Arrange
+        app = FastAPI()
+
+        @app.get("/container")
+        def read_container(container: ServiceContainer = Depends(get_container)):
+            return {"spreadsheet_id": container.spreadsheet_id}
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="ServiceContainer is not initialized"):
+            TestClient(app).get("/container")
+
+        app.state.container = ServiceContainer(spreadsheet_id="sheet-id")
+        assert TestClient(app).get("/container").json() == {"spreadsheet_id": "sheet-id"}
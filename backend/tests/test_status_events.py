@@ -0,0 +1,109 @@
+"""
+営業ステータスのイベントストアのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.status_events import StatusEventLog
+
+
+class TestStatusEventLog:
+    """営業ステータスのイベントストアのテストクラス"""
+
+    def test_企業ごとの履歴を日時順に範囲指定で取得できる(self, tmp_path):
+        """タイムラインのテスト"""
+        # Arrange
+        base = datetime(2024, 4, 1, 9, 0)
+        event_log = StatusEventLog(str(tmp_path / "events.jsonl"))
+        event_log.append(1, "未着手", "アプローチ中", base)
+        event_log.append(2, "未着手", "アプローチ中", base + timedelta(hours=1))
+        event_log.append(1, "商談中", "成約", base + timedelta(days=2))
+        # 日時が前後して届いたイベント
+        event_log.append(1, "アプローチ中", "商談中", base + timedelta(days=1), memo="初回訪問")
+
+        # Act
+        timeline = event_log.timeline(1)
+        ranged = event_log.timeline(1, since=base + timedelta(hours=1), until=base + timedelta(days=2))
+        latest = event_log.timeline(1, limit=1)
+
+        # Assert
+        assert [event["to_status"] for event in timeline] == ["アプローチ中", "商談中", "成約"]
+        assert [event["to_status"] for event in ranged] == ["商談中"]
+        assert ranged[0]["memo"] == "初回訪問"
+        assert [event["to_status"] for event in latest] == ["成約"]
+
+    def test_まとめて追記したイベントは一度に書き出される(self, tmp_path):
+        """バッチ追記のテスト"""
+        # Arrange
+        path = tmp_path / "events.jsonl"
+        base = datetime(2024, 4, 1, 9, 0)
+        event_log = StatusEventLog(str(path), flush_every=10)
+        event_log.append(1, None, "未着手", base)
+
+        # Act
+        written_before = path.exists()
+        count = event_log.append_many([
+            {"company_id": 2, "from_status": None, "to_status": "未着手", "timestamp": base},
+            {"company_id": 3, "from_status": None, "to_status": "未着手", "timestamp": base},
+        ])
+
+        # Assert
+        assert written_before is False
+        assert count == 2
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+        assert len(StatusEventLog(str(path))) == 3
+
+    @pytest.mark.asyncio
+    async def test_非同期の書き出しはスレッドで行い同時に届いたイベントをまとめる(self, tmp_path):
+        """aflush のテスト"""
+        # Arrange
+        path = tmp_path / "events.jsonl"
+        base = datetime(2024, 4, 1, 9, 0)
+        event_log = StatusEventLog(str(path), flush_every=None)
+        writes = []
+        write = event_log._write
+
+        def recording_write(lines):
+            writes.append((threading.current_thread() is threading.main_thread(), len(lines)))
+            write(lines)
+
+        event_log._write = recording_write
+
+        async def update(company_id):
+            event_log.append(company_id, "未着手", "アプローチ中", base + timedelta(minutes=company_id))
+            await event_log.aflush()
+
+        # Act
+        await asyncio.gather(*(update(company_id) for company_id in range(1, 4)))
+
+        # Assert
+        # 最初の書き込みを待つ間に届いた2件は次の1回にまとめられる
+        assert writes == [(False, 1), (False, 2)]
+        assert len(StatusEventLog(str(path))) == 3
+
+    def test_圧縮すると重複が除かれ再読み込み後も履歴が保たれる(self, tmp_path):
+        """圧縮のテスト"""
+        # Arrange
+        path = tmp_path / "events.jsonl"
+        base = datetime(2024, 4, 1, 9, 0)
+        event_log = StatusEventLog(str(path))
+        event_log.append(2, "未着手", "アプローチ中", base)
+        event_log.append(1, "未着手", "アプローチ中", base)
+        event_log.append(1, "未着手", "アプローチ中", base)
+        event_log.append(1, "アプローチ中", "商談中", base + timedelta(days=1))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"company_id": 1, "from_st')
+
+        # Act
+        reloaded = StatusEventLog(str(path))
+        count = reloaded.compact()
+        compacted = StatusEventLog(str(path))
+
+        # Assert
+        assert count == 3
+        assert [event["company_id"] for event in compacted.events] == [1, 1, 2]
+        assert [event["to_status"] for event in compacted.timeline(1)] == ["アプローチ中", "商談中"]
@@ -0,0 +1,229 @@
+"""
+スパントレーシングのテスト
+TDD (t-wada式) - Red -> Green -> Refactor
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.scraping_engine import ScrapingEngine
+from app.utils.tracing import (
+    TRACER,
+    configure_tracing,
+    current_trace_context,
+    load_job_trace,
+    load_spans,
+    parse_traceparent,
+    summarize_job_trace,
+    trace_files,
+)
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    """一時ファイルへトレースを書き出す（終了後は無効に戻す）"""
+    path = tmp_path / "spans.jsonl"
+    configure_tracing(str(path))
+    yield path
+    configure_tracing(None)
+
+
+def make_span(name, span_id, parent_span_id, start_ms, end_ms, **attributes):
+    return {
+        "trace_id": "t" * 32,
+        "span_id": span_id,
+        "parent_span_id": parent_span_id,
+        "name": name,
+        "start_time_unix_nano": start_ms * 1_000_000,
+        "end_time_unix_nano": end_ms * 1_000_000,
+        "attributes": attributes,
+    }
+
+
+class TestTracer:
+    """トレーサーのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_タスクとスレッドをまたいで親子関係が引き継がれる(self, trace_path):
+        """コンテキスト伝播のテスト"""
+        # Arrange
+        def parse():
+            with TRACER.span("parse"):
+                pass
+
+        async def worker():
+            with TRACER.span("fetch"):
+                await asyncio.to_thread(parse)
+
+        # Act
+        with TRACER.span("job", {"job_id": "job-1"}) as root:
+            await asyncio.gather(asyncio.create_task(worker()), asyncio.create_task(worker()))
+        TRACER.flush()
+        spans = {span["span_id"]: span for span in load_spans(str(trace_path))}
+
+        # Assert
+        assert len(spans) == 5
+        assert {span["trace_id"] for span in spans.values()} == {root.trace_id}
+        for span in spans.values():
+            if span["name"] == "fetch":
+                assert span["parent_span_id"] == root.span_id
+            if span["name"] == "parse":
+                assert spans[span["parent_span_id"]]["name"] == "fetch"
+
+    @pytest.mark.asyncio
+    async def test_保存したコンテキストで別のワーカーの処理を同じトレースにつなげられる(self, trace_path):
+        """バックグラウンドジョブへの伝播のテスト"""
+        # Arrange
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def background_worker():
+            # 受付より前に起動したワーカー（受付時のスパンを引き継がない）
+            context = await queue.get()
+            with TRACER.span("export_job", {"job_id": "export-1"}, parent=context):
+                pass
+
+        worker = asyncio.create_task(background_worker())
+
+        # Act
+        with TRACER.span("http.request") as request_span:
+            await queue.put(current_trace_context())
+        await worker
+        TRACER.flush()
+        summary = load_job_trace(str(trace_path), "export-1")
+
+        # Assert
+        assert summary["trace_ids"] == [request_span.trace_id]
+        assert summary["span_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ページ取得は待機とダウンロードのスパンに分けて記録される(self, trace_path):
+        """fetch_page の計装のテスト"""
+        # Arrange
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html></html>"))
+        engine = ScrapingEngine({"interval": 0.001}, transport=transport)
+
+        # Act
+        with TRACER.span("scraping_job", {"job_id": "scrape-1"}):
+            await engine.fetch_page("https://example.com/company")
+        await engine.aclose()
+        TRACER.flush()
+        summary = load_job_trace(str(trace_path), "scrape-1")
+
+        # Assert
+        names = {entry["name"] for entry in summary["by_name"]}
+        assert {"fetch_page", "rate_limit_wait", "download"} <= names
+        assert any(line.startswith("scraping_job;fetch_page;download ") for line in summary["collapsed"])
+
+    def test_無効のときはスパンを記録しない(self, tmp_path):
+        """無効時のテスト"""
+        # Arrange
+        configure_tracing(None)
+
+        # Act
+        with TRACER.span("job") as span:
+            span.set_attribute("ignored", True)
+            context = current_trace_context()
+
+        # Assert
+        assert TRACER.enabled is False
+        assert context is None
+
+    def test_書き出し先を指定しなければアプリの起動時にトレースを有効にしない(self, tmp_path, monkeypatch):
+        """トレースが明示的に有効にする設定であることのテスト"""
+        # Arrange
+        monkeypatch.delenv("TRACE_EXPORT_PATH", raising=False)
+        monkeypatch.setenv("GOOGLE_CREDENTIALS_PATH", str(tmp_path / "missing-credentials.json"))
+        configure_tracing(str(tmp_path / "spans.jsonl"))
+
+        # Act
+        with TestClient(app) as client:
+            client.get("/health")
+            enabled = TRACER.enabled
+
+        # Assert
+        assert enabled is False
+
+    def test_上限サイズを超えるとローテーションし古い世代は削除する(self, tmp_path):
+        """ローテーションのテスト"""
+        # Arrange
+        path = tmp_path / "spans.jsonl"
+        configure_tracing(str(path), flush_every=1, max_bytes=600, backups=2)
+
+        # Act
+        try:
+            for index in range(20):
+                with TRACER.span("job", {"job_id": f"job-{index}"}):
+                    pass
+        finally:
+            configure_tracing(None)
+
+        # Assert
+        files = trace_files(str(path))
+        assert files == [f"{path}.2", f"{path}.1", str(path)]
+        assert all((tmp_path / name).stat().st_size <= 600 for name in ["spans.jsonl", "spans.jsonl.1", "spans.jsonl.2"])
+        assert not (tmp_path / "spans.jsonl.3").exists()
+        job_ids = [span["attributes"]["job_id"] for span in load_spans(str(path))]
+        assert job_ids == [f"job-{index}" for index in range(20 - len(job_ids), 20)]
+
+    def test_ローテーションした旧ファイルのスパンもジョブのトレースに含める(self, tmp_path):
+        """旧ファイルをまたいだジョブのトレースのテスト"""
+        # Arrange
+        path = tmp_path / "spans.jsonl"
+        configure_tracing(str(path), flush_every=1, max_bytes=600, backups=5)
+
+        # Act
+        try:
+            with TRACER.span("scraping_job", {"job_id": "job-1"}):
+                for _ in range(5):
+                    with TRACER.span("fetch_page"):
+                        pass
+        finally:
+            configure_tracing(None)
+        summary = load_job_trace(str(path), "job-1")
+
+        # Assert
+        assert len(trace_files(str(path))) > 1
+        assert summary["span_count"] == 6
+
+
+class TestTraceSummary:
+    """トレース集計のテストクラス"""
+
+    def test_ジョブのスパンから自身の時間と集約スタックを求められる(self):
+        """フレーム集計のテスト"""
+        # Arrange
+        spans = [
+            make_span("http.request", "r", None, 0, 200),
+            make_span("scraping_job", "j", "r", 10, 110, job_id="job-1"),
+            make_span("fetch_page", "f1", "j", 10, 50),
+            make_span("fetch_page", "f2", "j", 50, 90),
+            make_span("download", "d1", "f1", 20, 50),
+            make_span("scraping_job", "other", None, 0, 500, job_id="job-2"),
+        ]
+
+        # Act
+        summary = summarize_job_trace(spans, "job-1")
+        by_name = {entry["name"]: entry for entry in summary["by_name"]}
+
+        # Assert
+        assert summary["span_count"] == 4
+        assert summary["wall_ms"] == 100
+        assert by_name["fetch_page"] == {"name": "fetch_page", "count": 2, "total_ms": 80, "self_ms": 50, "max_ms": 40}
+        assert summary["collapsed"] == [
+            "scraping_job 20000",
+            "scraping_job;fetch_page 50000",
+            "scraping_job;fetch_page;download 30000",
+        ]
+
+    def test_traceparentヘッダーからトレースコンテキストを取り出せる(self):
+        """traceparent の解析のテスト"""
+        # Act & Assert
+        assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01") == {
+            "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+            "span_id": "00f067aa0ba902b7",
+        }
+        assert parse_traceparent("invalid") is None
+        assert parse_traceparent(None) is None
@@ -11,6 +11,7 @@ export interface SalesStatusUpdateRequest {
   memo?: string
   contact_person?: string
   next_action?: string
+  next_action_date?: string
 }
 
 export class SalesService {
@@ -29,6 +30,15 @@ export class SalesService {
     return response.data
   }
 
+  // 営業ステータス履歴取得
+  static async getSalesStatusHistory(companyId: number, limit?: number): Promise<any> {
+    const params = new URLSearchParams()
+    if (limit) params.append('limit', limit.toString())
+
+    const response = await apiClient.get(`/api/sales/${companyId}/history?${params.toString()}`)
+    return response.data
+  }
+
   // 営業ステータス一覧取得
   static async getSalesStatuses(
     filters?: {
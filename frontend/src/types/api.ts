@@ -58,6 +58,7 @@ export interface SalesStatus {
   contact_person?: string
   last_contact_date?: string
   next_action?: string
+  next_action_date?: string
   updated_at?: string
 }
 